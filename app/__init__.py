@@ -1,9 +1,11 @@
 from flask import Flask
 
+from .routes.metrics import bp as metrics_bp
 from .routes.search import bp as search_bp
 
 
 def create_app():
     app = Flask(__name__)
     app.register_blueprint(search_bp)
+    app.register_blueprint(metrics_bp)
     return app
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -7,6 +7,7 @@ class SearchResult:
     price: int
     source: str
     url: str
+    page: int = field(default=1, compare=False, repr=False)
 
     @property
     def total(self) -> int:
@@ -20,3 +21,25 @@ class SearchResult:
             "url": self.url,
             "total": self.total,
         }
+
+
+@dataclass
+class SearchPage:
+    results: list[SearchResult]
+    total: int
+    limit: int | None = None
+    offset: int = 0
+    degraded: list[str] = field(default_factory=list)
+    pending: list[str] = field(default_factory=list)
+    truncated: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            "results": [r.to_dict() for r in self.results],
+            "total": self.total,
+            "limit": self.limit,
+            "offset": self.offset,
+            "degraded": self.degraded,
+            "pending": self.pending,
+            "truncated": self.truncated,
+        }
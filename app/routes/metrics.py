@@ -0,0 +1,10 @@
+from flask import Blueprint, Response
+
+from ..services.metrics import registry
+
+bp = Blueprint("metrics", __name__)
+
+
+@bp.route("/metrics", methods=["GET"])
+def metrics_route():
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4")
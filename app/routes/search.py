@@ -1,10 +1,23 @@
 import csv
 import io
+import json
+import os
 from datetime import datetime
 
-from flask import Blueprint, jsonify, redirect, render_template, request, send_file, url_for
+from flask import Blueprint, Response, jsonify, redirect, render_template, request, send_file, url_for
 
-from ..services.search_service import get_cached_results, search
+from ..models.result import SearchPage
+from ..services import tracing
+from ..services.payload import EncodedPayload
+from ..services.search_service import (
+    cache_control,
+    get_cached_results,
+    price_history,
+    profiler,
+    search,
+    search_batch,
+    search_payload,
+)
 
 bp = Blueprint("search", __name__)
 
@@ -17,11 +30,114 @@ def index():
 @bp.route("/search", methods=["GET"])
 def search_route():
     query = request.args.get("q", "").strip()
+    limit = request.args.get("limit", type=int)
+    offset = request.args.get("offset", 0, type=int)
     if not query:
-        return jsonify({"query": query, "results": []})
+        empty = SearchPage(results=[], total=0, limit=limit, offset=offset)
+        return jsonify({"query": query, **empty.to_dict()})
 
-    results = search(query)
-    return jsonify({"query": query, "results": [r.to_dict() for r in results]})
+    profile_requested = request.args.get("profile") == "1"
+    profiled = profiler.should_profile(profile_requested, request.headers.get("X-Admin-Token"))
+    if profile_requested and not profiled:
+        return jsonify({"error": "forbidden"}), 403
+
+    def run() -> EncodedPayload:
+        return search_payload(
+            query,
+            limit=limit,
+            offset=offset,
+            min_price=request.args.get("min_price", type=int),
+            max_price=request.args.get("max_price", type=int),
+            source=request.args.get("source", "").strip() or None,
+            budget_ms=request.args.get("budget_ms", type=int),
+            # An explicit profile request measures a real search, not a cache hit.
+            refresh=profile_requested,
+        )
+
+    with tracing.activate(tracing.Trace()) as trace:
+        if profiled:
+            with profiler.run(query) as profile:
+                payload = run()
+        else:
+            payload = run()
+    if request.args.get("trace") == "1":
+        response = _traced_response(payload, trace)
+    else:
+        response = _payload_response(payload)
+        response.headers["Server-Timing"] = trace.server_timing()
+    if profile_requested:
+        response.headers["Cache-Control"] = "no-store"
+        response.headers["X-Profile"] = ", ".join(os.path.basename(path) for path in profile.paths)
+    return response
+
+
+@bp.route("/search/batch", methods=["POST"])
+def search_batch_route():
+    data = request.get_json(silent=True) or {}
+    queries = data.get("queries")
+    if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+        return jsonify({"error": "queries must be a list of strings"}), 400
+    limit = data.get("limit")
+    if limit is not None and not isinstance(limit, int):
+        return jsonify({"error": "limit must be an integer"}), 400
+    budget_ms = data.get("budget_ms")
+    if budget_ms is not None and not isinstance(budget_ms, int):
+        return jsonify({"error": "budget_ms must be an integer"}), 400
+
+    try:
+        pages = search_batch(queries, limit=limit, budget_ms=budget_ms)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if request.args.get("format") == "ndjson" or "application/x-ndjson" in request.headers.get(
+        "Accept", ""
+    ):
+        # Each query is written as soon as its shops have answered.
+        lines = (
+            json.dumps({"query": query, **page.to_dict()}, ensure_ascii=False) + "\n"
+            for query, page in pages
+        )
+        return Response(lines, mimetype="application/x-ndjson")
+
+    by_query = {query: page for query, page in pages}
+    results = [
+        {"query": query, **by_query[query].to_dict()} for query in queries if query in by_query
+    ]
+    return jsonify({"results": results})
+
+
+def _traced_response(payload: EncodedPayload, trace: tracing.Trace) -> Response:
+    data = json.loads(payload.body)
+    data["trace"] = trace.to_dict()
+    response = jsonify(data)
+    response.headers["Server-Timing"] = trace.server_timing()
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+def _payload_response(payload: EncodedPayload) -> Response:
+    encoding, body = payload.negotiate(request.headers.get("Accept-Encoding", ""))
+    etag = payload.etag_for(encoding)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype="application/json")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control(payload.partial, payload.pending)
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+
+@bp.route("/history", methods=["GET"])
+def history_route():
+    title = request.args.get("title", "").strip()
+    if not title:
+        return jsonify({"error": "title is required"}), 400
+    history = price_history(title, days=request.args.get("days", type=int))
+    if history is None:
+        return jsonify({"error": "price history is disabled"}), 404
+    return jsonify(history)
 
 
 @bp.route("/download", methods=["GET"])
@@ -30,41 +146,45 @@ def download_route():
     if not query:
         return redirect(url_for("search.index", error="クエリを入力してください"))
 
-    cached = get_cached_results(query)
-    if cached is None:
-        results = search(query)
-    else:
-        results = cached
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(
-        [
-            "title",
-            "price",
-            "source",
-            "url",
-            "total",
-        ]
-    )
-    for r in results:
-        writer.writerow(
-            [
-                r.title,
-                r.price,
-                r.source,
-                r.url,
-                r.total,
-            ]
-        )
+    with tracing.activate(tracing.Trace()) as trace:
+        cached = get_cached_results(query)
+        if cached is None:
+            results = search(query)
+        else:
+            results = cached
+
+        with tracing.span("serialize"):
+            output = io.StringIO()
+            writer = csv.writer(output)
+            writer.writerow(
+                [
+                    "title",
+                    "price",
+                    "source",
+                    "url",
+                    "total",
+                ]
+            )
+            for r in results:
+                writer.writerow(
+                    [
+                        r.title,
+                        r.price,
+                        r.source,
+                        r.url,
+                        r.total,
+                    ]
+                )
 
-    output.seek(0)
-    data = io.BytesIO(output.getvalue().encode("utf-8"))
+            output.seek(0)
+            data = io.BytesIO(output.getvalue().encode("utf-8"))
     filename = f"whisky_results_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
 
-    return send_file(
+    response = send_file(
         data,
         mimetype="text/csv",
         as_attachment=True,
         download_name=filename,
     )
+    response.headers["Server-Timing"] = trace.server_timing()
+    return response
@@ -1,10 +1,131 @@
+import functools
+import re
+import time
 from abc import ABC, abstractmethod
+from typing import Optional
 
 from ..models.result import SearchResult
+from ..services import metrics, tracing
+from .extract import SelectorSpec, compiled, parse_price
+from .fetch import Fetcher, default_fetcher
+from .listing_memo import Listing, ListingMemo
+from .parse_pool import ParsePool
+from .structured import structured_results
+
+
+def _timed(method, phase: str):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.phase_seconds.observe(self.name, phase, value=elapsed)
+            tracing.record(f"{self.name}.{phase}", elapsed)
+
+    wrapper.instrumented = True
+    return wrapper
 
 
 class BaseScraper(ABC):
     name = "base"
+    # Scrapers that walk result pages accept a per-call max_pages override.
+    supports_page_depth = False
+    fetcher: Fetcher = default_fetcher
+    # Methods timed into the per-scraper phase histogram.
+    instrumented_methods = {"_fetch_soup": "fetch", "_parse_results": "parse"}
+    # Remembers parsed listing pages; set by the service when incremental
+    # refresh is enabled.
+    listing_memo: Optional[ListingMemo] = None
+    # Parses pages in worker processes when set by the service.
+    parse_pool: Optional[ParsePool] = None
+    # Where a listing keeps its items; scrapers that set this inherit
+    # _parse_results instead of walking the page by hand.
+    selector_spec: Optional[SelectorSpec] = None
+    _parse_price = staticmethod(parse_price)
+    # Finds page numbers in pager links of the raw HTML, for pages whose
+    # results came from structured data and never got a soup.
+    page_link_pattern: Optional[re.Pattern] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for method_name, phase in cls.instrumented_methods.items():
+            method = getattr(cls, method_name, None)
+            if method is not None and not getattr(method, "instrumented", False):
+                setattr(cls, method_name, _timed(method, phase))
+
+    def _get(self, url: str, **kwargs):
+        return self.fetcher.get(self.session, url, label=self.name, **kwargs)
+
+    def _fetch_listing(self, url: str) -> Optional[Listing]:
+        # Paging scrapers split fetching (_fetch_text) from parsing
+        # (_parse_page) so an unchanged body skips the parse entirely.
+        text = self._fetch_text(url)
+        if text is None:
+            return None
+        if self.listing_memo is None:
+            return self._parse_page(text)
+        return self.listing_memo.parse(url, text, self._parse_page)
+
+    def _deep_pages(self, key: str, first_page: list[SearchResult]) -> dict[int, list[SearchResult]]:
+        if self.listing_memo is None:
+            return {}
+        return self.listing_memo.deep_pages(key, first_page)
+
+    def _remember_pages(
+        self,
+        key: str,
+        first_page: list[SearchResult],
+        pages: dict[int, list[SearchResult]],
+    ) -> None:
+        if self.listing_memo is not None:
+            self.listing_memo.remember(key, first_page, pages)
+
+    def parse_archived(self, text: str) -> list[SearchResult]:
+        # Re-runs the current parser over a stored page body.
+        return self._parse_page(text)[0]
+
+    def _structured_results(self, text: str) -> list[SearchResult]:
+        spec = self.selector_spec
+        if spec is None:
+            return structured_results(text, self.name)
+        return structured_results(text, spec.source, spec.base_url)
+
+    def _parse_page(self, text: str) -> Listing:
+        if self.parse_pool is not None:
+            return self.parse_pool.parse(type(self), text, self._parse_text)
+        return self._parse_text(text)
+
+    def _parse_text(self, text: str) -> Listing:
+        # ld+json product lists are read without building a tree; the CSS
+        # selectors only run when a page has none.
+        results = self._structured_results(text)
+        if results:
+            return results, self._max_page_in_text(text)
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(text, "lxml")
+        return self._parse_results(soup), self._extract_max_page(soup)
+
+    def _max_page_in_text(self, text: str) -> int:
+        if self.page_link_pattern is None:
+            return 1
+        pages = [int(n) for n in self.page_link_pattern.findall(text)]
+        return max(pages, default=1)
+
+    def _extract_max_page(self, soup) -> int:
+        return 1
+
+    def _parse_results(self, soup) -> list[SearchResult]:
+        if self.selector_spec is None:
+            raise NotImplementedError
+        return compiled(self.selector_spec).extract(soup)
+
+    def _tag_page(self, results: list[SearchResult], page: int) -> list[SearchResult]:
+        for result in results:
+            result.page = page
+        return results
 
     @abstractmethod
     def search(self, query: str) -> list[SearchResult]:
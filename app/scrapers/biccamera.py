@@ -1,14 +1,17 @@
 import json
 import re
 import sys
+import threading
 import time
-from typing import Optional
+from typing import Callable, Optional
 from urllib.parse import parse_qs, urlencode, urljoin, urlsplit, urlunsplit
 
 import requests
 from bs4 import BeautifulSoup
 
 from .base import BaseScraper
+from .browser_pool import BrowserPool
+from .structured import results_from_json_ld, structured_results
 from ..models.result import SearchResult
 
 
@@ -22,6 +25,37 @@ class BiccameraScraper(BaseScraper):
         "AppleWebKit/537.36 (KHTML, like Gecko) "
         "Chrome/122.0.0.0 Safari/537.36"
     )
+    supports_page_depth = True
+    instrumented_methods = {"_fetch_page": "fetch", "_parse_results": "parse"}
+    blocked_resource_types = ("image", "media", "font", "stylesheet")
+    blocked_host_suffixes = (
+        "google-analytics.com",
+        "googletagmanager.com",
+        "googlesyndication.com",
+        "doubleclick.net",
+        "facebook.net",
+        "facebook.com",
+        "criteo.com",
+        "criteo.net",
+        "yahoo.co.jp",
+        "yimg.jp",
+        "adnxs.com",
+        "rtoaster.jp",
+        "karte.io",
+        "clarity.ms",
+        "line-scdn.net",
+        "twitter.com",
+        "tiktok.com",
+    )
+    # Only XHR/fetch responses from these paths carry the listing itself;
+    # recommendation and ranking widgets use other endpoints.
+    listing_api_keywords = ("search", "category", "items")
+    # Resolves once the product list or an ItemList JSON-LD block is in the DOM.
+    ready_script = """() => (
+        document.querySelector("a[href*='/bc/item/']") !== null
+        || Array.from(document.querySelectorAll("script[type='application/ld+json']"))
+            .some((s) => s.textContent.includes("ItemList"))
+    )"""
 
     def __init__(
         self,
@@ -37,8 +71,15 @@ class BiccameraScraper(BaseScraper):
         playwright_browser: str = "chromium",
         playwright_headless: bool = True,
         playwright_timeout_ms: int = 45000,
-        playwright_post_load_wait_ms: int = 1000,
+        playwright_post_load_wait_ms: int = 0,
+        playwright_ready_timeout_ms: int = 8000,
         playwright_user_agent: Optional[str] = None,
+        playwright_pool_size: int = 1,
+        playwright_max_navigations: int = 50,
+        playwright_parallel_tabs: int = 3,
+        playwright_cdp_endpoint: Optional[str] = None,
+        browser_pool: Optional[BrowserPool] = None,
+        session_handoff: bool = True,
         debug: bool = False,
         debug_output_path: Optional[str] = None,
     ):
@@ -55,7 +96,17 @@ class BiccameraScraper(BaseScraper):
         self.playwright_headless = playwright_headless
         self.playwright_timeout_ms = playwright_timeout_ms
         self.playwright_post_load_wait_ms = playwright_post_load_wait_ms
+        self.playwright_ready_timeout_ms = playwright_ready_timeout_ms
         self.playwright_user_agent = playwright_user_agent or self.default_playwright_user_agent
+        self.playwright_pool_size = playwright_pool_size
+        self.playwright_max_navigations = playwright_max_navigations
+        self.playwright_parallel_tabs = playwright_parallel_tabs
+        self.playwright_cdp_endpoint = playwright_cdp_endpoint
+        self._browser_pool = browser_pool
+        self.session_handoff = session_handoff
+        # "playwright" or "requests": whichever path last produced results.
+        self._preferred_path: Optional[str] = None
+        self._state_lock = threading.Lock()
         self.debug = debug
         self.debug_output_path = debug_output_path
         self.session.headers.update(
@@ -102,19 +153,14 @@ class BiccameraScraper(BaseScraper):
         )
         return f"{urljoin(self.base_url, self.search_path)}?{query_str}"
 
-    def _parse_price(self, text: str) -> Optional[int]:
-        if not text:
-            return None
-        match = re.search(r"([0-9,]+)", text)
-        if not match:
-            return None
-        return int(match.group(1).replace(",", ""))
-
     def _fetch_soup(self, url: str) -> Optional[BeautifulSoup]:
+        return self._fetch_page(url)[0]
+
+    def _fetch_page(self, url: str) -> tuple[Optional[BeautifulSoup], bool]:
         last_error: Exception | None = None
         for attempt in range(self.retry_count + 1):
             try:
-                response = self.session.get(url, timeout=(5, self.timeout_seconds))
+                response = self._get(url, timeout=(5, self.timeout_seconds))
                 if not response.encoding:
                     response.encoding = "utf-8"
                 if self.debug:
@@ -128,10 +174,12 @@ class BiccameraScraper(BaseScraper):
                                 f.write(response.text)
                         except OSError:
                             pass
-                if response.status_code in (403, 404):
-                    return None
+                if response.status_code == 403:
+                    return None, True
+                if response.status_code == 404:
+                    return None, False
                 response.raise_for_status()
-                return BeautifulSoup(response.text, "lxml")
+                return BeautifulSoup(response.text, "lxml"), False
             except requests.RequestException as exc:
                 last_error = exc
                 if self.debug:
@@ -141,25 +189,77 @@ class BiccameraScraper(BaseScraper):
                 time.sleep(self.retry_delay_seconds)
         if last_error:
             raise last_error
-        return None
+        return None, False
+
+    def _is_blocked_request(self, request) -> bool:
+        if request.resource_type in self.blocked_resource_types:
+            return True
+        host = urlsplit(request.url).hostname or ""
+        return any(
+            host == suffix or host.endswith(f".{suffix}")
+            for suffix in self.blocked_host_suffixes
+        )
+
+    def _route_request(self, route, request) -> None:
+        if self._is_blocked_request(request):
+            route.abort()
+        else:
+            route.continue_()
 
-    def _fetch_soup_playwright(self, page, url: str) -> Optional[BeautifulSoup]:
+    def _capture_response(self, response, captured: list[SearchResult]) -> None:
         try:
-            page.goto(url, wait_until="domcontentloaded", timeout=self.playwright_timeout_ms)
-            try:
-                page.wait_for_load_state("networkidle", timeout=self.playwright_timeout_ms)
-            except Exception:
-                pass
+            if response.request.resource_type not in ("xhr", "fetch"):
+                return
+            path = urlsplit(response.request.url).path.lower()
+            if not any(keyword in path for keyword in self.listing_api_keywords):
+                return
+            if "json" not in response.headers.get("content-type", ""):
+                return
+            captured.extend(self._from_json_data(response.json()))
+        except Exception:
+            return
+
+    def _wait_until_ready(
+        self,
+        page,
+        captured: list[SearchResult],
+        deadline: Optional[float] = None,
+    ) -> None:
+        if deadline is None:
+            deadline = time.monotonic() + self.playwright_ready_timeout_ms / 1000
+        while not captured:
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                return
             try:
-                page.wait_for_selector("script[type='application/ld+json']", timeout=2000)
+                page.wait_for_function(self.ready_script, timeout=min(remaining_ms, 250))
+                return
             except Exception:
-                pass
+                if page.is_closed():
+                    return
+
+    def _fetch_soup_playwright(
+        self,
+        page,
+        url: str,
+        captured: Optional[list[SearchResult]] = None,
+    ) -> Optional[BeautifulSoup]:
+        if captured is None:
+            captured = []
+
+        def handler(response) -> None:
+            self._capture_response(response, captured)
+
+        page.on("response", handler)
+        try:
+            page.goto(url, wait_until="commit", timeout=self.playwright_timeout_ms)
+            self._wait_until_ready(page, captured)
             if self.playwright_post_load_wait_ms:
                 page.wait_for_timeout(self.playwright_post_load_wait_ms)
             html = page.content()
             if self.debug:
                 print(
-                    f"[biccamera] playwright {url} ({len(html)} bytes)",
+                    f"[biccamera] playwright {url} ({len(html)} bytes, {len(captured)} from xhr)",
                     file=sys.stderr,
                 )
                 if self.debug_output_path:
@@ -173,97 +273,300 @@ class BiccameraScraper(BaseScraper):
             if self.debug:
                 print(f"[biccamera] playwright failed: {exc}", file=sys.stderr)
             return None
+        finally:
+            try:
+                page.remove_listener("response", handler)
+            except Exception:
+                pass
+
+    def _load_playwright(
+        self,
+        page,
+        url: str,
+    ) -> Optional[tuple[BeautifulSoup, list[SearchResult]]]:
+        captured: list[SearchResult] = []
+        soup = self._fetch_soup_playwright(page, url, captured)
+        if soup is None:
+            return None
+        return soup, self._merge_captured(soup, captured)
+
+    def _merge_captured(
+        self,
+        soup: BeautifulSoup,
+        captured: list[SearchResult],
+    ) -> list[SearchResult]:
+        results = self._parse_results(soup)
+        seen = {r.url for r in results}
+        for result in captured:
+            if result.url not in seen:
+                seen.add(result.url)
+                results.append(result)
+        return results
 
-    def _search_with_playwright(self, query: str) -> list[SearchResult]:
+    def _load_playwright_many(
+        self,
+        lease,
+        urls: list[str],
+    ) -> list[Optional[tuple[BeautifulSoup, list[SearchResult]]]]:
+        if self.playwright_parallel_tabs <= 1 or len(urls) <= 1:
+            return [self._load_playwright(lease.page, url) for url in urls]
+
+        loaded: list[Optional[tuple[BeautifulSoup, list[SearchResult]]]] = []
+        for start in range(0, len(urls), self.playwright_parallel_tabs):
+            batch = urls[start : start + self.playwright_parallel_tabs]
+            loaded.extend(self._load_playwright_batch(lease, batch))
+        return loaded
+
+    def _load_playwright_batch(
+        self,
+        lease,
+        urls: list[str],
+    ) -> list[Optional[tuple[BeautifulSoup, list[SearchResult]]]]:
+        # Fresh tabs per batch: a reused tab could still show the previous
+        # batch's listing while its next navigation is in flight.
+        loaded: list[Optional[tuple[BeautifulSoup, list[SearchResult]]]] = []
+        pending = []
         try:
-            from playwright.sync_api import sync_playwright  # type: ignore
-        except Exception as exc:
-            if self.debug:
-                print(f"[biccamera] playwright import failed: {exc}", file=sys.stderr)
-            return []
+            # Commit every navigation first so the tabs load concurrently,
+            # then harvest them in page order.
+            for url in urls:
+                tab = lease.new_page()
+                captured: list[SearchResult] = []
+
+                def handler(response, captured=captured) -> None:
+                    self._capture_response(response, captured)
+
+                tab.on("response", handler)
+                try:
+                    tab.goto(url, wait_until="commit", timeout=self.playwright_timeout_ms)
+                    pending.append((tab, url, captured, handler))
+                except Exception as exc:
+                    tab.remove_listener("response", handler)
+                    if self.debug:
+                        print(f"[biccamera] playwright failed: {exc}", file=sys.stderr)
+                    pending.append((tab, url, None, None))
+
+            deadline = time.monotonic() + self.playwright_ready_timeout_ms / 1000
+            for tab, url, captured, handler in pending:
+                if captured is None:
+                    loaded.append(None)
+                    continue
+                try:
+                    self._wait_until_ready(tab, captured, deadline)
+                    soup = BeautifulSoup(tab.content(), "lxml")
+                except Exception as exc:
+                    if self.debug:
+                        print(f"[biccamera] playwright failed: {exc}", file=sys.stderr)
+                    loaded.append(None)
+                    continue
+                finally:
+                    tab.remove_listener("response", handler)
+                if self.debug:
+                    print(f"[biccamera] playwright tab {url}", file=sys.stderr)
+                loaded.append((soup, self._merge_captured(soup, captured)))
+        finally:
+            for tab, *_ in pending:
+                try:
+                    tab.close()
+                except Exception:
+                    pass
+        return loaded
 
-        with sync_playwright() as p:
-            if self.playwright_browser == "webkit":
-                browser_type = p.webkit
-            elif self.playwright_browser == "firefox":
-                browser_type = p.firefox
-            else:
-                browser_type = p.chromium
+    def _configure_context(self, context) -> None:
+        context.set_extra_http_headers(
+            {
+                "Accept-Language": "ja,en-US;q=0.9,en;q=0.8",
+            }
+        )
+        context.add_init_script(
+            "Object.defineProperty(navigator, 'webdriver', {get: () => undefined});"
+        )
+        context.route("**/*", self._route_request)
 
-            browser = browser_type.launch(
+    def _get_browser_pool(self) -> BrowserPool:
+        if self._browser_pool is None:
+            self._browser_pool = BrowserPool(
+                browser_name=self.playwright_browser,
                 headless=self.playwright_headless,
-                args=["--disable-blink-features=AutomationControlled"],
-            )
-            context = browser.new_context(
-                user_agent=self.playwright_user_agent,
-                locale="ja-JP",
-                viewport={"width": 1280, "height": 720},
+                max_size=self.playwright_pool_size,
+                max_navigations=self.playwright_max_navigations,
+                cdp_endpoint=self.playwright_cdp_endpoint,
+                context_options={
+                    "user_agent": self.playwright_user_agent,
+                    "locale": "ja-JP",
+                    "viewport": {"width": 1280, "height": 720},
+                },
+                configure_context=self._configure_context,
+                debug=self.debug,
             )
-            context.set_extra_http_headers(
-                {
-                    "Accept-Language": "ja,en-US;q=0.9,en;q=0.8",
-                }
-            )
-            context.add_init_script(
-                "Object.defineProperty(navigator, 'webdriver', {get: () => undefined});"
-            )
-            page = context.new_page()
-            page.route(
-                "**/*",
-                lambda route, request: route.abort()
-                if request.resource_type in ("image", "media", "font")
-                else route.continue_(),
+        return self._browser_pool
+
+    def close(self) -> None:
+        if self._browser_pool is not None:
+            self._browser_pool.close()
+            self._browser_pool = None
+
+    def _search_with_playwright(self, query: str, max_pages: int) -> list[SearchResult]:
+        pool = self._get_browser_pool()
+        # Each page may take a full playwright timeout; leave room for a few of them.
+        timeout = self.playwright_timeout_ms / 1000 * (max_pages + 2)
+        try:
+            return pool.run(
+                lambda lease: self._run_playwright_search(lease, query, max_pages),
+                timeout=timeout,
             )
+        except Exception as exc:
+            if self.debug:
+                print(f"[biccamera] playwright search failed: {exc}", file=sys.stderr)
+            return []
 
-            try:
-                url = self._search_url(query, page=1)
-                soup = self._fetch_soup_playwright(page, url)
-                if soup is None:
-                    if self.category_url:
-                        fallback_url = self._search_url_basic(query, page=1)
-                        soup = self._fetch_soup_playwright(page, fallback_url)
-                    if soup is None:
-                        return []
-
-                results = self._parse_results(soup)
-
-                if self.max_pages <= 1:
-                    return results
-
-                if self.category_url:
-                    page_urls = self._extract_page_urls(soup)
-                    for page_url in page_urls[: self.max_pages - 1]:
-                        page_soup = self._fetch_soup_playwright(page, page_url)
-                        if page_soup is None:
-                            break
-                        results.extend(self._parse_results(page_soup))
-                    if not results:
-                        fallback_url = self._search_url_basic(query, page=1)
-                        fallback_soup = self._fetch_soup_playwright(page, fallback_url)
-                        if fallback_soup:
-                            results = self._parse_results(fallback_soup)
-                    return results
-
-                max_page = min(self._extract_max_page(soup), self.max_pages)
-                if max_page <= 1:
-                    return results
-
-                for page_num in range(2, max_page + 1):
-                    page_url = self._search_url(query, page=page_num)
-                    page_soup = self._fetch_soup_playwright(page, page_url)
-                    if page_soup is None:
-                        break
-                    results.extend(self._parse_results(page_soup))
-
-                if not results:
-                    fallback_url = self._search_url_basic(query, page=1)
-                    fallback_soup = self._fetch_soup_playwright(page, fallback_url)
-                    if fallback_soup:
-                        results = self._parse_results(fallback_soup)
-                return results
-            finally:
-                context.close()
-                browser.close()
+    def _run_playwright_search(self, lease, query: str, max_pages: int) -> list[SearchResult]:
+        results = self._search_playwright_lease(lease, query, max_pages)
+        if results and self.session_handoff:
+            self._export_session(lease)
+        return results
+
+    def _export_session(self, lease) -> None:
+        try:
+            cookies = lease.context.cookies()
+            user_agent = lease.page.evaluate("() => navigator.userAgent")
+        except Exception as exc:
+            if self.debug:
+                print(f"[biccamera] session export failed: {exc}", file=sys.stderr)
+            return
+        with self._state_lock:
+            for cookie in cookies:
+                self.session.cookies.set(
+                    cookie["name"],
+                    cookie["value"],
+                    domain=cookie.get("domain", ""),
+                    path=cookie.get("path", "/"),
+                )
+            if user_agent:
+                self.session.headers["User-Agent"] = user_agent
+            self._preferred_path = "requests"
+        if self.debug:
+            print(f"[biccamera] handed {len(cookies)} cookies to requests session", file=sys.stderr)
+
+    def _extend_in_order(
+        self,
+        results: list[SearchResult],
+        loaded_pages: list[Optional[tuple[BeautifulSoup, list[SearchResult]]]],
+    ) -> None:
+        for page_num, page_loaded in enumerate(loaded_pages, start=2):
+            if page_loaded is None:
+                break
+            results.extend(self._tag_page(page_loaded[1], page_num))
+
+    def _search_playwright_lease(self, lease, query: str, max_pages: int) -> list[SearchResult]:
+        page = lease.page
+        url = self._search_url(query, page=1)
+        loaded = self._load_playwright(page, url)
+        if loaded is None:
+            if self.category_url:
+                fallback_url = self._search_url_basic(query, page=1)
+                loaded = self._load_playwright(page, fallback_url)
+            if loaded is None:
+                return []
+
+        soup, results = loaded
+
+        if max_pages <= 1:
+            return results
+
+        if self.category_url:
+            page_urls = self._extract_page_urls(soup)[: max_pages - 1]
+            self._extend_in_order(results, self._load_playwright_many(lease, page_urls))
+            if not results:
+                fallback_loaded = self._load_playwright(page, self._search_url_basic(query, page=1))
+                if fallback_loaded:
+                    results = fallback_loaded[1]
+            return results
+
+        max_page = min(self._extract_max_page(soup), max_pages)
+        if max_page <= 1:
+            return results
+
+        page_urls = [self._search_url(query, page=n) for n in range(2, max_page + 1)]
+        self._extend_in_order(results, self._load_playwright_many(lease, page_urls))
+
+        if not results:
+            fallback_loaded = self._load_playwright(page, self._search_url_basic(query, page=1))
+            if fallback_loaded:
+                results = fallback_loaded[1]
+        return results
+
+    def _result_from_item(self, item: dict) -> Optional[SearchResult]:
+        name = item.get("name") or item.get("title")
+        url = item.get("url")
+        offers = item.get("offers") or {}
+        if isinstance(offers, list):
+            offers = offers[0] if offers else {}
+        price = offers.get("price") if isinstance(offers, dict) else None
+        if price is None:
+            price = item.get("price")
+        if not (name and url and price) or not isinstance(name, str) or not isinstance(url, str):
+            return None
+        try:
+            price_value = int(str(price).replace(",", ""))
+        except ValueError:
+            return None
+        return SearchResult(
+            title=name,
+            price=price_value,
+            source="ビックカメラ",
+            url=urljoin(self.base_url, url),
+        )
+
+    def _from_json_nodes(self, data) -> list[SearchResult]:
+        results: list[SearchResult] = []
+        if isinstance(data, list):
+            nodes = data
+        else:
+            nodes = [data]
+
+        for node in nodes:
+            if not isinstance(node, dict):
+                continue
+            if node.get("@type") == "ItemList":
+                for elem in node.get("itemListElement", []):
+                    if isinstance(elem, dict):
+                        item = elem.get("item") or elem
+                        if isinstance(item, dict):
+                            result = self._result_from_item(item)
+                            if result:
+                                results.append(result)
+            elif node.get("@type") == "Product":
+                result = self._result_from_item(node)
+                if result:
+                    results.append(result)
+        return results
+
+    def _from_json_data(self, data, depth: int = 0) -> list[SearchResult]:
+        # XHR payloads have no fixed schema; look for product-shaped dicts.
+        results = self._from_json_nodes(data)
+        if results or depth > 4:
+            return results
+        if isinstance(data, dict):
+            children = list(data.values())
+        elif isinstance(data, list):
+            children = data
+        else:
+            return results
+        items = [
+            r
+            for r in (self._result_from_item(c) for c in children if isinstance(c, dict))
+            if r
+        ]
+        if items:
+            return items
+        for child in children:
+            if isinstance(child, (dict, list)):
+                results.extend(self._from_json_data(child, depth + 1))
+        return results
+
+    def _structured_results(self, text: str) -> list[SearchResult]:
+        return structured_results(text, "ビックカメラ", self.base_url)
 
     def _from_json_ld(self, soup: BeautifulSoup) -> list[SearchResult]:
         results: list[SearchResult] = []
@@ -275,42 +578,7 @@ class BiccameraScraper(BaseScraper):
                 data = json.loads(raw)
             except json.JSONDecodeError:
                 continue
-
-            def handle_item(item: dict) -> None:
-                name = item.get("name") or item.get("title")
-                url = item.get("url")
-                offers = item.get("offers") or {}
-                price = offers.get("price") if isinstance(offers, dict) else None
-                if name and url and price:
-                    try:
-                        price_value = int(str(price).replace(",", ""))
-                    except ValueError:
-                        return
-                    results.append(
-                        SearchResult(
-                            title=name,
-                            price=price_value,
-                            source="ビックカメラ",
-                            url=urljoin(self.base_url, url),
-                        )
-                    )
-
-            if isinstance(data, list):
-                nodes = data
-            else:
-                nodes = [data]
-
-            for node in nodes:
-                if not isinstance(node, dict):
-                    continue
-                if node.get("@type") == "ItemList":
-                    for elem in node.get("itemListElement", []):
-                        if isinstance(elem, dict):
-                            item = elem.get("item") or elem
-                            if isinstance(item, dict):
-                                handle_item(item)
-                elif node.get("@type") == "Product":
-                    handle_item(node)
+            results.extend(results_from_json_ld(data, "ビックカメラ", self.base_url))
         return results
 
     def _from_links(self, soup: BeautifulSoup) -> list[SearchResult]:
@@ -388,63 +656,107 @@ class BiccameraScraper(BaseScraper):
             return results
         return self._from_links(soup)
 
-    def search(self, query: str) -> list[SearchResult]:
+    def search(self, query: str, max_pages: Optional[int] = None) -> list[SearchResult]:
         if not query:
             return []
+        max_pages = max_pages or self.max_pages
+
+        with self._state_lock:
+            preferred = self._preferred_path
 
-        if self.use_playwright:
-            results = self._search_with_playwright(query)
+        tried_playwright = False
+        if self.use_playwright and preferred != "requests":
+            tried_playwright = True
+            results = self._search_with_playwright(query, max_pages)
             if results:
+                with self._state_lock:
+                    if self._preferred_path is None or not self.session_handoff:
+                        self._preferred_path = "playwright"
                 return results
 
+        results, blocked = self._search_with_requests(query, max_pages)
+        # A 403, or a 200 challenge page that parses to nothing, means the
+        # handed-off session is no good: go back to the browser.
+        if blocked or (not results and preferred == "requests"):
+            with self._state_lock:
+                self._preferred_path = "playwright"
+            if self.use_playwright and not tried_playwright:
+                return self._search_with_playwright(query, max_pages)
+        elif results:
+            with self._state_lock:
+                self._preferred_path = "requests"
+        return results
+
+    def _search_with_requests(
+        self,
+        query: str,
+        max_pages: int,
+    ) -> tuple[list[SearchResult], bool]:
+        blocked = False
+
+        def fetch(url: str) -> Optional[BeautifulSoup]:
+            nonlocal blocked
+            soup, was_blocked = self._fetch_page(url)
+            blocked = blocked or was_blocked
+            return soup
+
+        results = self._requests_results(query, max_pages, fetch)
+        return results, blocked
+
+    def _requests_results(
+        self,
+        query: str,
+        max_pages: int,
+        fetch: Callable[[str], Optional[BeautifulSoup]],
+    ) -> list[SearchResult]:
         url = self._search_url(query, page=1)
-        soup = self._fetch_soup(url)
+        soup = fetch(url)
         if soup is None:
             if self.category_url:
                 fallback_url = self._search_url_basic(query, page=1)
-                fallback_soup = self._fetch_soup(fallback_url)
+                fallback_soup = fetch(fallback_url)
                 if fallback_soup:
                     return self._parse_results(fallback_soup)
             return []
 
         results = self._parse_results(soup)
 
-        if self.max_pages <= 1:
+        if max_pages <= 1:
             if not results and self.category_url:
                 fallback_url = self._search_url_basic(query, page=1)
-                fallback_soup = self._fetch_soup(fallback_url)
+                fallback_soup = fetch(fallback_url)
                 if fallback_soup:
                     return self._parse_results(fallback_soup)
             return results
 
         if self.category_url:
             page_urls = self._extract_page_urls(soup)
-            for page_url in page_urls[: self.max_pages - 1]:
-                page_soup = self._fetch_soup(page_url)
+            for page_num, page_url in enumerate(page_urls[: max_pages - 1], start=2):
+                page_soup = fetch(page_url)
                 if page_soup is None:
                     break
-                results.extend(self._parse_results(page_soup))
+                results.extend(self._tag_page(self._parse_results(page_soup), page_num))
             if not results:
                 fallback_url = self._search_url_basic(query, page=1)
-                fallback_soup = self._fetch_soup(fallback_url)
+                fallback_soup = fetch(fallback_url)
                 if fallback_soup:
                     results = self._parse_results(fallback_soup)
             return results
 
-        max_page = min(self._extract_max_page(soup), self.max_pages)
+        max_page = min(self._extract_max_page(soup), max_pages)
         if max_page <= 1:
             return results
 
         for page in range(2, max_page + 1):
             page_url = self._search_url(query, page=page)
-            page_soup = self._fetch_soup(page_url)
+            page_soup = fetch(page_url)
             if page_soup is None:
                 break
-            results.extend(self._parse_results(page_soup))
+            results.extend(self._tag_page(self._parse_results(page_soup), page))
 
         if not results:
             fallback_url = self._search_url_basic(query, page=1)
-            fallback_soup = self._fetch_soup(fallback_url)
+            fallback_soup = fetch(fallback_url)
             if fallback_soup:
                 results = self._parse_results(fallback_soup)
         return results
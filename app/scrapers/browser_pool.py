@@ -0,0 +1,204 @@
+import queue
+import sys
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+# Playwright's sync API is bound to the thread that started it, so every slot
+# owns a worker thread with its own browser/context and leases run there.
+
+
+class PageLease:
+    def __init__(self, slot: "_Slot"):
+        self._slot = slot
+
+    @property
+    def page(self):
+        return self._slot.page
+
+    @property
+    def context(self):
+        return self._slot.context
+
+    def new_page(self):
+        return self._slot.context.new_page()
+
+
+class _Slot:
+    def __init__(self, pool: "BrowserPool", index: int):
+        self.pool = pool
+        self.index = index
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.navigations = 0
+
+    def _count_navigation(self, frame) -> None:
+        if frame.parent_frame is None:
+            self.navigations += 1
+
+    def _watch_page(self, page) -> None:
+        page.on("framenavigated", self._count_navigation)
+
+    def healthy(self) -> bool:
+        if self.browser is None or self.page is None:
+            return False
+        try:
+            return self.browser.is_connected() and not self.page.is_closed()
+        except Exception:
+            return False
+
+    def start(self) -> None:
+        if self.playwright is None:
+            from playwright.sync_api import sync_playwright  # type: ignore
+
+            self.playwright = sync_playwright().start()
+
+        pool = self.pool
+        if self.browser is None or not self.browser.is_connected():
+            browser_type = getattr(self.playwright, pool.browser_name, self.playwright.chromium)
+            if pool.cdp_endpoint:
+                self.browser = self.playwright.chromium.connect_over_cdp(pool.cdp_endpoint)
+            else:
+                self.browser = browser_type.launch(
+                    headless=pool.headless,
+                    args=list(pool.launch_args),
+                )
+
+        self.context = self.browser.new_context(**pool.context_options)
+        if pool.configure_context:
+            pool.configure_context(self.context)
+        self.context.on("page", self._watch_page)
+        self.page = self.context.new_page()
+        self.navigations = 0
+
+    def close_context(self) -> None:
+        if self.context is not None:
+            try:
+                self.context.close()
+            except Exception:
+                pass
+        self.context = None
+        self.page = None
+
+    def close(self) -> None:
+        self.close_context()
+        if self.browser is not None:
+            try:
+                self.browser.close()
+            except Exception:
+                pass
+        self.browser = None
+        if self.playwright is not None:
+            try:
+                self.playwright.stop()
+            except Exception:
+                pass
+        self.playwright = None
+
+    def ensure_ready(self) -> None:
+        if self.page is not None and self.navigations >= self.pool.max_navigations:
+            self.pool._log(f"slot {self.index} recycled after {self.navigations} navigations")
+            self.close_context()
+        if not self.healthy():
+            if self.browser is not None and not self.browser.is_connected():
+                self.pool._log(f"slot {self.index} browser disconnected, relaunching")
+                self.close()
+            else:
+                self.close_context()
+            self.start()
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        browser_name: str = "chromium",
+        headless: bool = True,
+        max_size: int = 1,
+        max_navigations: int = 50,
+        cdp_endpoint: Optional[str] = None,
+        launch_args: tuple[str, ...] = ("--disable-blink-features=AutomationControlled",),
+        context_options: Optional[dict] = None,
+        configure_context: Optional[Callable[[Any], None]] = None,
+        debug: bool = False,
+    ):
+        if browser_name not in ("chromium", "firefox", "webkit"):
+            browser_name = "chromium"
+        self.browser_name = browser_name
+        self.headless = headless
+        self.max_size = max(max_size, 1)
+        self.max_navigations = max(max_navigations, 1)
+        self.cdp_endpoint = cdp_endpoint
+        self.launch_args = launch_args
+        self.context_options = context_options or {}
+        self.configure_context = configure_context
+        self.debug = debug
+        self._tasks: queue.Queue = queue.Queue()
+        self._workers: list[threading.Thread] = []
+        self._idle = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _log(self, message: str) -> None:
+        if self.debug:
+            print(f"[browser-pool] {message}", file=sys.stderr)
+
+    def _maybe_grow(self) -> None:
+        with self._lock:
+            if self._idle > 0 or len(self._workers) >= self.max_size:
+                return
+            index = len(self._workers)
+            worker = threading.Thread(
+                target=self._worker,
+                args=(index,),
+                name=f"browser-pool-{index}",
+                daemon=True,
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _worker(self, index: int) -> None:
+        slot = _Slot(self, index)
+        try:
+            while True:
+                with self._lock:
+                    self._idle += 1
+                task = self._tasks.get()
+                with self._lock:
+                    self._idle -= 1
+                if task is None:
+                    break
+                fn, future = task
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    slot.ensure_ready()
+                    future.set_result(fn(PageLease(slot)))
+                except BaseException as exc:
+                    future.set_exception(exc)
+                    if not slot.healthy():
+                        self._log(f"slot {slot.index} crashed: {exc}")
+                        slot.close()
+        finally:
+            slot.close()
+
+    def submit(self, fn: Callable[[PageLease], Any]) -> Future:
+        if self._closed:
+            raise RuntimeError("browser pool is closed")
+        future: Future = Future()
+        self._tasks.put((fn, future))
+        self._maybe_grow()
+        return future
+
+    def run(self, fn: Callable[[PageLease], Any], timeout: Optional[float] = None) -> Any:
+        return self.submit(fn).result(timeout=timeout)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+        for _ in workers:
+            self._tasks.put(None)
+        for worker in workers:
+            worker.join(timeout=10)
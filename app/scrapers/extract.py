@@ -0,0 +1,123 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Optional
+from urllib.parse import urljoin
+
+from ..models.result import SearchResult
+
+_YEN_PREFIX_RE = re.compile(r"[¥￥]\s*([0-9][0-9,]*)")
+_YEN_SUFFIX_RE = re.compile(r"([0-9][0-9,]*)\s*円")
+_NUMBER_RE = re.compile(r"([0-9][0-9,]*)")
+
+
+def parse_price(text: Optional[str]) -> Optional[int]:
+    if not text:
+        return None
+    # NFKC folds full-width digits, commas and the full-width yen sign.
+    text = unicodedata.normalize("NFKC", text)
+    # A number next to a yen sign wins over other numbers in the text
+    # (ages, volumes, "2本セット").
+    match = _YEN_PREFIX_RE.search(text) or _YEN_SUFFIX_RE.search(text) or _NUMBER_RE.search(text)
+    if not match:
+        return None
+    digits = match.group(1).replace(",", "")
+    return int(digits) if digits else None
+
+
+@dataclass(frozen=True)
+class SelectorSpec:
+    # One element per listed item.
+    container: str
+    # Relative to the container.
+    title: str
+    # Tried in order; the first element that yields a price is used.
+    price: tuple[str, ...]
+    source: str
+    # Defaults to the title element.
+    link: Optional[str] = None
+    # Items whose link has no href are dropped.
+    require_href: bool = False
+    # (selector, attribute) tried in order; attribute None means the text.
+    source_from: tuple[tuple[str, Optional[str]], ...] = ()
+    # Items whose category text lacks category_keyword are dropped.
+    category: Optional[str] = None
+    category_keyword: str = ""
+    base_url: str = ""
+    resolve_url: Optional[Callable[[str], str]] = None
+
+
+class Extractor:
+    def __init__(self, spec: SelectorSpec):
+        import soupsieve
+
+        self.spec = spec
+        self._container = soupsieve.compile(spec.container)
+        self._title = soupsieve.compile(spec.title)
+        self._link = soupsieve.compile(spec.link) if spec.link else None
+        self._price = [soupsieve.compile(selector) for selector in spec.price]
+        self._source = [
+            (soupsieve.compile(selector), attr) for selector, attr in spec.source_from
+        ]
+        self._category = soupsieve.compile(spec.category) if spec.category else None
+
+    def _source_of(self, item) -> str:
+        for pattern, attr in self._source:
+            el = pattern.select_one(item)
+            if el is None:
+                continue
+            value = (el.get(attr) or "").strip() if attr else el.get_text(" ", strip=True)
+            if value:
+                return value
+        return self.spec.source
+
+    def extract(self, soup) -> list[SearchResult]:
+        spec = self.spec
+        results: list[SearchResult] = []
+        for item in self._container.select(soup):
+            title_el = self._title.select_one(item)
+            if title_el is None:
+                continue
+
+            link_el = self._link.select_one(item) if self._link is not None else title_el
+            if link_el is None:
+                continue
+            href = link_el.get("href", "")
+            if spec.require_href and not href:
+                continue
+
+            if self._category is not None:
+                category_el = self._category.select_one(item)
+                if category_el is not None:
+                    category = category_el.get_text(" ", strip=True)
+                    if category and spec.category_keyword not in category:
+                        continue
+
+            price = None
+            for pattern in self._price:
+                price_el = pattern.select_one(item)
+                if price_el is not None:
+                    price = parse_price(price_el.get_text(" ", strip=True))
+                    break
+            if price is None:
+                continue
+
+            url = urljoin(spec.base_url, href) if spec.base_url else href
+            if spec.resolve_url is not None:
+                url = spec.resolve_url(url)
+
+            results.append(
+                SearchResult(
+                    title=title_el.get_text(" ", strip=True),
+                    price=price,
+                    source=self._source_of(item) if self._source else spec.source,
+                    url=url,
+                )
+            )
+        return results
+
+
+@lru_cache(maxsize=None)
+def compiled(spec: SelectorSpec) -> Extractor:
+    return Extractor(spec)
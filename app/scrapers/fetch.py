@@ -0,0 +1,272 @@
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from ..services import metrics, tracing
+from ..storage.page_archive import PageArchive
+
+logger = logging.getLogger(__name__)
+
+
+class HostBudget:
+    def __init__(self, rate_per_second: float, burst: int = 4):
+        self.rate_per_second = rate_per_second
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate_per_second
+            time.sleep(wait_seconds)
+
+
+class HostStats:
+    def __init__(self, window: int = 200):
+        self._latencies: deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def hedge_allowed(self, max_ratio: float) -> bool:
+        with self._lock:
+            return self.hedges + 1 <= self.requests * max_ratio
+
+    def count_hedge(self) -> None:
+        with self._lock:
+            self.hedges += 1
+
+    def percentile(self, q: float, min_samples: int) -> Optional[float]:
+        with self._lock:
+            if len(self._latencies) < min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+class Fetcher:
+    def __init__(
+        self,
+        hedge: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_min_samples: int = 20,
+        hedge_max_ratio: float = 0.1,
+        rate_per_second: float = 0.0,
+        burst: int = 4,
+        max_workers: int = 16,
+    ):
+        self.configure(
+            hedge=hedge,
+            hedge_percentile=hedge_percentile,
+            hedge_min_samples=hedge_min_samples,
+            hedge_max_ratio=hedge_max_ratio,
+            rate_per_second=rate_per_second,
+            burst=burst,
+        )
+        self.max_workers = max_workers
+        # Set by the service when the raw-page archive is enabled.
+        self.archive: Optional[PageArchive] = None
+        self._stats: dict[str, HostStats] = {}
+        self._budgets: dict[str, HostBudget] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        hedge: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_min_samples: int = 20,
+        hedge_max_ratio: float = 0.1,
+        rate_per_second: float = 0.0,
+        burst: int = 4,
+    ) -> None:
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_max_ratio = hedge_max_ratio
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._budgets = {}
+
+    def stats(self, host: str) -> HostStats:
+        with self._lock:
+            stats = self._stats.get(host)
+            if stats is None:
+                stats = self._stats[host] = HostStats()
+            return stats
+
+    def _budget(self, host: str) -> Optional[HostBudget]:
+        if self.rate_per_second <= 0:
+            return None
+        with self._lock:
+            budget = self._budgets.get(host)
+            if budget is None:
+                budget = self._budgets[host] = HostBudget(self.rate_per_second, self.burst)
+            return budget
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="fetch",
+                )
+            return self._executor
+
+    def _timed_get(
+        self,
+        session,
+        url: str,
+        kwargs: dict,
+        stats: HostStats,
+        label: str,
+    ) -> requests.Response:
+        started = time.monotonic()
+        response = session.get(url, **kwargs)
+        elapsed = time.monotonic() - started
+        stats.record(elapsed)
+        metrics.phase_seconds.observe(label, "network", value=elapsed)
+        tracing.record(f"{label}.network", elapsed)
+        metrics.http_responses.inc(label, str(getattr(response, "status_code", "")))
+        content = getattr(response, "content", None)
+        if content is not None:
+            metrics.response_bytes.inc(label, amount=len(content))
+        return response
+
+    def _may_hedge(self, stats: HostStats, budget: Optional[HostBudget]) -> bool:
+        if not stats.hedge_allowed(self.hedge_max_ratio):
+            return False
+        # A hedge is a real request: it has to fit in the host's rate budget.
+        if budget is not None and not budget.try_acquire():
+            return False
+        stats.count_hedge()
+        return True
+
+    def get(self, session, url: str, label: str = "", **kwargs) -> requests.Response:
+        label = label or urlsplit(url).hostname or ""
+        if self.archive is None:
+            return self._get(session, url, label, kwargs)
+        try:
+            response = self._get(session, url, label, kwargs)
+        except requests.RequestException:
+            archived = self._from_archive(url, label)
+            if archived is None:
+                raise
+            return archived
+        status = getattr(response, "status_code", 0)
+        if status >= 500:
+            archived = self._from_archive(url, label)
+            if archived is not None:
+                return archived
+        elif status == 200:
+            self.archive.put(
+                url,
+                label,
+                response.content,
+                status=status,
+                encoding=response.encoding,
+                content_type=response.headers.get("Content-Type", ""),
+            )
+        return response
+
+    def _from_archive(self, url: str, label: str) -> Optional[requests.Response]:
+        page = self.archive.get(url)
+        if page is None:
+            return None
+        logger.warning("serving %s from the page archive (%s unreachable)", url, label)
+        metrics.archive_fallbacks.inc(label)
+        response = requests.Response()
+        response.status_code = page.status
+        response.url = url
+        response._content = page.body
+        response.encoding = page.encoding
+        response.headers["Content-Type"] = page.content_type
+        response.headers["X-Archived-At"] = str(int(page.fetched_at))
+        return response
+
+    def _get(self, session, url: str, label: str, kwargs: dict) -> requests.Response:
+        host = urlsplit(url).hostname or ""
+        stats = self.stats(host)
+        budget = self._budget(host)
+        if budget is not None:
+            budget.acquire()
+        stats.count_request()
+
+        delay = (
+            stats.percentile(self.hedge_percentile, self.hedge_min_samples)
+            if self.hedge
+            else None
+        )
+        if delay is None:
+            return self._timed_get(session, url, kwargs, stats, label)
+
+        pool = self._pool()
+        primary = pool.submit(
+            contextvars.copy_context().run, self._timed_get, session, url, kwargs, stats, label
+        )
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._may_hedge(stats, budget):
+            return primary.result()
+
+        hedge = pool.submit(
+            contextvars.copy_context().run, self._timed_get, session, url, kwargs, stats, label
+        )
+        futures = [primary, hedge]
+        errors: list[BaseException] = []
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                futures.remove(future)
+                error = future.exception()
+                if error is not None:
+                    errors.append(error)
+                    continue
+                for loser in futures:
+                    loser.add_done_callback(_close_response)
+                return future.result()
+        raise errors[0]
+
+
+def _close_response(future: Future) -> None:
+    if future.exception() is None:
+        try:
+            future.result().close()
+        except Exception:
+            pass
+
+
+default_fetcher = Fetcher()
@@ -0,0 +1,83 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Callable
+
+from ..models.result import SearchResult
+
+Listing = tuple[list[SearchResult], int]
+
+
+def fingerprint(results: list[SearchResult]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for r in results:
+        digest.update(f"{r.url}\t{r.price}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _copy(results: list[SearchResult]) -> list[SearchResult]:
+    return [replace(r) for r in results]
+
+
+class ListingMemo:
+    def __init__(self, max_entries: int = 512, ttl_seconds: int = 86400):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # url -> (stored_at, body hash, (results, max page))
+        self._bodies: OrderedDict[str, tuple[float, str, Listing]] = OrderedDict()
+        # listing key -> (stored_at, page-1 fingerprint, {page: results})
+        self._listings: OrderedDict[str, tuple[float, str, dict[int, list[SearchResult]]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def _fresh(self, stored_at: float) -> bool:
+        return time.time() - stored_at < self.ttl_seconds
+
+    def _put(self, table: OrderedDict, key: str, value: tuple) -> None:
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.max_entries:
+            table.popitem(last=False)
+
+    def parse(self, url: str, body: str, parse: Callable[[str], Listing]) -> Listing:
+        body_hash = hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+        with self._lock:
+            cached = self._bodies.get(url)
+            if cached is not None and cached[1] == body_hash and self._fresh(cached[0]):
+                self._bodies.move_to_end(url)
+                return _copy(cached[2][0]), cached[2][1]
+        results, max_page = parse(body)
+        with self._lock:
+            self._put(self._bodies, url, (time.time(), body_hash, (_copy(results), max_page)))
+        return results, max_page
+
+    def deep_pages(self, key: str, first_page: list[SearchResult]) -> dict[int, list[SearchResult]]:
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is None or not self._fresh(cached[0]):
+                return {}
+            if cached[1] != fingerprint(first_page):
+                return {}
+            self._listings.move_to_end(key)
+            return {page: _copy(results) for page, results in cached[2].items()}
+
+    def remember(
+        self,
+        key: str,
+        first_page: list[SearchResult],
+        pages: dict[int, list[SearchResult]],
+    ) -> None:
+        with self._lock:
+            self._put(
+                self._listings,
+                key,
+                (
+                    time.time(),
+                    fingerprint(first_page),
+                    {page: _copy(results) for page, results in pages.items()},
+                ),
+            )
+
@@ -1,21 +1,44 @@
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from urllib.parse import quote_plus, urljoin
+from urllib.parse import quote_plus
 
 import requests
-from bs4 import BeautifulSoup
 
 from .base import BaseScraper
+from .extract import SelectorSpec
 from ..models.result import SearchResult
+from ..storage.state import JSONStore
 
 
 class MusashiyaScraper(BaseScraper):
     name = "musashiya"
     base_url = "https://store.musashiya-net.co.jp/"
     search_path = "products/list?category_id=&name="
-
-    def __init__(self, session: Optional[requests.Session] = None):
+    instrumented_methods = {"_fetch_text": "fetch", "_parse_page": "parse"}
+    selector_spec = SelectorSpec(
+        container=".yak-Item",
+        title=".yak-Item__name a",
+        price=(".yak-Item__price",),
+        source="武蔵屋",
+        base_url=base_url,
+    )
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        variant_store: Optional[JSONStore] = None,
+        max_workers: int = 5,
+    ):
         self.session = session or requests.Session()
+        self.variant_store = variant_store or JSONStore()
+        self.max_workers = max_workers
+        # Shared by every search, so concurrent searches cannot multiply the
+        # number of in-flight requests to the shop.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="musashiya",
+        )
         self.session.headers.update(
             {
                 "User-Agent": (
@@ -34,93 +57,129 @@ class MusashiyaScraper(BaseScraper):
     def _normalize_query(self, query: str) -> str:
         return " ".join(query.split())
 
-    def _query_variants(self, query: str) -> list[str]:
+    def _labeled_variants(self, query: str) -> list[tuple[str, str]]:
         base = self._normalize_query(query)
-        variants = [base]
+        variants = [("base", base)]
 
         # If no spaces but contains digits, insert a space between text and digit blocks.
         if " " not in base and "　" not in base:
             spaced = re.sub(r"([^\d\s])(\d)", r"\1 \2", base)
             if spaced != base:
-                variants.append(spaced)
+                variants.append(("spaced", spaced))
 
         if " " in base:
-            variants.append(base.replace(" ", "　"))
+            variants.append(("fullwidth", base.replace(" ", "　")))
         if "　" in base:
-            variants.append(base.replace("　", " "))
+            variants.append(("halfwidth", base.replace("　", " ")))
 
         compact = base.replace(" ", "").replace("　", "")
-        if compact and compact not in variants:
-            variants.append(compact)
+        if compact and compact not in [v for _, v in variants]:
+            variants.append(("compact", compact))
 
         # Also try full-width space variant of the spaced query if present.
-        for v in list(variants):
+        for label, v in list(variants):
             if " " in v:
-                variants.append(v.replace(" ", "　"))
+                variants.append((f"{label}_fullwidth", v.replace(" ", "　")))
         # remove duplicates while preserving order
-        unique: list[str] = []
-        for v in variants:
-            if v not in unique:
-                unique.append(v)
+        unique: list[tuple[str, str]] = []
+        seen: set[str] = set()
+        for label, v in variants:
+            if v not in seen:
+                seen.add(v)
+                unique.append((label, v))
         return unique
 
-    def _parse_price(self, text: str) -> Optional[int]:
-        if not text:
-            return None
-        match = re.search(r"([0-9,]+)", text)
-        if not match:
+    def _query_variants(self, query: str) -> list[str]:
+        return [v for _, v in self._labeled_variants(query)]
+
+    def _query_pattern(self, query: str) -> str:
+        base = self._normalize_query(query)
+        if " " in base:
+            spacing = "space"
+        elif "　" in base:
+            spacing = "fwspace"
+        else:
+            spacing = "nospace"
+        digits = "digit" if re.search(r"\d", base) else "nodigit"
+        script = "ascii" if base.isascii() else "jp"
+        return f"{spacing}:{digits}:{script}"
+
+    def _learned_label(self, pattern: str) -> Optional[str]:
+        wins = self.variant_store.get(pattern) or {}
+        if not wins:
             return None
-        return int(match.group(1).replace(",", ""))
+        return max(wins, key=wins.get)
 
-    def _fetch_soup(self, url: str) -> Optional[BeautifulSoup]:
-        response = self.session.get(url, timeout=15)
+    def _record_winner(self, pattern: str, label: str) -> None:
+        def bump(wins: Optional[dict]) -> dict:
+            wins = dict(wins or {})
+            wins[label] = wins.get(label, 0) + 1
+            return wins
+
+        self.variant_store.update(pattern, bump)
+
+    def _fetch_text(self, url: str) -> Optional[str]:
+        response = self._get(url, timeout=15)
         if response.status_code in (403, 404):
             return None
         response.raise_for_status()
         if not response.encoding:
             response.encoding = "utf-8"
-        return BeautifulSoup(response.text, "lxml")
-
-    def _parse_results(self, soup: BeautifulSoup) -> list[SearchResult]:
-        results: list[SearchResult] = []
-        for item in soup.select(".yak-Item"):
-            title_el = item.select_one(".yak-Item__name a")
-            if not title_el:
-                continue
-            title = title_el.get_text(" ", strip=True)
-            href = title_el.get("href", "")
-            url = urljoin(self.base_url, href)
-
-            price_el = item.select_one(".yak-Item__price")
-            price = (
-                self._parse_price(price_el.get_text(" ", strip=True))
-                if price_el
-                else None
-            )
-            if price is None:
-                continue
-
-            results.append(
-                SearchResult(
-                    title=title,
-                    price=price,
-                    source="武蔵屋",
-                    url=url,
-                )
-            )
-        return results
+        return response.text
+
+    def _search_variant(self, variant: str) -> list[SearchResult]:
+        listing = self._fetch_listing(self._search_url(variant))
+        if listing is None:
+            return []
+        return listing[0]
+
+    def _race_variants(self, variants: list[tuple[str, str]]) -> tuple[Optional[str], list[SearchResult]]:
+        if not variants:
+            return None, []
+        futures = [self._executor.submit(self._search_variant, v) for _, v in variants]
+        try:
+            # Variants are in preference order: a hit only wins once every
+            # earlier variant has come back empty, so the learned label does
+            # not depend on which request happened to return first.
+            errors: list[Exception] = []
+            for (label, _), future in zip(variants, futures):
+                try:
+                    results = future.result()
+                except requests.RequestException as exc:
+                    errors.append(exc)
+                    continue
+                if results:
+                    return label, results
+            if len(errors) == len(variants):
+                raise errors[0]
+            return None, []
+        finally:
+            # Only requests still queued can be cancelled; in-flight ones
+            # finish in the background and are discarded.
+            for future in futures:
+                future.cancel()
 
     def search(self, query: str) -> list[SearchResult]:
         if not query:
             return []
 
-        for q in self._query_variants(query):
-            url = self._search_url(q)
-            soup = self._fetch_soup(url)
-            if soup is None:
-                continue
-            results = self._parse_results(soup)
-            if results:
-                return results
-
-        return []
+        pattern = self._query_pattern(query)
+        variants = self._labeled_variants(query)
+
+        learned = self._learned_label(pattern)
+        if learned is not None:
+            first = [(label, v) for label, v in variants if label == learned]
+            if first:
+                try:
+                    results = self._search_variant(first[0][1])
+                except requests.RequestException:
+                    results = []
+                if results:
+                    self._record_winner(pattern, learned)
+                    return results
+                variants = [(label, v) for label, v in variants if label != learned]
+
+        label, results = self._race_variants(variants)
+        if label is not None:
+            self._record_winner(pattern, label)
+        return results
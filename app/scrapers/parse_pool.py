@@ -0,0 +1,122 @@
+import importlib
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from ..models.result import SearchResult
+from .listing_memo import Listing
+
+logger = logging.getLogger(__name__)
+
+# Scrapers whose modules and selectors every worker loads at start-up.
+WARM_SCRAPERS = (
+    f"{__package__}.pricecom:PriceComScraper",
+    f"{__package__}.shinanoya:ShinanoyaScraper",
+    f"{__package__}.musashiya:MusashiyaScraper",
+    f"{__package__}.mukawa:MukawaScraper",
+    f"{__package__}.storesjp:StoresJPScraper",
+    f"{__package__}.yodobashi:YodobashiScraper",
+)
+
+Row = tuple[str, int, str, str]
+
+# Worker-side: one parser instance per scraper class, kept for the life of
+# the process.
+_parsers: dict = {}
+
+
+def class_path(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _parser(path: str):
+    parser = _parsers.get(path)
+    if parser is None:
+        module_name, _, class_name = path.partition(":")
+        cls = getattr(importlib.import_module(module_name), class_name)
+        # Parsing reads only class-level configuration, so __init__ (sessions,
+        # thread pools, state files) is skipped.
+        parser = cls.__new__(cls)
+        _parsers[path] = parser
+    return parser
+
+
+def _warm(paths: tuple[str, ...]) -> None:
+    from .extract import compiled
+
+    for path in paths:
+        try:
+            parser = _parser(path)
+        except (ImportError, AttributeError):
+            continue
+        if parser.selector_spec is not None:
+            compiled(parser.selector_spec)
+        # Loads bs4, lxml and soupsieve before the first real page arrives.
+        parser._parse_text("<html><body></body></html>")
+
+
+def _ready() -> bool:
+    return True
+
+
+def _parse(path: str, text: str) -> tuple[list[Row], int]:
+    results, max_page = _parser(path)._parse_text(text)
+    return [(r.title, r.price, r.source, r.url) for r in results], max_page
+
+
+class ParsePool:
+    def __init__(
+        self,
+        processes: int,
+        warm: tuple[str, ...] = WARM_SCRAPERS,
+        start_method: str = "spawn",
+    ):
+        self.processes = processes
+        self.warm = warm
+        self.start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        executor = self._executor
+        if executor is not None:
+            return executor
+        with self._lock:
+            if self._executor is None:
+                executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_warm,
+                    initargs=(self.warm,),
+                )
+                # Workers start on demand; one task each brings them all up
+                # now instead of during the first busy searches.
+                for _ in range(self.processes):
+                    executor.submit(_ready)
+                self._executor = executor
+            return self._executor
+
+    def start(self) -> None:
+        self._pool()
+
+    def parse(self, parser: type, text: str, fallback: Callable[[str], Listing]) -> Listing:
+        executor = self._pool()
+        try:
+            rows, max_page = executor.submit(_parse, class_path(parser), text).result()
+        except BrokenProcessPool:
+            logger.warning("parse pool is broken; restarting it and parsing in-process")
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            return fallback(text)
+        return [SearchResult(*row) for row in rows], max_page
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -1,28 +1,72 @@
 import re
 import time
-from typing import Optional
+from typing import Callable, Optional
 from urllib.parse import parse_qs, quote, unquote, urlparse
 
 import requests
 from bs4 import BeautifulSoup
 
 from .base import BaseScraper
+from .extract import SelectorSpec
 from ..models.result import SearchResult
 
 
+def extract_final_url(href: str) -> str:
+    # Result links go through kakaku's redirector; the shop URL is in u=,
+    # sometimes wrapped once more in an affiliate url= parameter.
+    if not href:
+        return ""
+    try:
+        parsed = urlparse(href)
+        qs = parse_qs(parsed.query)
+        if "u" not in qs:
+            return href
+        first = unquote(qs["u"][0])
+        parsed_first = urlparse(first)
+        qs_first = parse_qs(parsed_first.query)
+        if "url" in qs_first:
+            return unquote(qs_first["url"][0])
+        return first
+    except Exception:
+        return href
+
+
 class PriceComScraper(BaseScraper):
     name = "kakaku.com"
     base_url = "https://search.kakaku.com/"
     whisky_category = "0016_0054"
     request_delay_seconds = 1.2
+    price_sort_value = "priceb"
+    supports_page_depth = True
+    instrumented_methods = {"_fetch_text": "fetch", "_parse_page": "parse"}
+    page_link_pattern = re.compile(r"[?&](?:amp;)?page=(\d+)")
+    selector_spec = SelectorSpec(
+        container="div.c-list1_cell.p-resultItem",
+        title=".p-item_name a",
+        price=(".p-item_price", ".p-item_priceNum"),
+        source=name,
+        source_from=(
+            (".p-resultItem_quote img[alt]", "alt"),
+            (".p-resultItem_quote", None),
+        ),
+        category=".p-item_category",
+        category_keyword="ウイスキー",
+        resolve_url=extract_final_url,
+    )
 
     def __init__(
         self,
         session: Optional[requests.Session] = None,
         max_pages: int = 3,
+        sort_by_price: bool = False,
+        result_filter: Optional[
+            Callable[[list[SearchResult], str], list[SearchResult]]
+        ] = None,
     ):
         self.session = session or requests.Session()
         self.max_pages = max_pages
+        self.sort_by_price = sort_by_price
+        self.result_filter = result_filter
         self.session.headers.update(
             {
                 "User-Agent": "Mozilla/5.0",
@@ -30,47 +74,18 @@ class PriceComScraper(BaseScraper):
             }
         )
 
+    @property
+    def supports_cheapest_n(self) -> bool:
+        return self.sort_by_price
+
     def _search_url(self, query: str, page: int = 1) -> str:
         base = f"{self.base_url}{quote(query)}/?category={self.whisky_category}"
+        if self.sort_by_price:
+            base = f"{base}&sort={self.price_sort_value}"
         if page <= 1:
             return base
         return f"{base}&page={page}"
 
-    def _parse_price(self, text: str) -> Optional[int]:
-        if not text:
-            return None
-        compact = re.sub(r"\s+", "", text)
-        match_any = re.search(r"([0-9,]+)", compact)
-        if not match_any:
-            return None
-        return int(match_any.group(1).replace(",", ""))
-
-    def _parse_source(self, item) -> str:
-        quote_el = item.select_one(".p-resultItem_quote")
-        if not quote_el:
-            return self.name
-        img = quote_el.select_one("img[alt]")
-        if img and img.get("alt"):
-            return img["alt"].strip()
-        return quote_el.get_text(" ", strip=True) or self.name
-
-    def _extract_final_url(self, href: str) -> str:
-        if not href:
-            return ""
-        try:
-            parsed = urlparse(href)
-            qs = parse_qs(parsed.query)
-            if "u" not in qs:
-                return href
-            first = unquote(qs["u"][0])
-            parsed_first = urlparse(first)
-            qs_first = parse_qs(parsed_first.query)
-            if "url" in qs_first:
-                return unquote(qs_first["url"][0])
-            return first
-        except Exception:
-            return href
-
     def _extract_max_page(self, soup: BeautifulSoup) -> int:
         max_page = 1
         for link in soup.select(".p-pager a[href]"):
@@ -87,74 +102,75 @@ class PriceComScraper(BaseScraper):
                     continue
         return max_page
 
-    def _fetch_soup(self, url: str) -> Optional[BeautifulSoup]:
-        response = self.session.get(url, timeout=15)
+    def _fetch_text(self, url: str) -> Optional[str]:
+        response = self._get(url, timeout=15)
         if response.status_code == 404:
             return None
         response.raise_for_status()
         if not response.encoding:
             response.encoding = "shift_jis"
-        return BeautifulSoup(response.text, "lxml")
-
-    def _parse_results(self, soup: BeautifulSoup) -> list[SearchResult]:
-        results: list[SearchResult] = []
-        for item in soup.select("div.c-list1_cell.p-resultItem"):
-            title_el = item.select_one(".p-item_name a")
-            if not title_el:
-                continue
-            title = title_el.get_text(" ", strip=True)
-
-            category_el = item.select_one(".p-item_category")
-            if category_el:
-                category = category_el.get_text(" ", strip=True)
-                if category and "ウイスキー" not in category:
-                    continue
-
-            price_el = item.select_one(".p-item_price") or item.select_one(
-                ".p-item_priceNum"
-            )
-            price_text = price_el.get_text(" ", strip=True) if price_el else ""
-            price = self._parse_price(price_text)
-            if price is None:
-                continue
+        return response.text
 
-            href = title_el.get("href", "")
-            final_url = self._extract_final_url(href)
-            source = self._parse_source(item)
-
-            results.append(
-                SearchResult(
-                    title=title,
-                    price=price,
-                    source=source,
-                    url=final_url,
-                )
-            )
-        return results
-
-    def search(self, query: str) -> list[SearchResult]:
+    def _has_enough(
+        self,
+        results: list[SearchResult],
+        query: str,
+        cheapest_n: Optional[int],
+    ) -> bool:
+        # Pages arrive in ascending price order, so once the cheapest N that
+        # survive filtering are known, later pages can only add pricier items.
+        if not self.sort_by_price or not cheapest_n:
+            return False
+        kept = self.result_filter(results, query) if self.result_filter else results
+        return len(kept) >= cheapest_n
+
+    def search(
+        self,
+        query: str,
+        max_pages: Optional[int] = None,
+        cheapest_n: Optional[int] = None,
+    ) -> list[SearchResult]:
         if not query:
             return []
+        max_pages = max_pages or self.max_pages
 
         results: list[SearchResult] = []
         first_url = self._search_url(query, page=1)
         time.sleep(self.request_delay_seconds)
-        soup = self._fetch_soup(first_url)
-        if soup is None:
+        listing = self._fetch_listing(first_url)
+        if listing is None:
             return results
 
-        results.extend(self._parse_results(soup))
+        first_page = self._tag_page(listing[0], 1)
+        results.extend(first_page)
+        seen_urls = {r.url for r in results if r.url}
 
-        max_page = min(self._extract_max_page(soup), self.max_pages)
+        max_page = min(listing[1], max_pages)
         if max_page <= 1:
             return results
 
+        # An unchanged first page means the deeper pages are reused as-is.
+        reused = self._deep_pages(first_url, first_page)
+        pages: dict[int, list[SearchResult]] = {}
         for page in range(2, max_page + 1):
-            time.sleep(self.request_delay_seconds)
-            page_url = self._search_url(query, page=page)
-            page_soup = self._fetch_soup(page_url)
-            if page_soup is None:
+            if self._has_enough(results, query, cheapest_n):
                 break
-            results.extend(self._parse_results(page_soup))
-
+            page_results = reused.get(page)
+            if page_results is None:
+                time.sleep(self.request_delay_seconds)
+                page_listing = self._fetch_listing(self._search_url(query, page=page))
+                if page_listing is None:
+                    break
+                page_results = self._tag_page(page_listing[0], page)
+            pages[page] = page_results
+            if self.sort_by_price:
+                # Price order shifts while paging, so a page can repeat items;
+                # a page with nothing new means the listing is exhausted.
+                page_results = [r for r in page_results if not r.url or r.url not in seen_urls]
+                if not page_results:
+                    break
+                seen_urls.update(r.url for r in page_results if r.url)
+            results.extend(page_results)
+
+        self._remember_pages(first_url, first_page, pages)
         return results
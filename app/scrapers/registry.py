@@ -0,0 +1,149 @@
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Iterator, Optional
+
+from ..models.result import SearchResult
+from ..storage.state import JSONStore, state_path
+from .base import BaseScraper
+
+ResultFilter = Callable[[list[SearchResult], str], list[SearchResult]]
+
+
+@dataclass(frozen=True)
+class ScraperConfig:
+    max_pages: int = 3
+    filter_by_title: bool = True
+    kakaku_sort_by_price: bool = False
+    shinanoya_url_ttl_seconds: int = 30 * 86400
+    shinanoya_negative_ttl_seconds: int = 6 * 3600
+    shinanoya_url_memo_size: int = 5000
+    storesjp_store: str = "absinthe"
+    yodobashi_category_url: Optional[str] = None
+    biccamera_enabled: bool = False
+    # Keyword arguments for BiccameraScraper besides max_pages.
+    biccamera_options: dict[str, Any] = field(default_factory=dict)
+    state_flush_seconds: int = 5
+
+
+# Each factory imports its scraper module on first use, so bs4, lxml and
+# playwright stay unloaded until a search actually has to go to the shops.
+
+
+def _pricecom(config: ScraperConfig, result_filter: Optional[ResultFilter]) -> BaseScraper:
+    from .pricecom import PriceComScraper
+
+    return PriceComScraper(
+        max_pages=config.max_pages,
+        sort_by_price=config.kakaku_sort_by_price,
+        result_filter=result_filter,
+    )
+
+
+def _shinanoya(config: ScraperConfig) -> BaseScraper:
+    from .shinanoya import ShinanoyaScraper
+
+    return ShinanoyaScraper(
+        max_pages=config.max_pages,
+        url_store=JSONStore(
+            state_path("shinanoya_search_urls.json"),
+            flush_interval=config.state_flush_seconds,
+        ),
+        url_ttl_seconds=config.shinanoya_url_ttl_seconds,
+        negative_ttl_seconds=config.shinanoya_negative_ttl_seconds,
+        max_memo_entries=config.shinanoya_url_memo_size,
+    )
+
+
+def _musashiya(config: ScraperConfig) -> BaseScraper:
+    from .musashiya import MusashiyaScraper
+
+    return MusashiyaScraper(
+        variant_store=JSONStore(
+            state_path("musashiya_variants.json"),
+            flush_interval=config.state_flush_seconds,
+        ),
+    )
+
+
+def _mukawa(config: ScraperConfig) -> BaseScraper:
+    from .mukawa import MukawaScraper
+
+    return MukawaScraper()
+
+
+def _storesjp(config: ScraperConfig) -> BaseScraper:
+    from .storesjp import StoresJPScraper
+
+    return StoresJPScraper(store_slug=config.storesjp_store)
+
+
+def _yodobashi(config: ScraperConfig) -> BaseScraper:
+    from .yodobashi import YodobashiScraper
+
+    return YodobashiScraper(
+        category_url=config.yodobashi_category_url,
+        max_pages=config.max_pages,
+    )
+
+
+def _biccamera(config: ScraperConfig) -> BaseScraper:
+    from .biccamera import BiccameraScraper
+
+    return BiccameraScraper(max_pages=config.max_pages, **config.biccamera_options)
+
+
+def scraper_factories(
+    config: ScraperConfig,
+    result_filter: Optional[ResultFilter] = None,
+) -> list[Callable[[], BaseScraper]]:
+    factories = [
+        partial(_pricecom, config, result_filter),
+        partial(_shinanoya, config),
+        partial(_musashiya, config),
+        partial(_mukawa, config),
+        partial(_storesjp, config),
+        partial(_yodobashi, config),
+    ]
+    if config.biccamera_enabled:
+        factories.insert(-1, partial(_biccamera, config))
+    return factories
+
+
+class ScraperRegistry(Sequence):
+    def __init__(
+        self,
+        factories: list[Callable[[], BaseScraper]],
+        configure: Optional[Callable[[BaseScraper], None]] = None,
+    ):
+        self._factories = factories
+        self._configure = configure
+        self._scrapers: Optional[list[BaseScraper]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._scrapers is not None
+
+    def _load(self) -> list[BaseScraper]:
+        scrapers = self._scrapers
+        if scrapers is not None:
+            return scrapers
+        with self._lock:
+            if self._scrapers is None:
+                built = [factory() for factory in self._factories]
+                if self._configure is not None:
+                    for scraper in built:
+                        self._configure(scraper)
+                self._scrapers = built
+            return self._scrapers
+
+    def __getitem__(self, index):
+        return self._load()[index]
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __iter__(self) -> Iterator[BaseScraper]:
+        return iter(self._load())
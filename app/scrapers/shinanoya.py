@@ -1,4 +1,5 @@
 import re
+import time
 from typing import Optional
 from urllib.parse import parse_qs, urlencode, urljoin, urlsplit, urlunsplit
 
@@ -6,7 +7,9 @@ import requests
 from bs4 import BeautifulSoup
 
 from .base import BaseScraper
+from .extract import SelectorSpec
 from ..models.result import SearchResult
+from ..storage.state import JSONStore
 
 
 class ShinanoyaScraper(BaseScraper):
@@ -14,10 +17,33 @@ class ShinanoyaScraper(BaseScraper):
     base_url = "https://www.shinanoya-tokyo.jp/"
     search_endpoint = "shop/shopsearch_url.html"
     whisky_category = "ct755"
-
-    def __init__(self, session: Optional[requests.Session] = None, max_pages: int = 3):
+    supports_page_depth = True
+    instrumented_methods = {"_fetch_text": "fetch", "_parse_page": "parse"}
+    page_link_pattern = re.compile(r"[?&](?:amp;)?page=(\d+)")
+    selector_spec = SelectorSpec(
+        container=".category_itemArea_ul li",
+        title=".itemDetail .name a",
+        price=(".itemDetail .price",),
+        source="信濃屋",
+        base_url=base_url,
+    )
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        max_pages: int = 3,
+        url_store: Optional[JSONStore] = None,
+        url_ttl_seconds: int = 30 * 86400,
+        negative_ttl_seconds: int = 6 * 3600,
+        max_memo_entries: int = 5000,
+    ):
         self.session = session or requests.Session()
         self.max_pages = max_pages
+        self.url_store = url_store or JSONStore()
+        self.url_ttl_seconds = url_ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_memo_entries = max_memo_entries
+        self._prune_memo()
         self.session.headers.update(
             {
                 "User-Agent": "Mozilla/5.0",
@@ -27,7 +53,7 @@ class ShinanoyaScraper(BaseScraper):
 
     def _resolve_search_url(self, query: str) -> Optional[str]:
         payload = {
-            "keyword": query,
+            "keyword": self._normalize_query(query),
             "name": "",
             "price_low": "",
             "price_high": "",
@@ -42,22 +68,41 @@ class ShinanoyaScraper(BaseScraper):
             return None
         return urljoin(self.base_url, data.get("url", ""))
 
-    def _parse_price(self, text: str) -> Optional[int]:
-        if not text:
-            return None
-        match = re.search(r"([0-9,]+)", text)
-        if not match:
-            return None
-        return int(match.group(1).replace(",", ""))
+    def _normalize_query(self, query: str) -> str:
+        return " ".join(query.split())
 
-    def _fetch_soup(self, url: str) -> Optional[BeautifulSoup]:
-        response = self.session.get(url, timeout=15)
+    def _memo_key(self, query: str) -> str:
+        return f"{self.whisky_category}:{self._normalize_query(query)}"
+
+    def _prune_memo(self) -> None:
+        now = time.time()
+        self.url_store.prune(
+            lambda entry: isinstance(entry, list) and len(entry) == 2 and entry[0] > now,
+            max_entries=self.max_memo_entries,
+            rank=lambda entry: entry[0],
+        )
+
+    def _resolve_search_url_cached(self, query: str) -> Optional[str]:
+        key = self._memo_key(query)
+        entry = self.url_store.get(key)
+        if entry and entry[0] > time.time():
+            return entry[1]
+        url = self._resolve_search_url(query)
+        # Misses are memoized too, but briefly: the shop may list the item soon.
+        ttl = self.url_ttl_seconds if url else self.negative_ttl_seconds
+        self.url_store.set(key, [time.time() + ttl, url])
+        if self.url_store.size() > self.max_memo_entries:
+            self._prune_memo()
+        return url
+
+    def _fetch_text(self, url: str) -> Optional[str]:
+        response = self._get(url, timeout=15)
         if response.status_code == 404:
             return None
         response.raise_for_status()
         if not response.encoding:
             response.encoding = "utf-8"
-        return BeautifulSoup(response.text, "lxml")
+        return response.text
 
     def _extract_max_page(self, soup: BeautifulSoup) -> int:
         max_page = 1
@@ -82,57 +127,45 @@ class ShinanoyaScraper(BaseScraper):
         query = urlencode(qs, doseq=True)
         return urlunsplit((parsed.scheme, parsed.netloc, parsed.path, query, parsed.fragment))
 
-    def search(self, query: str) -> list[SearchResult]:
+    def search(self, query: str, max_pages: Optional[int] = None) -> list[SearchResult]:
         if not query:
             return []
+        max_pages = max_pages or self.max_pages
 
-        url = self._resolve_search_url(query)
+        url = self._resolve_search_url_cached(query)
         if not url:
             return []
-        soup = self._fetch_soup(url)
-        if soup is None:
-            return []
-
-        results: list[SearchResult] = []
-
-        def parse_items(page_soup: BeautifulSoup) -> None:
-            for item in page_soup.select(".category_itemArea_ul li"):
-                title_el = item.select_one(".itemDetail .name a")
-                if not title_el:
-                    continue
-                title = title_el.get_text(" ", strip=True)
-                href = title_el.get("href", "")
-                item_url = urljoin(self.base_url, href)
-
-                price_el = item.select_one(".itemDetail .price")
-                price = (
-                    self._parse_price(price_el.get_text(" ", strip=True))
-                    if price_el
-                    else None
-                )
-                if price is None:
-                    continue
-
-                results.append(
-                    SearchResult(
-                        title=title,
-                        price=price,
-                        source="信濃屋",
-                        url=item_url,
-                    )
-                )
-
-        parse_items(soup)
-
-        max_page = min(self._extract_max_page(soup), self.max_pages)
+        listing = self._fetch_listing(url)
+        if listing is None:
+            # The memoized listing URL may have gone stale; resolve it once more.
+            self.url_store.pop(self._memo_key(query))
+            fresh_url = self._resolve_search_url_cached(query)
+            if not fresh_url or fresh_url == url:
+                return []
+            url = fresh_url
+            listing = self._fetch_listing(url)
+            if listing is None:
+                return []
+
+        first_page = self._tag_page(listing[0], 1)
+        results: list[SearchResult] = list(first_page)
+
+        max_page = min(listing[1], max_pages)
         if max_page <= 1:
             return results
 
+        # An unchanged first page means the deeper pages are reused as-is.
+        reused = self._deep_pages(url, first_page)
+        pages: dict[int, list[SearchResult]] = {}
         for page in range(2, max_page + 1):
-            page_url = self._with_page(url, page)
-            page_soup = self._fetch_soup(page_url)
-            if page_soup is None:
-                break
-            parse_items(page_soup)
-
+            page_results = reused.get(page)
+            if page_results is None:
+                page_listing = self._fetch_listing(self._with_page(url, page))
+                if page_listing is None:
+                    break
+                page_results = self._tag_page(page_listing[0], page)
+            pages[page] = page_results
+            results.extend(page_results)
+
+        self._remember_pages(url, first_page, pages)
         return results
@@ -0,0 +1,124 @@
+import json
+import re
+from typing import Any, Iterator, Optional, Union
+from urllib.parse import urljoin
+
+from ..models.result import SearchResult
+from .extract import parse_price
+
+_SCRIPT_PATTERN = (
+    r"<script[^>]*?type\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>"
+)
+_SCRIPT_RE = re.compile(_SCRIPT_PATTERN, re.IGNORECASE | re.DOTALL)
+_SCRIPT_BYTES_RE = re.compile(_SCRIPT_PATTERN.encode("ascii"), re.IGNORECASE | re.DOTALL)
+
+_MAX_DEPTH = 6
+
+
+def json_ld_blocks(raw: Union[str, bytes]) -> Iterator[Any]:
+    # A regex scan is enough to find the script blocks; no tree is built.
+    if isinstance(raw, bytes):
+        if b"ld+json" not in raw:
+            return
+        blocks = _SCRIPT_BYTES_RE.findall(raw)
+    else:
+        if "ld+json" not in raw:
+            return
+        blocks = _SCRIPT_RE.findall(raw)
+    for block in blocks:
+        try:
+            yield json.loads(block)
+        except (ValueError, UnicodeDecodeError):
+            continue
+
+
+def _types(node: dict) -> set[str]:
+    value = node.get("@type")
+    if isinstance(value, str):
+        return {value}
+    if isinstance(value, list):
+        return {v for v in value if isinstance(v, str)}
+    return set()
+
+
+def _offer_price(offers) -> tuple[Optional[int], Optional[str]]:
+    if isinstance(offers, list):
+        candidates = [_offer_price(offer) for offer in offers]
+        priced = [c for c in candidates if c[0] is not None]
+        return min(priced, key=lambda c: c[0]) if priced else (None, None)
+    if not isinstance(offers, dict):
+        return None, None
+    price = offers.get("price")
+    if price is None:
+        price = offers.get("lowPrice")
+    seller = offers.get("seller")
+    seller_name = seller.get("name") if isinstance(seller, dict) else None
+    value = parse_price(str(price)) if price is not None else None
+    return value, seller_name if isinstance(seller_name, str) else None
+
+
+def _product(node: dict, source: str, base_url: str) -> Optional[SearchResult]:
+    name = node.get("name") or node.get("title")
+    url = node.get("url")
+    if not isinstance(name, str) or not isinstance(url, str) or not name or not url:
+        return None
+    price, seller = _offer_price(node.get("offers"))
+    if price is None and node.get("price") is not None:
+        price = parse_price(str(node["price"]))
+    if not price:
+        return None
+    return SearchResult(
+        title=name.strip(),
+        price=price,
+        source=seller or source,
+        url=urljoin(base_url, url) if base_url else url,
+    )
+
+
+def _walk(
+    node,
+    source: str,
+    base_url: str,
+    depth: int,
+    listed: bool = False,
+) -> Iterator[SearchResult]:
+    if depth > _MAX_DEPTH:
+        return
+    if isinstance(node, list):
+        for child in node:
+            yield from _walk(child, source, base_url, depth + 1)
+        return
+    if not isinstance(node, dict):
+        return
+    types = _types(node)
+    # Inside an ItemList, untyped entries are treated as products.
+    if "Product" in types or (listed and not types & {"Offer", "ItemList"}):
+        result = _product(node, source, base_url)
+        if result is not None:
+            yield result
+    elif "Offer" in types and isinstance(node.get("itemOffered"), dict):
+        result = _product({**node["itemOffered"], "offers": node}, source, base_url)
+        if result is not None:
+            yield result
+    elif "ItemList" in types:
+        for element in node.get("itemListElement") or []:
+            if isinstance(element, dict) and isinstance(element.get("item"), dict):
+                element = element["item"]
+            yield from _walk(element, source, base_url, depth + 1, listed=True)
+    elif "@graph" in node:
+        yield from _walk(node["@graph"], source, base_url, depth + 1)
+
+
+def results_from_json_ld(data, source: str, base_url: str = "") -> list[SearchResult]:
+    return list(_walk(data, source, base_url, 0))
+
+
+def structured_results(
+    raw: Union[str, bytes],
+    source: str,
+    base_url: str = "",
+) -> list[SearchResult]:
+    results: list[SearchResult] = []
+    for data in json_ld_blocks(raw):
+        results.extend(results_from_json_ld(data, source, base_url))
+    return results
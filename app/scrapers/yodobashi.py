@@ -1,12 +1,13 @@
 import re
 import time
 from typing import Optional
-from urllib.parse import parse_qs, urlencode, urljoin, urlsplit, urlunsplit
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
 
 import requests
 from bs4 import BeautifulSoup
 
 from .base import BaseScraper
+from .extract import SelectorSpec
 from ..models.result import SearchResult
 
 
@@ -14,6 +15,18 @@ class YodobashiScraper(BaseScraper):
     name = "yodobashi"
     base_url = "https://www.yodobashi.com/"
     whisky_category_url = "https://www.yodobashi.com/category/157851/165152/165173/"
+    supports_page_depth = True
+    instrumented_methods = {"_fetch_text": "fetch", "_parse_page": "parse"}
+    page_link_pattern = re.compile(r"href=[\"'][^\"']*/p(\d+)/")
+    selector_spec = SelectorSpec(
+        container="div.srcResultItem_block.pListBlock",
+        title=".pName",
+        link="a[href^='/product/'], a[href*='/product/']",
+        require_href=True,
+        price=(".productPrice",),
+        source="ヨドバシ.com",
+        base_url=base_url,
+    )
 
     def __init__(
         self,
@@ -55,54 +68,14 @@ class YodobashiScraper(BaseScraper):
         query_str = urlencode(qs, doseq=True)
         return urlunsplit((parsed.scheme, parsed.netloc, path, query_str, parsed.fragment))
 
-    def _parse_price(self, text: str) -> Optional[int]:
-        if not text:
-            return None
-        match = re.search(r"([0-9,]+)", text)
-        if not match:
-            return None
-        return int(match.group(1).replace(",", ""))
-
-    def _fetch_soup(self, url: str) -> Optional[BeautifulSoup]:
-        response = self.session.get(url, timeout=self.timeout_seconds)
+    def _fetch_text(self, url: str) -> Optional[str]:
+        response = self._get(url, timeout=self.timeout_seconds)
         if response.status_code in (403, 404):
             return None
         response.raise_for_status()
         if not response.encoding:
             response.encoding = "utf-8"
-        return BeautifulSoup(response.text, "lxml")
-
-    def _parse_results(self, soup: BeautifulSoup) -> list[SearchResult]:
-        results: list[SearchResult] = []
-        for item in soup.select("div.srcResultItem_block.pListBlock"):
-            title_el = item.select_one(".pName")
-            if not title_el:
-                continue
-            title = title_el.get_text(" ", strip=True)
-
-            link_el = item.select_one("a[href^='/product/'], a[href*='/product/']")
-            if not link_el:
-                continue
-            href = link_el.get("href", "")
-            if not href:
-                continue
-            url = urljoin(self.base_url, href)
-
-            price_el = item.select_one(".productPrice")
-            price_text = price_el.get_text(" ", strip=True) if price_el else ""
-            price = self._parse_price(price_text)
-            if price is None:
-                continue
-
-            results.append(
-                SearchResult(
-                    title=title,
-                    price=price,
-                    source="ヨドバシ.com",
-                    url=url,
-                )
-            )
-        return results
+        return response.text
 
     def _extract_max_page(self, soup: BeautifulSoup) -> int:
         max_page = 1
@@ -121,29 +94,37 @@ class YodobashiScraper(BaseScraper):
         if self.request_delay_seconds > 0:
             time.sleep(self.request_delay_seconds)
 
-    def search(self, query: str) -> list[SearchResult]:
+    def search(self, query: str, max_pages: Optional[int] = None) -> list[SearchResult]:
         if not query:
             return []
+        max_pages = max_pages or self.max_pages
 
         self._sleep()
         first_url = self._search_url(query, page=1)
-        soup = self._fetch_soup(first_url)
-        if soup is None:
+        listing = self._fetch_listing(first_url)
+        if listing is None:
             return []
 
-        results: list[SearchResult] = []
-        results.extend(self._parse_results(soup))
+        first_page = self._tag_page(listing[0], 1)
+        results: list[SearchResult] = list(first_page)
 
-        max_page = min(self._extract_max_page(soup), self.max_pages)
+        max_page = min(listing[1], max_pages)
         if max_page <= 1:
             return results
 
+        # An unchanged first page means the deeper pages are reused as-is.
+        reused = self._deep_pages(first_url, first_page)
+        pages: dict[int, list[SearchResult]] = {}
         for page in range(2, max_page + 1):
-            self._sleep()
-            page_url = self._search_url(query, page=page)
-            page_soup = self._fetch_soup(page_url)
-            if page_soup is None:
-                break
-            results.extend(self._parse_results(page_soup))
-
+            page_results = reused.get(page)
+            if page_results is None:
+                self._sleep()
+                page_listing = self._fetch_listing(self._search_url(query, page=page))
+                if page_listing is None:
+                    break
+                page_results = self._tag_page(page_listing[0], page)
+            pages[page] = page_results
+            results.extend(page_results)
+
+        self._remember_pages(first_url, first_page, pages)
         return results
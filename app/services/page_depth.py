@@ -0,0 +1,79 @@
+import random
+import re
+from typing import Optional
+
+from ..models.result import SearchResult
+from ..storage.state import JSONStore
+
+
+def query_shape(query: str) -> str:
+    tokens = query.split()
+    if len(tokens) <= 1:
+        words = "w1"
+    elif len(tokens) == 2:
+        words = "w2"
+    else:
+        words = "w3+"
+    digits = "digit" if re.search(r"\d", query) else "nodigit"
+    script = "ascii" if query.isascii() else "jp"
+    return f"{words}:{digits}:{script}"
+
+
+class PageDepthAdvisor:
+    def __init__(
+        self,
+        store: Optional[JSONStore] = None,
+        min_pages: int = 1,
+        min_samples: int = 5,
+        useful_ratio: float = 0.1,
+        explore_rate: float = 0.05,
+    ):
+        self.store = store or JSONStore()
+        self.min_pages = max(min_pages, 1)
+        self.min_samples = min_samples
+        self.useful_ratio = useful_ratio
+        self.explore_rate = explore_rate
+
+    def _key(self, scraper_name: str, shape: str) -> str:
+        return f"{scraper_name}|{shape}"
+
+    def depth(self, scraper_name: str, shape: str, max_pages: int) -> int:
+        floor = min(self.min_pages, max_pages)
+        stats = self.store.get(self._key(scraper_name, shape))
+        if not stats or stats["searches"] < self.min_samples:
+            return max_pages
+        # Keep probing the full depth now and then so a shrunk depth can grow back.
+        if random.random() < self.explore_rate:
+            return max_pages
+        depth = floor
+        for index, fetched in enumerate(stats["fetched"][:max_pages]):
+            if fetched and stats["useful"][index] / fetched >= self.useful_ratio:
+                depth = max(depth, index + 1)
+        return depth
+
+    def record(
+        self,
+        scraper_name: str,
+        shape: str,
+        fetched: int,
+        kept: list[SearchResult],
+    ) -> None:
+        pages_with_results = {r.page for r in kept}
+
+        def add(stats: Optional[dict]) -> dict:
+            stats = stats or {"searches": 0, "fetched": [], "useful": []}
+            stats = {
+                "searches": stats["searches"] + 1,
+                "fetched": list(stats["fetched"]),
+                "useful": list(stats["useful"]),
+            }
+            while len(stats["fetched"]) < fetched:
+                stats["fetched"].append(0)
+                stats["useful"].append(0)
+            for index in range(fetched):
+                stats["fetched"][index] += 1
+                if index + 1 in pages_with_results:
+                    stats["useful"][index] += 1
+            return stats
+
+        self.store.update(self._key(scraper_name, shape), add)
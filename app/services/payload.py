@@ -0,0 +1,61 @@
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass, field
+
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None
+
+MIN_COMPRESS_BYTES = 1024
+
+
+@dataclass
+class EncodedPayload:
+    body: bytes
+    etag: str
+    variants: dict[str, bytes] = field(default_factory=dict)
+    partial: bool = False
+    pending: bool = False
+
+    def negotiate(self, accept_encoding: str) -> tuple[str | None, bytes]:
+        accepted = _parse_accept_encoding(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and accepted.get(encoding, 0.0) > 0:
+                return encoding, self.variants[encoding]
+        return None, self.body
+
+    def etag_for(self, encoding: str | None) -> str:
+        if encoding is None:
+            return self.etag
+        return f"{self.etag}-{encoding}"
+
+
+def _parse_accept_encoding(header: str) -> dict[str, float]:
+    accepted: dict[str, float] = {}
+    for part in (header or "").split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+    return accepted
+
+
+def encode_json(data: dict, compress: bool = True) -> EncodedPayload:
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    variants: dict[str, bytes] = {}
+    if compress and len(body) >= MIN_COMPRESS_BYTES:
+        variants["gzip"] = gzip.compress(body, compresslevel=6, mtime=0)
+        if brotli is not None:
+            variants["br"] = brotli.compress(body, quality=5)
+    return EncodedPayload(body=body, etag=etag, variants=variants)
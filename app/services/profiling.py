@@ -0,0 +1,154 @@
+import contextvars
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional
+
+_SLUG_RE = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def _slug(query: str) -> str:
+    slug = _SLUG_RE.sub("_", query.strip().lower()).strip("_")
+    return slug[:40] or "query"
+
+
+class Profile:
+    def __init__(self, query: str):
+        self.query = query
+        self.paths: list[str] = []
+        self._profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def thread(self) -> Iterator[None]:
+        # cProfile only sees the thread that enabled it, so every worker
+        # thread that runs part of the search gets its own profiler.
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            with self._lock:
+                self._profiles.append(profiler)
+
+    def stats(self) -> pstats.Stats:
+        with self._lock:
+            profiles = list(self._profiles)
+        stats = pstats.Stats(profiles[0], stream=io.StringIO())
+        for profiler in profiles[1:]:
+            stats.add(profiler)
+        return stats
+
+
+_current: contextvars.ContextVar[Optional[Profile]] = contextvars.ContextVar(
+    "whiskyfinder_profile",
+    default=None,
+)
+
+
+@contextmanager
+def thread_scope() -> Iterator[None]:
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    with profile.thread():
+        yield
+
+
+class Profiler:
+    def __init__(
+        self,
+        directory: str,
+        admin_token: str = "",
+        sample_rate: float = 0.0,
+        trace_allocations: bool = True,
+        top: int = 40,
+    ):
+        self.directory = directory
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self.trace_allocations = trace_allocations
+        self.top = top
+        self._lock = threading.Lock()
+
+    def authorized(self, token: Optional[str]) -> bool:
+        if not self.admin_token or not token:
+            return False
+        return hmac.compare_digest(token.encode("utf-8"), self.admin_token.encode("utf-8"))
+
+    def should_profile(self, requested: bool, token: Optional[str]) -> bool:
+        if requested:
+            return self.authorized(token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    @contextmanager
+    def run(self, query: str) -> Iterator[Profile]:
+        profile = Profile(query)
+        # One profiled search at a time: tracemalloc is process-wide and
+        # overlapping runs would blur each other's allocation diffs.
+        with self._lock:
+            started_tracing = False
+            before = None
+            if self.trace_allocations:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(10)
+                    started_tracing = True
+                before = tracemalloc.take_snapshot()
+            token = _current.set(profile)
+            try:
+                with profile.thread():
+                    yield profile
+            finally:
+                _current.reset(token)
+                after = tracemalloc.take_snapshot() if before is not None else None
+                if started_tracing:
+                    tracemalloc.stop()
+                self._save(profile, before, after)
+
+    def _save(
+        self,
+        profile: Profile,
+        before: Optional[tracemalloc.Snapshot],
+        after: Optional[tracemalloc.Snapshot],
+    ) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        base = os.path.join(self.directory, f"{_slug(profile.query)}-{stamp}")
+
+        stats = profile.stats()
+        stats.dump_stats(f"{base}.prof")
+        profile.paths.append(f"{base}.prof")
+
+        summary = io.StringIO()
+        stats.stream = summary
+        stats.sort_stats("cumulative").print_stats(self.top)
+        with open(f"{base}.txt", "w", encoding="utf-8") as handle:
+            handle.write(f"query: {profile.query}\n")
+            handle.write(summary.getvalue())
+        profile.paths.append(f"{base}.txt")
+
+        if before is not None and after is not None:
+            # Only the app's own frames and its parsers are interesting; the
+            # snapshots themselves and the import machinery are noise.
+            filters = [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ]
+            diff = after.filter_traces(filters).compare_to(
+                before.filter_traces(filters), "lineno"
+            )
+            with open(f"{base}.alloc.txt", "w", encoding="utf-8") as handle:
+                handle.write(f"query: {profile.query}\n")
+                for line in diff[: self.top]:
+                    handle.write(f"{line}\n")
+            profile.paths.append(f"{base}.alloc.txt")
@@ -1,16 +1,34 @@
+import contextvars
+import heapq
+import logging
 import os
 import re
+import sqlite3
+import threading
+import time
 import unicodedata
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import asdict, dataclass, field
+from typing import Iterable, Iterator, Sequence
 
-from ..models.result import SearchResult
-from ..scrapers.biccamera import BiccameraScraper
-from ..scrapers.mukawa import MukawaScraper
-from ..scrapers.musashiya import MusashiyaScraper
-from ..scrapers.pricecom import PriceComScraper
-from ..scrapers.shinanoya import ShinanoyaScraper
-from ..scrapers.storesjp import StoresJPScraper
-from ..scrapers.yodobashi import YodobashiScraper
+from ..models.result import SearchPage, SearchResult
+from ..scrapers.base import BaseScraper
+from ..scrapers.fetch import default_fetcher
+from ..scrapers.listing_memo import ListingMemo
+from ..scrapers.parse_pool import ParsePool
+from ..scrapers.registry import ScraperConfig, ScraperRegistry, scraper_factories
 from ..storage.cache import TTLCache
+from ..storage.page_archive import PageArchive
+from ..storage.price_history import PriceHistory
+from ..storage.state import JSONStore, state_path
+from . import metrics, profiling, tracing
+from .circuit_breaker import CircuitBreaker
+from .page_depth import PageDepthAdvisor, query_shape
+from .payload import EncodedPayload, encode_json
+
+
+logger = logging.getLogger(__name__)
 
 
 def _get_int_env(name: str, default: int) -> int:
@@ -33,44 +51,172 @@ def _get_bool_env(name: str, default: bool) -> bool:
         return False
     return default
 
+def _get_float_env(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
 def _get_str_env(name: str, default: str) -> str:
     value = os.getenv(name)
     if value is None or value == "":
         return default
     return value
 
-_cache = TTLCache(ttl_seconds=86400)
-_scrapers = [
-    PriceComScraper(max_pages=_get_int_env("WHISKYFINDER_MAX_PAGES", 3)),
-    ShinanoyaScraper(max_pages=_get_int_env("WHISKYFINDER_MAX_PAGES", 3)),
-    MusashiyaScraper(),
-    MukawaScraper(),
-    StoresJPScraper(store_slug=_get_str_env("WHISKYFINDER_STORESJP_STORE", "absinthe")),
-    # BiccameraScraper(
-    #     category=os.getenv("WHISKYFINDER_BICCAMERA_CATEGORY"),
-    #     max_pages=_get_int_env("WHISKYFINDER_MAX_PAGES", 3),
-    #     use_playwright=_get_bool_env("WHISKYFINDER_BICCAMERA_USE_PLAYWRIGHT", True),
-    #     playwright_browser=os.getenv("WHISKYFINDER_BICCAMERA_PLAYWRIGHT_BROWSER", "chromium"),
-    #     playwright_headless=_get_bool_env(
-    #         "WHISKYFINDER_BICCAMERA_PLAYWRIGHT_HEADLESS",
-    #         True,
-    #     ),
-    #     playwright_timeout_ms=_get_int_env(
-    #         "WHISKYFINDER_BICCAMERA_PLAYWRIGHT_TIMEOUT_MS",
-    #         45000,
-    #     ),
-    #     playwright_user_agent=os.getenv("WHISKYFINDER_BICCAMERA_PLAYWRIGHT_UA"),
-    # ),
-    YodobashiScraper(
-        category_url=os.getenv("WHISKYFINDER_YODOBASHI_CATEGORY_URL"),
-        max_pages=_get_int_env("WHISKYFINDER_MAX_PAGES", 3),
+@dataclass
+class CacheEntry:
+    results: list[SearchResult]
+    degraded: list[str] = field(default_factory=list)
+    # Set when a price-sorted shop stopped after the cheapest N results: the
+    # entry can only serve unfiltered slices that end at or before N.
+    truncated_at: int | None = None
+    # Shops still running in the background when the latency budget ran out.
+    pending: list[str] = field(default_factory=list)
+    payloads: OrderedDict[tuple, EncodedPayload] = field(default_factory=OrderedDict)
+
+
+_cache = TTLCache(
+    ttl_seconds=86400,
+    on_evict=lambda key: metrics.cache_events.inc("eviction"),
+)
+_degraded_ttl_seconds = _get_int_env("WHISKYFINDER_DEGRADED_TTL_SECONDS", 300)
+_scraper_timeout_seconds = _get_int_env("WHISKYFINDER_SCRAPER_TIMEOUT_SECONDS", 30)
+_budget_ms = _get_int_env("WHISKYFINDER_BUDGET_MS", 8000)
+_bulkhead_size = _get_int_env("WHISKYFINDER_SCRAPER_CONCURRENCY", 2)
+_bulkheads: dict[str, ThreadPoolExecutor] = {}
+_bulkheads_lock = threading.Lock()
+_breakers: dict[str, CircuitBreaker] = {}
+_compress_responses = _get_bool_env("WHISKYFINDER_COMPRESS_RESPONSES", True)
+_payload_cache_size = _get_int_env("WHISKYFINDER_PAYLOAD_CACHE_SIZE", 8)
+_payload_lock = threading.Lock()
+_browser_max_age = _get_int_env("WHISKYFINDER_BROWSER_MAX_AGE", 300)
+_edge_max_age = _get_int_env("WHISKYFINDER_EDGE_MAX_AGE", 3600)
+_state_flush_seconds = _get_int_env("WHISKYFINDER_STATE_FLUSH_SECONDS", 5)
+_batch_concurrency = _get_int_env("WHISKYFINDER_BATCH_CONCURRENCY", 4)
+_batch_max_queries = _get_int_env("WHISKYFINDER_BATCH_MAX_QUERIES", 500)
+_page_depth = (
+    PageDepthAdvisor(
+        store=JSONStore(state_path("page_depth.json"), flush_interval=_state_flush_seconds),
+        min_pages=_get_int_env("WHISKYFINDER_MIN_PAGES", 1),
+    )
+    if _get_bool_env("WHISKYFINDER_ADAPTIVE_PAGES", True)
+    else None
+)
+_price_history = (
+    PriceHistory(
+        _get_str_env("WHISKYFINDER_PRICE_HISTORY_PATH", state_path("price_history.sqlite3"))
+    )
+    if _get_bool_env("WHISKYFINDER_PRICE_HISTORY", False)
+    else None
+)
+profiler = profiling.Profiler(
+    directory=_get_str_env("WHISKYFINDER_PROFILE_DIR", state_path("profiles")),
+    admin_token=_get_str_env("WHISKYFINDER_ADMIN_TOKEN", ""),
+    sample_rate=_get_float_env("WHISKYFINDER_PROFILE_SAMPLE_RATE", 0.0),
+    trace_allocations=_get_bool_env("WHISKYFINDER_PROFILE_ALLOCATIONS", True),
+)
+if _get_bool_env("WHISKYFINDER_PAGE_ARCHIVE", False):
+    default_fetcher.archive = PageArchive(
+        _get_str_env("WHISKYFINDER_PAGE_ARCHIVE_DIR", state_path("pages")),
+        max_bytes=_get_int_env("WHISKYFINDER_PAGE_ARCHIVE_MAX_MB", 256) * 1024 * 1024,
+        flush_interval=_state_flush_seconds,
+    )
+default_fetcher.configure(
+    hedge=_get_bool_env("WHISKYFINDER_HEDGE_REQUESTS", False),
+    hedge_percentile=_get_int_env("WHISKYFINDER_HEDGE_PERCENTILE", 95) / 100,
+    hedge_max_ratio=_get_int_env("WHISKYFINDER_HEDGE_MAX_PERCENT", 10) / 100,
+    rate_per_second=_get_float_env("WHISKYFINDER_HOST_RATE_PER_SECOND", 0.0),
+    burst=_get_int_env("WHISKYFINDER_HOST_BURST", 4),
+)
+# Read once at import; scrapers are built from this snapshot on first use.
+_scraper_config = ScraperConfig(
+    max_pages=_get_int_env("WHISKYFINDER_MAX_PAGES", 3),
+    filter_by_title=_get_bool_env("WHISKYFINDER_FILTER_BY_TITLE", True),
+    kakaku_sort_by_price=_get_bool_env("WHISKYFINDER_KAKAKU_SORT_BY_PRICE", False),
+    shinanoya_url_ttl_seconds=_get_int_env(
+        "WHISKYFINDER_SHINANOYA_URL_TTL_SECONDS",
+        30 * 86400,
+    ),
+    shinanoya_negative_ttl_seconds=_get_int_env(
+        "WHISKYFINDER_SHINANOYA_NEGATIVE_TTL_SECONDS",
+        6 * 3600,
+    ),
+    shinanoya_url_memo_size=_get_int_env("WHISKYFINDER_SHINANOYA_URL_MEMO_SIZE", 5000),
+    storesjp_store=_get_str_env("WHISKYFINDER_STORESJP_STORE", "absinthe"),
+    yodobashi_category_url=os.getenv("WHISKYFINDER_YODOBASHI_CATEGORY_URL"),
+    biccamera_enabled=_get_bool_env("WHISKYFINDER_BICCAMERA_ENABLED", False),
+    biccamera_options=dict(
+        category=os.getenv("WHISKYFINDER_BICCAMERA_CATEGORY"),
+        use_playwright=_get_bool_env("WHISKYFINDER_BICCAMERA_USE_PLAYWRIGHT", True),
+        playwright_browser=os.getenv("WHISKYFINDER_BICCAMERA_PLAYWRIGHT_BROWSER", "chromium"),
+        playwright_headless=_get_bool_env(
+            "WHISKYFINDER_BICCAMERA_PLAYWRIGHT_HEADLESS",
+            True,
+        ),
+        playwright_timeout_ms=_get_int_env(
+            "WHISKYFINDER_BICCAMERA_PLAYWRIGHT_TIMEOUT_MS",
+            45000,
+        ),
+        playwright_ready_timeout_ms=_get_int_env(
+            "WHISKYFINDER_BICCAMERA_PLAYWRIGHT_READY_TIMEOUT_MS",
+            8000,
+        ),
+        playwright_user_agent=os.getenv("WHISKYFINDER_BICCAMERA_PLAYWRIGHT_UA"),
+        playwright_pool_size=_get_int_env("WHISKYFINDER_BICCAMERA_PLAYWRIGHT_POOL_SIZE", 1),
+        playwright_max_navigations=_get_int_env(
+            "WHISKYFINDER_BICCAMERA_PLAYWRIGHT_MAX_NAVIGATIONS",
+            50,
+        ),
+        playwright_parallel_tabs=_get_int_env(
+            "WHISKYFINDER_BICCAMERA_PLAYWRIGHT_PARALLEL_TABS",
+            3,
+        ),
+        playwright_cdp_endpoint=os.getenv("WHISKYFINDER_BICCAMERA_PLAYWRIGHT_CDP_ENDPOINT"),
+        session_handoff=_get_bool_env("WHISKYFINDER_BICCAMERA_SESSION_HANDOFF", True),
     ),
-]
+    state_flush_seconds=_state_flush_seconds,
+)
+_listing_memo = (
+    ListingMemo(
+        max_entries=_get_int_env("WHISKYFINDER_LISTING_MEMO_SIZE", 512),
+        ttl_seconds=_get_int_env("WHISKYFINDER_LISTING_MEMO_TTL_SECONDS", 6 * 3600),
+    )
+    if _get_bool_env("WHISKYFINDER_INCREMENTAL_REFRESH", True)
+    else None
+)
+
+_parse_processes = _get_int_env("WHISKYFINDER_PARSE_PROCESSES", 0)
+_parse_pool = ParsePool(_parse_processes) if _parse_processes > 0 else None
+
 
+def _configure_scraper(scraper: BaseScraper) -> None:
+    scraper.listing_memo = _listing_memo
+    scraper.parse_pool = _parse_pool
+
+
+_scrapers: Sequence[BaseScraper] = ScraperRegistry(
+    scraper_factories(
+        _scraper_config,
+        # _filter_by_query is defined below, so it is looked up at call time.
+        result_filter=(
+            (lambda results, query: _filter_by_query(results, query))
+            if _scraper_config.filter_by_title
+            else None
+        ),
+    ),
+    configure=_configure_scraper,
+)
 
 def _normalize_query(query: str) -> str:
     return " ".join(query.split())
 
+def _canonical_query(query: str) -> str:
+    # Every cache-key variant of a query collapses to its compact form.
+    return _normalize_query(query).replace(" ", "")
+
 def _cache_keys(query: str) -> list[str]:
     base = _normalize_query(query)
     if not base:
@@ -123,29 +269,472 @@ def _dedup(results: list[SearchResult]) -> list[SearchResult]:
     return unique
 
 
-def get_cached_results(query: str) -> list[SearchResult] | None:
-    cache_keys = _cache_keys(query)
-    for key in cache_keys:
-        cached = _cache.get(key)
-        if cached is not None:
-            return cached
+def _sort_key(result: SearchResult) -> tuple[int, str]:
+    return (result.total, result.source)
+
+def _rank(
+    results: list[SearchResult],
+    offset: int = 0,
+    limit: int | None = None,
+) -> list[SearchResult]:
+    if limit is None:
+        return sorted(results, key=_sort_key)[offset:]
+    wanted = offset + limit
+    if wanted >= len(results):
+        return sorted(results, key=_sort_key)[offset:wanted]
+    return heapq.nsmallest(wanted, results, key=_sort_key)[offset:]
+
+def _filter_results(
+    results: list[SearchResult],
+    min_price: int | None = None,
+    max_price: int | None = None,
+    source: str | None = None,
+) -> list[SearchResult]:
+    if min_price is None and max_price is None and not source:
+        return results
+    return [
+        r
+        for r in results
+        if (min_price is None or r.total >= min_price)
+        and (max_price is None or r.total <= max_price)
+        and (not source or r.source == source)
+    ]
+
+
+def _get_cached_entry(query: str) -> CacheEntry | None:
+    with tracing.span("cache"):
+        cache_keys = _cache_keys(query)
+        for key in cache_keys:
+            cached = _cache.get(key)
+            if cached is not None:
+                metrics.cache_events.inc("hit")
+                return cached
+    metrics.cache_events.inc("miss")
     return None
 
 
-def search(query: str) -> list[SearchResult]:
-    cached = get_cached_results(query)
-    if cached is not None:
+def _breaker(scraper: BaseScraper) -> CircuitBreaker:
+    breaker = _breakers.get(scraper.name)
+    if breaker is None:
+        breaker = _breakers.setdefault(
+            scraper.name,
+            CircuitBreaker(
+                scraper.name,
+                failure_rate=_get_int_env("WHISKYFINDER_BREAKER_FAILURE_PERCENT", 50) / 100,
+                slow_call_seconds=_get_int_env("WHISKYFINDER_BREAKER_SLOW_SECONDS", 20),
+                open_seconds=_get_int_env("WHISKYFINDER_BREAKER_OPEN_SECONDS", 60),
+            ),
+        )
+    return breaker
+
+
+def _bulkhead(scraper: BaseScraper) -> ThreadPoolExecutor:
+    # One small pool per shop, so a hung shop can only exhaust its own workers.
+    with _bulkheads_lock:
+        executor = _bulkheads.get(scraper.name)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=max(_bulkhead_size, 1),
+                thread_name_prefix=f"scraper-{scraper.name}",
+            )
+            _bulkheads[scraper.name] = executor
+        return executor
+
+
+@dataclass
+class _Call:
+    scraper: BaseScraper
+    breaker: CircuitBreaker
+    submitted: float
+    started: float | None = None
+    future: Future | None = None
+
+    def run(self, *args) -> tuple[list[SearchResult], float]:
+        self.started = time.monotonic()
+        with profiling.thread_scope():
+            return _run_scraper(self.scraper, *args)
+
+    def deadline(self) -> float:
+        # Time spent queued behind the shop's other searches is bounded too,
+        # but only time spent running counts as the shop being slow.
+        return (self.started or self.submitted) + _scraper_timeout_seconds
+
+
+def _run_scraper(
+    scraper: BaseScraper,
+    query: str,
+    shape: str,
+    filter_by_title: bool,
+    wanted: int | None = None,
+) -> tuple[list[SearchResult], float]:
+    started = time.monotonic()
+    depth = None
+    kwargs = {}
+    if wanted is not None and getattr(scraper, "supports_cheapest_n", False):
+        kwargs["cheapest_n"] = wanted
+    if _page_depth is not None and scraper.supports_page_depth:
+        depth = _page_depth.depth(scraper.name, shape, scraper.max_pages)
+        scraped = scraper.search(query, max_pages=depth, **kwargs)
+    else:
+        scraped = scraper.search(query, **kwargs)
+    searched = time.monotonic() - started
+    metrics.phase_seconds.observe(scraper.name, "search", value=searched)
+    tracing.record(f"{scraper.name}.search", searched)
+    metrics.items.inc(scraper.name, "parsed", amount=len(scraped))
+    # Shops stop early when a listing runs out, so only the pages that
+    # actually produced rows count as fetched.
+    fetched = max((r.page for r in scraped), default=1)
+    if filter_by_title:
+        with tracing.span("filter"):
+            scraped = _filter_by_query(scraped, query)
+    metrics.items.inc(scraper.name, "kept", amount=len(scraped))
+    if _price_history is not None:
+        try:
+            _price_history.record(scraped)
+        except sqlite3.Error:
+            logger.warning("recording price history for %s failed", scraper.name, exc_info=True)
+    if depth is not None:
+        _page_depth.record(scraper.name, shape, min(fetched, depth), scraped)
+    return scraped, time.monotonic() - started
+
+
+def _serves(entry: CacheEntry, wanted: int | None) -> bool:
+    if entry.truncated_at is None:
+        return True
+    return wanted is not None and wanted <= entry.truncated_at
+
+
+def _wanted(
+    limit: int | None,
+    offset: int,
+    min_price: int | None = None,
+    max_price: int | None = None,
+    source: str | None = None,
+) -> int | None:
+    # Filters can push the requested slice arbitrarily deep into the listing.
+    if limit is None or min_price is not None or max_price is not None or source:
+        return None
+    return max(offset, 0) + max(limit, 0)
+
+
+class _Collection:
+    def __init__(self, query: str, truncated_at: int | None = None):
+        self.query = query
+        self.truncated_at = truncated_at
+        self.order = [scraper.name for scraper in _scrapers]
+        self.scraped: dict[str, list[SearchResult]] = {}
+        self.degraded: list[str] = []
+        self.pending: dict[Future, _Call] = {}
+        self.lock = threading.Lock()
+
+    def degrade(self, name: str) -> None:
+        with self.lock:
+            self.degraded.append(name)
+
+    def settle(self, future: Future) -> bool:
+        with self.lock:
+            call = self.pending.pop(future, None)
+        if call is None:
+            return False
+        try:
+            scraped, elapsed = future.result()
+        except Exception:
+            logger.warning("scraper %s failed", call.scraper.name, exc_info=True)
+            call.breaker.record_failure()
+            self.degrade(call.scraper.name)
+            return True
+        call.breaker.record_success(elapsed)
+        with self.lock:
+            self.scraped[call.scraper.name] = scraped
+        return True
+
+    def expire(self, future: Future) -> bool:
+        with self.lock:
+            call = self.pending.pop(future, None)
+        if call is None:
+            return False
+        if call.started is None:
+            future.cancel()
+            logger.warning("scraper %s timed out waiting for a worker", call.scraper.name)
+        else:
+            logger.warning("scraper %s timed out", call.scraper.name)
+            call.breaker.record_failure()
+        self.degrade(call.scraper.name)
+        return True
+
+    def expire_overdue(self) -> None:
+        now = time.monotonic()
+        with self.lock:
+            overdue = [f for f, call in self.pending.items() if call.deadline() <= now]
+        for future in overdue:
+            self.expire(future)
+
+    def next_deadline(self) -> float | None:
+        with self.lock:
+            return min((call.deadline() for call in self.pending.values()), default=None)
+
+    def entry(self) -> CacheEntry:
+        with self.lock:
+            results: list[SearchResult] = []
+            for name in self.order:
+                results.extend(self.scraped.get(name, []))
+            with tracing.span("dedup"):
+                results = _dedup(results)
+            with tracing.span("sort"):
+                results.sort(key=_sort_key)
+            return CacheEntry(
+                results=results,
+                degraded=sorted(self.degraded, key=self.order.index),
+                pending=sorted(
+                    (call.scraper.name for call in self.pending.values()),
+                    key=self.order.index,
+                ),
+                truncated_at=self.truncated_at,
+            )
+
+    def store(self) -> CacheEntry:
+        entry = self.entry()
+        ttl = _degraded_ttl_seconds if entry.degraded or entry.pending else None
+        for key in _cache_keys(self.query):
+            _cache.set(key, entry, ttl_seconds=ttl)
+        return entry
+
+    def detach(self) -> None:
+        # Shops still running past the budget keep filling the cache, but
+        # are still held to their own deadline.
+        with self.lock:
+            futures = list(self.pending)
+        for future in futures:
+            future.add_done_callback(self._finished_late)
+            self._watch(future)
+
+    def _finished_late(self, future: Future) -> None:
+        if self.settle(future):
+            self.store()
+
+    def _watch(self, future: Future) -> None:
+        with self.lock:
+            call = self.pending.get(future)
+        if call is None:
+            return
+        remaining = call.deadline() - time.monotonic()
+        if remaining > 0:
+            # The deadline moves once a queued call starts, so re-check then.
+            timer = threading.Timer(remaining, self._watch, (future,))
+            timer.daemon = True
+            timer.start()
+        elif self.expire(future):
+            self.store()
+
+
+def _collect(
+    query: str,
+    wanted: int | None = None,
+    budget_ms: int | None = None,
+    refresh: bool = False,
+) -> CacheEntry:
+    started = time.monotonic()
+    cached = None if refresh else _get_cached_entry(query)
+    if cached is not None and _serves(cached, wanted):
+        metrics.collect_seconds.observe("hit", value=time.monotonic() - started)
         return cached
 
-    results: list[SearchResult] = []
+    if budget_ms is None or budget_ms <= 0:
+        budget_ms = _budget_ms
+    budget_deadline = time.monotonic() + budget_ms / 1000
+    filter_by_title = _scraper_config.filter_by_title
+    shape = query_shape(query)
+    collection = _Collection(query)
     for scraper in _scrapers:
-        results.extend(scraper.search(query))
+        breaker = _breaker(scraper)
+        if not breaker.allow():
+            collection.degrade(scraper.name)
+            continue
+        if wanted is not None and getattr(scraper, "supports_cheapest_n", False):
+            collection.truncated_at = wanted
+        call = _Call(scraper, breaker, submitted=time.monotonic())
+        # Each call gets a copy of the request context so its spans land in
+        # the caller's trace.
+        call.future = _bulkhead(scraper).submit(
+            contextvars.copy_context().run, call.run, query, shape, filter_by_title, wanted
+        )
+        collection.pending[call.future] = call
+
+    while time.monotonic() < budget_deadline:
+        next_deadline = collection.next_deadline()
+        if next_deadline is None:
+            break
+        timeout = min(next_deadline, budget_deadline) - time.monotonic()
+        done, _ = wait(
+            list(collection.pending),
+            timeout=max(timeout, 0),
+            return_when=FIRST_COMPLETED,
+        )
+        for future in done:
+            collection.settle(future)
+        collection.expire_overdue()
+
+    entry = collection.store()
+    if entry.pending:
+        collection.detach()
+    metrics.collect_seconds.observe("miss", value=time.monotonic() - started)
+    return entry
+
+
+def get_cached_results(query: str) -> list[SearchResult] | None:
+    cached = _get_cached_entry(query)
+    if cached is None or not _serves(cached, None):
+        return None
+    return list(cached.results)
+
+
+def search(query: str, budget_ms: int | None = None) -> list[SearchResult]:
+    return list(_collect(query, budget_ms=budget_ms).results)
+
+
+def _page(
+    entry: CacheEntry,
+    limit: int | None,
+    offset: int,
+    min_price: int | None,
+    max_price: int | None,
+    source: str | None,
+) -> SearchPage:
+    offset = max(offset, 0)
+    if limit is not None:
+        limit = max(limit, 0)
+    results = _filter_results(entry.results, min_price, max_price, source)
+    if results is entry.results:
+        end = None if limit is None else offset + limit
+        ranked = results[offset:end]
+    else:
+        ranked = _rank(results, offset, limit)
+    return SearchPage(
+        results=ranked,
+        total=len(results),
+        limit=limit,
+        offset=offset,
+        degraded=list(entry.degraded),
+        pending=list(entry.pending),
+        truncated=entry.truncated_at is not None,
+    )
+
+
+def search_page(
+    query: str,
+    limit: int | None = None,
+    offset: int = 0,
+    min_price: int | None = None,
+    max_price: int | None = None,
+    source: str | None = None,
+    budget_ms: int | None = None,
+) -> SearchPage:
+    entry = _collect(query, _wanted(limit, offset, min_price, max_price, source), budget_ms)
+    return _page(entry, limit, offset, min_price, max_price, source)
+
+
+def search_payload(
+    query: str,
+    limit: int | None = None,
+    offset: int = 0,
+    min_price: int | None = None,
+    max_price: int | None = None,
+    source: str | None = None,
+    budget_ms: int | None = None,
+    refresh: bool = False,
+) -> EncodedPayload:
+    entry = _collect(
+        query,
+        _wanted(limit, offset, min_price, max_price, source),
+        budget_ms,
+        refresh=refresh,
+    )
+    key = (query, limit, offset, min_price, max_price, source)
+    with _payload_lock:
+        payload = entry.payloads.get(key)
+        if payload is not None:
+            entry.payloads.move_to_end(key)
+            return payload
+    with tracing.span("page"):
+        page = _page(entry, limit, offset, min_price, max_price, source)
+    with tracing.span("serialize"):
+        payload = encode_json({"query": query, **page.to_dict()}, compress=_compress_responses)
+    payload.partial = bool(page.degraded)
+    payload.pending = bool(page.pending)
+    if _payload_cache_size > 0:
+        with _payload_lock:
+            entry.payloads[key] = payload
+            while len(entry.payloads) > _payload_cache_size:
+                entry.payloads.popitem(last=False)
+    return payload
+
+
+def search_batch(
+    queries: Iterable[str],
+    limit: int | None = None,
+    budget_ms: int | None = None,
+    concurrency: int | None = None,
+) -> Iterator[tuple[str, SearchPage]]:
+    groups: dict[str, list[str]] = {}
+    for query in queries:
+        key = _canonical_query(query)
+        if key:
+            groups.setdefault(key, []).append(query)
+    if _batch_max_queries > 0 and len(groups) > _batch_max_queries:
+        raise ValueError(f"at most {_batch_max_queries} distinct queries per batch")
+    return _run_batch(groups, limit, budget_ms, concurrency or _batch_concurrency)
+
+
+def _run_batch(
+    groups: dict[str, list[str]],
+    limit: int | None,
+    budget_ms: int | None,
+    concurrency: int,
+) -> Iterator[tuple[str, SearchPage]]:
+    if not groups:
+        return
+    # Batch callers want complete answers, so each query may wait for its
+    # shops' full deadline, including time queued behind the other queries.
+    if budget_ms is None or budget_ms <= 0:
+        budget_ms = _scraper_timeout_seconds * 2000
+    wanted = _wanted(limit, 0, None, None, None)
+    # Only a few queries are collected at once; the per-shop bulkheads queue
+    # their shop calls, so every shop stays busy at its own concurrency.
+    pool = ThreadPoolExecutor(
+        max_workers=max(min(concurrency, len(groups)), 1),
+        thread_name_prefix="search-batch",
+    )
+    try:
+        futures = {
+            pool.submit(contextvars.copy_context().run, _collect, group[0], wanted, budget_ms): group
+            for group in groups.values()
+        }
+        for future in as_completed(futures):
+            page = _page(future.result(), limit, 0, None, None, None)
+            for query in futures[future]:
+                yield query, page
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def price_history(title: str, days: int | None = None) -> dict | None:
+    if _price_history is None:
+        return None
+    since = None if days is None else time.time() - days * 86400
+    lowest = _price_history.min_price(title, since=since)
+    return {
+        "title": title,
+        "min": None if lowest is None else asdict(lowest),
+        "series": [asdict(point) for point in _price_history.series(title, since=since)],
+    }
 
-    if _get_bool_env("WHISKYFINDER_FILTER_BY_TITLE", True):
-        results = _filter_by_query(results, query)
-    results = _dedup(results)
-    results.sort(key=lambda r: (r.total, r.source))
 
-    for key in _cache_keys(query):
-        _cache.set(key, results)
-    return results
+def cache_control(partial: bool = False, pending: bool = False) -> str:
+    if pending:
+        # Late shops are about to fill the cache; clients should ask again.
+        return "no-store"
+    if partial:
+        # Missing shops may recover soon: keep partial pages out of browser
+        # caches and let the edge hold them no longer than we do.
+        return f"public, max-age=0, s-maxage={min(_degraded_ttl_seconds, _edge_max_age)}"
+    return f"public, max-age={_browser_max_age}, s-maxage={_edge_max_age}"
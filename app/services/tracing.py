@@ -0,0 +1,83 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class Trace:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._spans: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            span = self._spans.get(name)
+            if span is None:
+                self._spans[name] = [seconds, 1]
+            else:
+                span[0] += seconds
+                span[1] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def spans(self) -> dict[str, tuple[float, int]]:
+        with self._lock:
+            return {name: (span[0], int(span[1])) for name, span in self._spans.items()}
+
+    def server_timing(self) -> str:
+        parts = [
+            f"{name};dur={seconds * 1000:.1f}"
+            for name, (seconds, _) in self.spans().items()
+        ]
+        parts.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(parts)
+
+    def to_dict(self) -> dict:
+        return {
+            "total_ms": round(self.elapsed() * 1000, 1),
+            "spans": {
+                name: {"ms": round(seconds * 1000, 1), "count": count}
+                for name, (seconds, count) in self.spans().items()
+            },
+        }
+
+
+_current: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar(
+    "whiskyfinder_trace",
+    default=None,
+)
+
+
+def current() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def activate(trace: Trace) -> Iterator[Trace]:
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+def record(name: str, seconds: float) -> None:
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, seconds)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, time.perf_counter() - started)
@@ -1,10 +1,15 @@
 import time
-from typing import Any
+from typing import Any, Callable, Optional
 
 
 class TTLCache:
-    def __init__(self, ttl_seconds: int = 86400):
+    def __init__(
+        self,
+        ttl_seconds: int = 86400,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ):
         self.ttl = ttl_seconds
+        self.on_evict = on_evict
         self.store: dict[str, tuple[float, Any]] = {}
 
     def get(self, key: str) -> Any:
@@ -13,9 +18,11 @@ class TTLCache:
             return None
         expires_at, value = item
         if expires_at < time.time():
-            self.store.pop(key, None)
+            if self.store.pop(key, None) is not None and self.on_evict is not None:
+                self.on_evict(key)
             return None
         return value
 
-    def set(self, key: str, value: Any) -> None:
-        self.store[key] = (time.time() + self.ttl, value)
+    def set(self, key: str, value: Any, ttl_seconds: int | None = None) -> None:
+        ttl = self.ttl if ttl_seconds is None else ttl_seconds
+        self.store[key] = (time.time() + ttl, value)
@@ -0,0 +1,168 @@
+import gzip
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from .state import JSONStore
+
+try:
+    import zstandard  # type: ignore
+except ImportError:
+    zstandard = None
+
+
+@dataclass
+class ArchivedPage:
+    url: str
+    scraper: str
+    fetched_at: float
+    status: int
+    encoding: Optional[str]
+    content_type: str
+    body: bytes
+
+
+def _compress(body: bytes) -> tuple[str, bytes]:
+    if zstandard is not None:
+        return "zst", zstandard.ZstdCompressor(level=10).compress(body)
+    return "gz", gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zst":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst archive objects")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class PageArchive:
+    def __init__(
+        self,
+        root: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        flush_interval: float = 5.0,
+    ):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        # url -> metadata of the last successful fetch; bodies live in
+        # objects/ under their content hash, so repeated pages share a file.
+        self.index = JSONStore(os.path.join(root, "index.json"), flush_interval=flush_interval)
+        self._lock = threading.Lock()
+        self._sizes: dict[str, int] = {}
+        self._refs: dict[str, int] = {}
+        for _, meta in self.index.items():
+            self._sizes[meta["object"]] = meta["size"]
+            self._refs[meta["object"]] = self._refs.get(meta["object"], 0) + 1
+        self._total = sum(self._sizes.values())
+
+    def _object_path(self, name: str) -> str:
+        return os.path.join(self.root, "objects", name[:2], name)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total
+
+    def put(
+        self,
+        url: str,
+        scraper: str,
+        body: bytes,
+        status: int = 200,
+        encoding: Optional[str] = None,
+        content_type: str = "",
+        fetched_at: Optional[float] = None,
+    ) -> None:
+        digest = hashlib.sha256(body).hexdigest()
+        meta = {
+            "size": 0,
+            "scraper": scraper,
+            "fetched_at": time.time() if fetched_at is None else fetched_at,
+            "status": status,
+            "encoding": encoding,
+            "content_type": content_type,
+        }
+        with self._lock:
+            stored = (f"{digest}.{codec}" for codec in ("zst", "gz"))
+            name = next((n for n in stored if n in self._sizes), None)
+            if name is None:
+                codec, data = _compress(body)
+                name = f"{digest}.{codec}"
+                path = self._object_path(name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                self._sizes[name] = len(data)
+                self._total += len(data)
+            meta["object"] = name
+            meta["size"] = self._sizes[name]
+            self._refs[name] = self._refs.get(name, 0) + 1
+            previous = self.index.get(url)
+            self.index.set(url, meta)
+            if previous is not None:
+                self._release(previous["object"])
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _release(self, name: str) -> None:
+        self._refs[name] = self._refs.get(name, 1) - 1
+        if self._refs[name] > 0:
+            return
+        del self._refs[name]
+        self._total -= self._sizes.pop(name, 0)
+        try:
+            os.remove(self._object_path(name))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        # Oldest fetches go first, down to 90% of the cap so eviction is not
+        # repeated on every put.
+        target = int(self.max_bytes * 0.9)
+        entries = sorted((meta["fetched_at"], url) for url, meta in self.index.items())
+        for _, url in entries:
+            if self._total <= target:
+                break
+            meta = self.index.pop(url)
+            if meta is not None:
+                self._release(meta["object"])
+
+    def get(self, url: str) -> Optional[ArchivedPage]:
+        meta = self.index.get(url)
+        if meta is None:
+            return None
+        return self._load(url, meta)
+
+    def _load(self, url: str, meta: dict) -> Optional[ArchivedPage]:
+        name = meta["object"]
+        try:
+            with open(self._object_path(name), "rb") as f:
+                body = _decompress(name.rsplit(".", 1)[-1], f.read())
+        except (OSError, ValueError, EOFError):
+            return None
+        return ArchivedPage(
+            url=url,
+            scraper=meta["scraper"],
+            fetched_at=meta["fetched_at"],
+            status=meta["status"],
+            encoding=meta.get("encoding"),
+            content_type=meta.get("content_type", ""),
+            body=body,
+        )
+
+    def pages(self, scraper: Optional[str] = None) -> Iterator[ArchivedPage]:
+        for url, meta in self.index.items():
+            if scraper is not None and meta["scraper"] != scraper:
+                continue
+            page = self._load(url, meta)
+            if page is not None:
+                yield page
+
+    def flush(self) -> None:
+        self.index.flush()
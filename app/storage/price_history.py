@@ -0,0 +1,175 @@
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from ..models.result import SearchResult
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS strings (
+    id INTEGER PRIMARY KEY,
+    value TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    title_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS observations (
+    product_id INTEGER NOT NULL,
+    observed_at INTEGER NOT NULL,
+    price INTEGER NOT NULL,
+    shop_id INTEGER NOT NULL,
+    url_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS observations_by_product
+    ON observations (product_id, observed_at, price, shop_id, url_id);
+"""
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def product_key(title: str) -> str:
+    return _SPACE_RE.sub(" ", unicodedata.normalize("NFKC", title).casefold()).strip()
+
+
+@dataclass
+class PricePoint:
+    observed_at: int
+    price: int
+    source: str
+    url: str
+
+
+class PriceHistory:
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._strings: dict[str, int] = {}
+        self._products: dict[str, int] = {}
+
+    def _string_id(self, value: str) -> int:
+        cached = self._strings.get(value)
+        if cached is not None:
+            return cached
+        self._conn.execute("INSERT OR IGNORE INTO strings (value) VALUES (?)", (value,))
+        (string_id,) = self._conn.execute(
+            "SELECT id FROM strings WHERE value = ?", (value,)
+        ).fetchone()
+        self._strings[value] = string_id
+        return string_id
+
+    def _product_id(self, key: str, title: str, create: bool = True) -> Optional[int]:
+        cached = self._products.get(key)
+        if cached is not None:
+            return cached
+        row = self._conn.execute("SELECT id FROM products WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            if not create:
+                return None
+            cursor = self._conn.execute(
+                "INSERT INTO products (key, title_id) VALUES (?, ?)",
+                (key, self._string_id(title)),
+            )
+            row = (cursor.lastrowid,)
+        self._products[key] = row[0]
+        return row[0]
+
+    def record(self, results: Iterable[SearchResult], observed_at: Optional[float] = None) -> int:
+        observed = int(time.time() if observed_at is None else observed_at)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                rows = [
+                    (
+                        self._product_id(product_key(r.title), r.title),
+                        observed,
+                        r.price,
+                        self._string_id(r.source),
+                        self._string_id(r.url),
+                    )
+                    for r in results
+                    if r.title and r.price
+                ]
+                self._conn.executemany(
+                    "INSERT INTO observations"
+                    " (product_id, observed_at, price, shop_id, url_id)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                # Ids cached during the failed transaction were rolled back too.
+                self._strings.clear()
+                self._products.clear()
+                raise
+        return len(rows)
+
+    def _window(
+        self,
+        title: str,
+        since: Optional[float],
+        until: Optional[float],
+    ) -> Optional[tuple[int, int, int]]:
+        product_id = self._product_id(product_key(title), title, create=False)
+        if product_id is None:
+            return None
+        low = 0 if since is None else int(since)
+        high = 2**62 if until is None else int(until)
+        return product_id, low, high
+
+    def series(
+        self,
+        title: str,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> list[PricePoint]:
+        with self._lock:
+            window = self._window(title, since, until)
+            if window is None:
+                return []
+            rows = self._conn.execute(
+                "SELECT o.observed_at, o.price, s.value, u.value"
+                " FROM observations o"
+                " JOIN strings s ON s.id = o.shop_id"
+                " JOIN strings u ON u.id = o.url_id"
+                " WHERE o.product_id = ? AND o.observed_at BETWEEN ? AND ?"
+                " ORDER BY o.observed_at, o.price",
+                window,
+            ).fetchall()
+        return [PricePoint(*row) for row in rows]
+
+    def min_price(
+        self,
+        title: str,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> Optional[PricePoint]:
+        with self._lock:
+            window = self._window(title, since, until)
+            if window is None:
+                return None
+            row = self._conn.execute(
+                "SELECT o.observed_at, o.price, s.value, u.value"
+                " FROM observations o"
+                " JOIN strings s ON s.id = o.shop_id"
+                " JOIN strings u ON u.id = o.url_id"
+                " WHERE o.product_id = ? AND o.observed_at BETWEEN ? AND ?"
+                " ORDER BY o.price, o.observed_at DESC"
+                " LIMIT 1",
+                window,
+            ).fetchone()
+        return PricePoint(*row) if row is not None else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
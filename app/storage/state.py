@@ -0,0 +1,128 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+def state_dir() -> str:
+    path = os.getenv("WHISKYFINDER_STATE_DIR") or os.path.join(
+        tempfile.gettempdir(), "whiskyfinder"
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def state_path(filename: str) -> str:
+    return os.path.join(state_dir(), filename)
+
+
+class JSONStore:
+    def __init__(self, path: Optional[str] = None, flush_interval: float = 0.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._data: dict[str, Any] = self._load()
+        self._dirty = False
+        self._last_flush = 0.0
+        self._timer: Optional[threading.Timer] = None
+        if path and flush_interval > 0:
+            atexit.register(self.flush)
+
+    def _load(self) -> dict[str, Any]:
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _flush(self) -> None:
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path) or "."
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def _changed(self) -> None:
+        self._dirty = True
+        if not self.path:
+            return
+        wait = self._last_flush + self.flush_interval - time.monotonic()
+        if wait <= 0:
+            self._flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(wait, self._flush_later)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_later(self) -> None:
+        with self._lock:
+            self._timer = None
+            if self._dirty:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._dirty:
+                self._flush()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._changed()
+
+    def update(self, key: str, fn: Callable[[Any], Any]) -> Any:
+        with self._lock:
+            value = fn(self._data.get(key))
+            self._data[key] = value
+            self._changed()
+            return value
+
+    def prune(
+        self,
+        keep: Callable[[Any], bool],
+        max_entries: Optional[int] = None,
+        rank: Optional[Callable[[Any], Any]] = None,
+    ) -> int:
+        with self._lock:
+            drop = [key for key, value in self._data.items() if not keep(value)]
+            for key in drop:
+                del self._data[key]
+            if max_entries is not None and len(self._data) > max_entries:
+                ordered = sorted(self._data, key=lambda k: rank(self._data[k]) if rank else k)
+                for key in ordered[: len(self._data) - max_entries]:
+                    del self._data[key]
+                    drop.append(key)
+            if drop:
+                self._changed()
+            return len(drop)
+
+    def items(self) -> list[tuple[str, Any]]:
+        with self._lock:
+            return list(self._data.items())
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def pop(self, key: str) -> Any:
+        with self._lock:
+            value = self._data.pop(key, None)
+            self._changed()
+            return value
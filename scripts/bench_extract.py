@@ -0,0 +1,122 @@
+import argparse
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(ROOT)
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from app.models.result import SearchResult  # noqa: E402
+from app.scrapers.extract import compiled  # noqa: E402
+from app.scrapers.pricecom import PriceComScraper, extract_final_url  # noqa: E402
+
+
+def _page(items: int) -> str:
+    cells = []
+    for i in range(items):
+        category = "ウイスキー" if i % 10 else "グラス"
+        cells.append(
+            f"""
+            <div class="c-list1_cell p-resultItem">
+              <div class="p-item_visual"><img src="/img/{i}.jpg"></div>
+              <p class="p-item_category">{category}</p>
+              <p class="p-item_name">
+                <a href="https://r.kakaku.com/?u=https%3A%2F%2Fshop{i % 7}.example%2Fitem%2F{i}">
+                  Whisky {i} 12年 700ml
+                </a>
+              </p>
+              <p class="p-item_price">¥{3000 + i * 17:,}</p>
+              <div class="p-resultItem_quote"><img alt="Shop {i % 7}"></div>
+            </div>"""
+        )
+    return f"<html><body><div class='p-result'>{''.join(cells)}</div></body></html>"
+
+
+# The hand-written kakaku.com loop the selector spec replaced, kept as the
+# baseline.
+def _legacy_price(text: str):
+    if not text:
+        return None
+    match = re.search(r"([0-9,]+)", re.sub(r"\s+", "", text))
+    if not match:
+        return None
+    return int(match.group(1).replace(",", ""))
+
+
+def _legacy_source(item) -> str:
+    quote_el = item.select_one(".p-resultItem_quote")
+    if not quote_el:
+        return "kakaku.com"
+    img = quote_el.select_one("img[alt]")
+    if img and img.get("alt"):
+        return img["alt"].strip()
+    return quote_el.get_text(" ", strip=True) or "kakaku.com"
+
+
+def legacy(soup) -> list[SearchResult]:
+    results = []
+    for item in soup.select("div.c-list1_cell.p-resultItem"):
+        title_el = item.select_one(".p-item_name a")
+        if not title_el:
+            continue
+        category_el = item.select_one(".p-item_category")
+        if category_el:
+            category = category_el.get_text(" ", strip=True)
+            if category and "ウイスキー" not in category:
+                continue
+        price_el = item.select_one(".p-item_price") or item.select_one(".p-item_priceNum")
+        price = _legacy_price(price_el.get_text(" ", strip=True) if price_el else "")
+        if price is None:
+            continue
+        results.append(
+            SearchResult(
+                title=title_el.get_text(" ", strip=True),
+                price=price,
+                source=_legacy_source(item),
+                url=extract_final_url(title_el.get("href", "")),
+            )
+        )
+    return results
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare the kakaku.com selector spec against the old hand-written loop."
+    )
+    parser.add_argument("--items", type=int, default=40, help="items per synthetic page")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    html = _page(args.items)
+    soup = BeautifulSoup(html, "lxml")
+    extractor = compiled(PriceComScraper.selector_spec)
+
+    old, new = legacy(soup), extractor.extract(soup)
+    if [r.to_dict() for r in old] != [r.to_dict() for r in new]:
+        print("[bench] results differ between the two extractors", file=sys.stderr)
+        return 1
+
+    build = _best(lambda: BeautifulSoup(html, "lxml"), args.repeat)
+    old_seconds = _best(lambda: legacy(soup), args.repeat)
+    new_seconds = _best(lambda: extractor.extract(soup), args.repeat)
+    print(f"items={args.items} kept={len(new)}")
+    print(f"soup build     {build * 1000:8.2f} ms")
+    print(f"hand-written   {old_seconds * 1000:8.2f} ms")
+    print(f"selector spec  {new_seconds * 1000:8.2f} ms  ({old_seconds / new_seconds:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+sys.path.append(ROOT)
+
+from bs4 import UnicodeDammit  # noqa: E402
+
+from app.services.search_service import _scrapers  # noqa: E402
+from app.storage.page_archive import PageArchive  # noqa: E402
+from app.storage.price_history import PriceHistory  # noqa: E402
+from app.storage.state import state_path  # noqa: E402
+
+
+def _decode(body: bytes, encoding: str | None) -> str:
+    return UnicodeDammit(body, [encoding] if encoding else []).unicode_markup or ""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Re-run the current parsers over archived pages without network access."
+    )
+    parser.add_argument(
+        "--archive",
+        default=os.getenv("WHISKYFINDER_PAGE_ARCHIVE_DIR") or state_path("pages"),
+        help="page archive directory",
+    )
+    parser.add_argument("--scraper", help="only re-parse pages fetched by this scraper")
+    parser.add_argument("-o", "--output", help="write results as NDJSON (default: stdout)")
+    parser.add_argument(
+        "--price-history",
+        help="also record the results into this price-history SQLite file",
+    )
+    args = parser.parse_args()
+
+    scrapers = {scraper.name: scraper for scraper in _scrapers}
+    archive = PageArchive(args.archive)
+    history = PriceHistory(args.price_history) if args.price_history else None
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+
+    pages = items = 0
+    failures: dict[str, int] = {}
+    try:
+        for page in archive.pages(args.scraper):
+            scraper = scrapers.get(page.scraper)
+            if scraper is None:
+                continue
+            try:
+                results = scraper.parse_archived(_decode(page.body, page.encoding))
+            except Exception as exc:
+                failures[page.scraper] = failures.get(page.scraper, 0) + 1
+                print(f"[reparse] {page.url}: {exc!r}", file=sys.stderr)
+                continue
+            pages += 1
+            items += len(results)
+            record = {
+                "url": page.url,
+                "scraper": page.scraper,
+                "fetched_at": page.fetched_at,
+                "results": [r.to_dict() for r in results],
+            }
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if history is not None:
+                history.record(results, observed_at=page.fetched_at)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"[reparse] pages={pages} items={items} failures={failures or 0}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
+from app.models.result import SearchPage
+from app.services.search_service import search_batch
+
+CSV_COLUMNS = ["query", "title", "price", "source", "url", "total"]
+
+
+def read_queries(path: str) -> list[str]:
+    queries: list[str] = []
+    seen: set[str] = set()
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            query = line.strip()
+            if query and not query.startswith("#") and query not in seen:
+                seen.add(query)
+                queries.append(query)
+    return queries
+
+
+def read_checkpoint(path: Path) -> set[str]:
+    if not path.exists():
+        return set()
+    with open(path, encoding="utf-8") as handle:
+        return {line.rstrip("\n") for line in handle if line.strip()}
+
+
+class Writer:
+    def __init__(self, handle: TextIO, output_format: str, write_header: bool):
+        self.handle = handle
+        self.output_format = output_format
+        self._csv = csv.writer(handle) if output_format == "csv" else None
+        if self._csv is not None and write_header:
+            self._csv.writerow(CSV_COLUMNS)
+
+    def write(self, query: str, page: SearchPage) -> None:
+        if self._csv is None:
+            self.handle.write(json.dumps({"query": query, **page.to_dict()}, ensure_ascii=False))
+            self.handle.write("\n")
+        else:
+            for r in page.results:
+                self._csv.writerow([query, r.title, r.price, r.source, r.url, r.total])
+        self.handle.flush()
+
+
+class Progress:
+    def __init__(self, total: int, done: int, stream: TextIO, interval: float = 5.0):
+        self.total = total
+        self.done = done
+        self.stream = stream
+        self.interval = interval
+        self.completed = 0
+        self.results = 0
+        self.errors: Counter[str] = Counter()
+        self.started = time.monotonic()
+        self._reported = self.started
+
+    def record(self, page: SearchPage) -> None:
+        self.completed += 1
+        self.results += page.total
+        self.errors.update(page.degraded)
+        if time.monotonic() - self._reported >= self.interval:
+            self.report()
+
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def eta_seconds(self) -> float | None:
+        rate = self.rate()
+        if rate <= 0:
+            return None
+        return (self.total - self.done - self.completed) / rate
+
+    def report(self) -> None:
+        self._reported = time.monotonic()
+        eta = self.eta_seconds()
+        line = (
+            f"[sweep] {self.done + self.completed}/{self.total} queries"
+            f" {self.rate():.2f} q/s"
+            f" results={self.results}"
+            f" eta={'?' if eta is None else f'{eta:.0f}s'}"
+        )
+        if self.errors and self.completed:
+            rates = ", ".join(
+                f"{name}={count / self.completed:.0%}" for name, count in sorted(self.errors.items())
+            )
+            line += f" errors: {rates}"
+        print(line, file=self.stream, flush=True)
+
+
+def _chunks(items: list[str], size: int) -> Iterator[list[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def sweep(
+    queries: Iterable[str],
+    writer: Writer,
+    checkpoint: TextIO,
+    progress: Progress,
+    chunk_size: int = 100,
+    concurrency: int | None = None,
+    limit: int | None = None,
+) -> None:
+    for chunk in _chunks(list(queries), max(chunk_size, 1)):
+        for query, page in search_batch(chunk, limit=limit, concurrency=concurrency):
+            writer.write(query, page)
+            # The checkpoint is written after the results, so an interrupted
+            # sweep may repeat a query but never loses one.
+            checkpoint.write(query + "\n")
+            checkpoint.flush()
+            progress.record(page)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Search every whisky name in a file across all shops."
+    )
+    parser.add_argument("input", help="file with one whisky name per line")
+    parser.add_argument("-o", "--output", required=True, help="output file (appended on resume)")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument(
+        "--checkpoint",
+        help="file of finished queries (default: <output>.done)",
+    )
+    parser.add_argument("--concurrency", type=int, default=None, help="queries in flight")
+    parser.add_argument("--chunk", type=int, default=100, help="queries per batch")
+    parser.add_argument("--limit", type=int, default=None, help="results kept per query")
+    parser.add_argument("--progress-interval", type=float, default=5.0)
+    args = parser.parse_args()
+
+    queries = read_queries(args.input)
+    checkpoint_path = Path(args.checkpoint or f"{args.output}.done")
+    finished = read_checkpoint(checkpoint_path)
+    remaining = [q for q in queries if q not in finished]
+    done = len(queries) - len(remaining)
+    if done:
+        print(f"[sweep] resuming: {done} of {len(queries)} queries already done", file=sys.stderr)
+
+    output_path = Path(args.output)
+    write_header = not output_path.exists() or output_path.stat().st_size == 0
+    progress = Progress(len(queries), done, sys.stderr, args.progress_interval)
+    with open(output_path, "a", encoding="utf-8", newline="") as output, open(
+        checkpoint_path, "a", encoding="utf-8"
+    ) as checkpoint:
+        writer = Writer(output, args.format, write_header)
+        try:
+            sweep(
+                remaining,
+                writer,
+                checkpoint,
+                progress,
+                chunk_size=args.chunk,
+                concurrency=args.concurrency,
+                limit=args.limit,
+            )
+        except KeyboardInterrupt:
+            progress.report()
+            print(f"[sweep] interrupted; rerun to resume from {checkpoint_path}", file=sys.stderr)
+            return 130
+    progress.report()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
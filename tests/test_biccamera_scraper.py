@@ -0,0 +1,267 @@
+import requests
+
+from app.models.result import SearchResult
+from app.scrapers.biccamera import BiccameraScraper
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type="document"):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakeResponse:
+    def __init__(
+        self,
+        data,
+        resource_type="xhr",
+        content_type="application/json",
+        url="https://www.biccamera.com/api/items",
+    ):
+        self.request = FakeRequest(url, resource_type)
+        self.headers = {"content-type": content_type}
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakePage:
+    def __init__(self, html="", responses=None, ready=True):
+        self.html = html
+        self.responses = responses or []
+        self.ready = ready
+        self.handlers = []
+        self.visited = []
+        self.waited_for_timeout = False
+        self.closed = False
+
+    def on(self, event, handler):
+        self.handlers.append(handler)
+
+    def remove_listener(self, event, handler):
+        self.handlers.remove(handler)
+
+    def goto(self, url, wait_until=None, timeout=None):
+        self.visited.append(url)
+        for response in self.responses:
+            for handler in list(self.handlers):
+                handler(response)
+
+    def close(self):
+        self.closed = True
+
+    def wait_for_function(self, script, timeout=None):
+        if not self.ready:
+            raise TimeoutError("not ready")
+
+    def wait_for_timeout(self, timeout):
+        self.waited_for_timeout = True
+
+    def is_closed(self):
+        return False
+
+    def content(self):
+        return self.html
+
+
+ITEM_LIST_HTML = """
+<html><head>
+<script type="application/ld+json">
+{"@type": "ItemList", "itemListElement": [
+  {"item": {"name": "Whisky A", "url": "/bc/item/1/", "offers": {"price": "5,500"}}}
+]}
+</script>
+</head><body></body></html>
+"""
+
+
+def test_biccamera_playwright_reads_json_ld_without_fixed_wait():
+    scraper = BiccameraScraper()
+    page = FakePage(html=ITEM_LIST_HTML)
+
+    soup, results = scraper._load_playwright(page, "https://www.biccamera.com/bc/search/")
+
+    assert soup is not None
+    assert [(r.title, r.price, r.url) for r in results] == [
+        ("Whisky A", 5500, "https://www.biccamera.com/bc/item/1/")
+    ]
+    assert page.waited_for_timeout is False
+    assert page.handlers == []
+
+
+def test_biccamera_playwright_prefers_captured_xhr_items():
+    data = {
+        "data": {
+            "items": [
+                {"name": "Whisky B", "url": "/bc/item/2/", "price": 8800},
+                {"name": "Whisky C", "url": "/bc/item/3/", "price": "12,100"},
+            ]
+        }
+    }
+    scraper = BiccameraScraper(playwright_ready_timeout_ms=100)
+    page = FakePage(html="<html></html>", responses=[FakeResponse(data)], ready=False)
+
+    _, results = scraper._load_playwright(page, "https://www.biccamera.com/bc/search/")
+
+    assert [(r.title, r.price) for r in results] == [("Whisky B", 8800), ("Whisky C", 12100)]
+
+
+def test_biccamera_playwright_merges_xhr_items_with_dom_listing():
+    listing = {"items": [{"name": "Whisky B", "url": "/bc/item/2/", "price": 8800}]}
+    widget = {"items": [{"name": "Ranking", "url": "/bc/item/9/", "price": 100}]}
+    page = FakePage(
+        html=ITEM_LIST_HTML,
+        responses=[
+            FakeResponse(listing),
+            FakeResponse(widget, url="https://www.biccamera.com/api/recommend"),
+        ],
+    )
+    scraper = BiccameraScraper()
+
+    _, results = scraper._load_playwright(page, "https://www.biccamera.com/bc/search/")
+
+    assert [r.title for r in results] == ["Whisky A", "Whisky B"]
+
+
+class FakeLease:
+    def __init__(self, pages):
+        self.page = FakePage()
+        self.pages = list(pages)
+
+    def new_page(self):
+        return self.pages.pop(0)
+
+
+def _item_list_html(title, price):
+    return ITEM_LIST_HTML.replace("Whisky A", title).replace("5,500", str(price))
+
+
+def test_biccamera_loads_pages_in_parallel_tabs_and_keeps_order():
+    tabs = [FakePage(html=_item_list_html(f"Whisky {n}", n * 1000)) for n in (2, 3)]
+    lease = FakeLease(tabs)
+    scraper = BiccameraScraper(playwright_parallel_tabs=2)
+
+    loaded = scraper._load_playwright_many(lease, ["https://a/?page=2", "https://a/?page=3"])
+
+    assert [r.title for _, results in loaded for r in results] == ["Whisky 2", "Whisky 3"]
+    assert [tab.visited for tab in tabs] == [["https://a/?page=2"], ["https://a/?page=3"]]
+    assert all(tab.closed for tab in tabs)
+
+
+def test_biccamera_uses_fresh_tabs_when_pages_exceed_parallel_tabs():
+    tabs = [FakePage(html=_item_list_html(f"Whisky {n}", n * 1000)) for n in (2, 3, 4)]
+    lease = FakeLease(tabs)
+    scraper = BiccameraScraper(playwright_parallel_tabs=2)
+    urls = [f"https://a/?page={n}" for n in (2, 3, 4)]
+
+    loaded = scraper._load_playwright_many(lease, urls)
+
+    assert [r.title for _, results in loaded for r in results] == [
+        "Whisky 2",
+        "Whisky 3",
+        "Whisky 4",
+    ]
+    assert [tab.visited for tab in tabs] == [[url] for url in urls]
+    assert all(tab.closed for tab in tabs)
+
+
+def test_biccamera_blocks_heavy_and_tracker_requests():
+    scraper = BiccameraScraper()
+
+    assert scraper._is_blocked_request(FakeRequest("https://www.biccamera.com/a.css", "stylesheet"))
+    assert scraper._is_blocked_request(FakeRequest("https://www.biccamera.com/f.woff2", "font"))
+    assert scraper._is_blocked_request(
+        FakeRequest("https://www.googletagmanager.com/gtm.js", "script")
+    )
+    assert not scraper._is_blocked_request(
+        FakeRequest("https://www.biccamera.com/bc/search/", "document")
+    )
+
+
+class DummyHttpResponse:
+    def __init__(self, text="", status_code=200):
+        self.text = text
+        self.status_code = status_code
+        self.encoding = "utf-8"
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"status {self.status_code}")
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.headers = {}
+        self.cookies = requests.cookies.RequestsCookieJar()
+        self.urls = []
+
+    def get(self, url, timeout=15):
+        self.urls.append(url)
+        return self.responses.pop(0)
+
+
+class FakeContext:
+    def cookies(self):
+        return [{"name": "bot_check", "value": "ok", "domain": ".biccamera.com", "path": "/"}]
+
+
+class FakePool:
+    def __init__(self):
+        self.runs = 0
+
+    def run(self, fn, timeout=None):
+        self.runs += 1
+        lease = FakeLease([])
+        lease.context = FakeContext()
+        lease.page.evaluate = lambda script: "Mozilla/5.0 Handoff"
+        return fn(lease)
+
+
+def test_biccamera_hands_playwright_session_to_requests(monkeypatch):
+    session = FakeSession(
+        [
+            DummyHttpResponse(text=ITEM_LIST_HTML),
+            DummyHttpResponse(status_code=403),
+            DummyHttpResponse(status_code=403),
+        ]
+    )
+    pool = FakePool()
+    scraper = BiccameraScraper(session=session, browser_pool=pool)
+    monkeypatch.setattr(
+        scraper,
+        "_search_playwright_lease",
+        lambda lease, query, max_pages: [SearchResult("Whisky P", 1000, "ビックカメラ", "https://b/1")],
+    )
+
+    assert [r.title for r in scraper.search("whisky")] == ["Whisky P"]
+    assert session.cookies.get("bot_check") == "ok"
+    assert session.headers["User-Agent"] == "Mozilla/5.0 Handoff"
+
+    assert [r.title for r in scraper.search("whisky")] == ["Whisky A"]
+    assert pool.runs == 1
+
+    # 403 means the handed-off session expired: fall back to Playwright again.
+    assert [r.title for r in scraper.search("whisky")] == ["Whisky P"]
+    assert pool.runs == 2
+
+
+def test_biccamera_challenge_page_flips_back_to_playwright(monkeypatch):
+    challenge = "<html><body>Checking your browser...</body></html>"
+    session = FakeSession(
+        [DummyHttpResponse(text=challenge), DummyHttpResponse(text=challenge)]
+    )
+    pool = FakePool()
+    scraper = BiccameraScraper(session=session, browser_pool=pool)
+    monkeypatch.setattr(
+        scraper,
+        "_search_playwright_lease",
+        lambda lease, query, max_pages: [SearchResult("Whisky P", 1000, "ビックカメラ", "https://b/1")],
+    )
+
+    scraper.search("whisky")
+    assert pool.runs == 1
+
+    assert [r.title for r in scraper.search("whisky")] == ["Whisky P"]
+    assert pool.runs == 2
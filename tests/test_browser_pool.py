@@ -0,0 +1,139 @@
+import playwright.sync_api
+import pytest
+
+from app.scrapers.browser_pool import BrowserPool
+
+
+class FakeFrame:
+    parent_frame = None
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed or self.context.closed
+
+    def goto(self, url):
+        for handler in self.context.page_handlers.get(self, []):
+            handler(FakeFrame())
+        return url
+
+    def on(self, event, handler):
+        self.context.page_handlers.setdefault(self, []).append(handler)
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+        self.handlers = []
+        self.page_handlers = {}
+
+    def on(self, event, handler):
+        self.handlers.append(handler)
+
+    def new_page(self):
+        page = FakePage(self)
+        for handler in self.handlers:
+            handler(page)
+        return page
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, registry):
+        self.registry = registry
+        self.connected = True
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    def new_context(self, **kwargs):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        self.registry["contexts"] += 1
+        return context
+
+    def close(self):
+        self.connected = False
+
+
+class FakeBrowserType:
+    def __init__(self, registry):
+        self.registry = registry
+
+    def launch(self, **kwargs):
+        self.registry["launches"] += 1
+        return FakeBrowser(self.registry)
+
+
+class FakePlaywright:
+    def __init__(self, registry):
+        self.chromium = FakeBrowserType(registry)
+
+    def stop(self):
+        pass
+
+
+class FakeManager:
+    def __init__(self, registry):
+        self.registry = registry
+
+    def start(self):
+        return FakePlaywright(self.registry)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = {"launches": 0, "contexts": 0}
+    monkeypatch.setattr(playwright.sync_api, "sync_playwright", lambda: FakeManager(registry))
+    return registry
+
+
+def test_pool_reuses_browser_between_leases(registry):
+    pool = BrowserPool(max_size=1)
+    try:
+        first = pool.run(lambda lease: lease.page, timeout=5)
+        second = pool.run(lambda lease: lease.page, timeout=5)
+    finally:
+        pool.close()
+
+    assert first is second
+    assert registry["launches"] == 1
+    assert registry["contexts"] == 1
+
+
+def test_pool_recycles_context_after_max_navigations(registry):
+    pool = BrowserPool(max_size=1, max_navigations=2)
+    try:
+        for _ in range(3):
+            pool.run(lambda lease: lease.page.goto("https://example.com"), timeout=5)
+    finally:
+        pool.close()
+
+    assert registry["launches"] == 1
+    assert registry["contexts"] == 2
+
+
+def test_pool_relaunches_crashed_browser(registry):
+    pool = BrowserPool(max_size=1)
+
+    def crash(lease):
+        lease.context.browser.connected = False
+        raise RuntimeError("browser crashed")
+
+    try:
+        with pytest.raises(RuntimeError):
+            pool.run(crash, timeout=5)
+        closed = pool.run(lambda lease: lease.page.is_closed(), timeout=5)
+    finally:
+        pool.close()
+
+    assert closed is False
+    assert registry["launches"] == 2
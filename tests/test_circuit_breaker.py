@@ -0,0 +1,47 @@
+from app.services import circuit_breaker
+from app.services.circuit_breaker import CircuitBreaker
+
+
+def test_breaker_opens_on_failure_rate_and_recovers(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("shop", min_calls=4, failure_rate=0.5, open_seconds=30)
+
+    for ok in (True, False, True, False):
+        assert breaker.allow()
+        if ok:
+            breaker.record_success(0.1)
+        else:
+            breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    now[0] += 31
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success(0.1)
+    assert breaker.state == "closed"
+
+
+def test_breaker_counts_slow_calls_as_failures():
+    breaker = CircuitBreaker("shop", min_calls=2, slow_call_seconds=1.0)
+
+    breaker.record_success(5.0)
+    breaker.record_success(5.0)
+
+    assert breaker.state == "open"
+
+
+def test_half_open_failure_reopens(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("shop", min_calls=1, open_seconds=10)
+    breaker.record_failure()
+    now[0] += 11
+
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
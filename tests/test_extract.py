@@ -0,0 +1,117 @@
+from bs4 import BeautifulSoup
+
+from app.scrapers.base import BaseScraper
+from app.scrapers.extract import SelectorSpec, compiled, parse_price
+from app.scrapers.pricecom import PriceComScraper
+from app.services import metrics
+
+
+def test_parse_price_prefers_the_yen_amount():
+    assert parse_price("¥12,345") == 12345
+    assert parse_price("￥１２，３４５（税込）") == 12345
+    assert parse_price("山崎 12年 700ml ¥15,000") == 15000
+    assert parse_price("2本セット 9,800円") == 9800
+    assert parse_price("JPY 9,999") == 9999
+    assert parse_price("no price") is None
+    assert parse_price("") is None
+    assert parse_price(None) is None
+
+
+SPEC = SelectorSpec(
+    container="li.item",
+    title=".name a",
+    price=(".sale", ".price"),
+    source="Shop",
+    source_from=((".seller img[alt]", "alt"), (".seller", None)),
+    category=".category",
+    category_keyword="ウイスキー",
+    base_url="https://shop.example/",
+)
+
+
+def test_spec_extracts_items_with_fallbacks():
+    html = """
+    <ul>
+      <li class="item">
+        <span class="name"><a href="/p/1">Whisky One</a></span>
+        <span class="price">¥5,500</span>
+        <span class="category">ウイスキー</span>
+        <span class="seller"><img alt="Seller A"></span>
+      </li>
+      <li class="item">
+        <span class="name"><a href="/p/2">Whisky Two</a></span>
+        <span class="sale">¥4,000</span>
+        <span class="price">¥4,800</span>
+        <span class="seller">Seller B</span>
+      </li>
+      <li class="item">
+        <span class="name"><a href="/p/3">Glass</a></span>
+        <span class="price">¥900</span>
+        <span class="category">グラス</span>
+      </li>
+      <li class="item">
+        <span class="name"><a href="/p/4">Sold out</a></span>
+        <span class="price">SOLD OUT</span>
+      </li>
+    </ul>
+    """
+    results = compiled(SPEC).extract(BeautifulSoup(html, "lxml"))
+
+    assert [(r.title, r.price, r.source, r.url) for r in results] == [
+        ("Whisky One", 5500, "Seller A", "https://shop.example/p/1"),
+        ("Whisky Two", 4000, "Seller B", "https://shop.example/p/2"),
+    ]
+    assert compiled(SPEC) is compiled(SPEC)
+
+
+def test_spec_drops_items_without_required_link():
+    spec = SelectorSpec(
+        container="div.item",
+        title=".name",
+        link="a.link",
+        require_href=True,
+        price=(".price",),
+        source="Shop",
+    )
+    html = """
+    <div class="item"><span class="name">A</span><a class="link" href="">x</a>
+      <span class="price">1,000円</span></div>
+    <div class="item"><span class="name">B</span><span class="price">2,000円</span></div>
+    <div class="item"><span class="name">C</span><a class="link" href="/c">x</a>
+      <span class="price">3,000円</span></div>
+    """
+    results = compiled(spec).extract(BeautifulSoup(html, "lxml"))
+
+    assert [(r.title, r.price, r.url) for r in results] == [("C", 3000, "/c")]
+
+
+def test_pricecom_spec_resolves_redirect_links():
+    html = """
+    <div class="c-list1_cell p-resultItem">
+      <p class="p-item_name">
+        <a href="https://r.kakaku.com/?u=https%3A%2F%2Fshop.example%2Fitem">Whisky</a>
+      </p>
+      <p class="p-item_price">¥ 7,700</p>
+    </div>
+    """
+    results = PriceComScraper()._parse_results(BeautifulSoup(html, "lxml"))
+
+    assert [(r.price, r.source, r.url) for r in results] == [
+        (7700, "kakaku.com", "https://shop.example/item")
+    ]
+
+
+class SpecScraper(BaseScraper):
+    name = "spec-scraper"
+    selector_spec = SPEC
+
+    def search(self, query):
+        return []
+
+
+def test_inherited_parse_results_is_instrumented():
+    before = metrics.phase_seconds.count("spec-scraper", "parse")
+
+    SpecScraper()._parse_results(BeautifulSoup("<ul></ul>", "lxml"))
+
+    assert metrics.phase_seconds.count("spec-scraper", "parse") == before + 1
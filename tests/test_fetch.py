@@ -0,0 +1,72 @@
+import threading
+import time
+
+from app.scrapers.fetch import Fetcher, HostBudget
+
+
+class FakeResponse:
+    def __init__(self, label):
+        self.label = label
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, delays):
+        self.delays = list(delays)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=15):
+        with self._lock:
+            call = self.calls
+            self.calls += 1
+        time.sleep(self.delays[call])
+        return FakeResponse(call)
+
+
+def _warm(fetcher, host, seconds=0.01, samples=20):
+    stats = fetcher.stats(host)
+    for _ in range(samples):
+        stats.count_request()
+        stats.record(seconds)
+
+
+def test_fetcher_hedges_get_slower_than_p95():
+    fetcher = Fetcher(hedge=True, hedge_max_ratio=0.5)
+    _warm(fetcher, "shop.example")
+    session = FakeSession([0.5, 0.0])
+
+    started = time.monotonic()
+    response = fetcher.get(session, "https://shop.example/list")
+
+    assert response.label == 1
+    assert session.calls == 2
+    assert time.monotonic() - started < 0.4
+
+
+def test_fetcher_does_not_hedge_without_history_or_budget():
+    fetcher = Fetcher(hedge=True, rate_per_second=0.001, burst=1)
+    session = FakeSession([0.05])
+
+    assert fetcher.get(session, "https://shop.example/list").label == 0
+
+    _warm(fetcher, "shop.example")
+    # The only token went to the primary request, so no duplicate may be sent.
+    session = FakeSession([0.05, 0.0])
+    fetcher._budgets["shop.example"] = HostBudget(0.001, burst=1)
+    assert fetcher.get(session, "https://shop.example/list").label == 0
+    assert session.calls == 1
+
+
+def test_fetcher_caps_hedges_per_host():
+    fetcher = Fetcher(hedge=True, hedge_max_ratio=0.05)
+    _warm(fetcher, "shop.example")
+    session = FakeSession([0.05, 0.0, 0.05, 0.0])
+
+    fetcher.get(session, "https://shop.example/a")
+    fetcher.get(session, "https://shop.example/b")
+
+    assert fetcher.stats("shop.example").hedges == 1
@@ -0,0 +1,64 @@
+import pytest
+
+from app import create_app
+from app.models.result import SearchResult
+from app.scrapers.base import BaseScraper
+from app.services import metrics, search_service
+from app.storage.cache import TTLCache
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = metrics.Registry()
+    histogram = registry.histogram("demo_seconds", "Demo.", ("phase",))
+    histogram.observe("parse", value=0.02)
+    histogram.observe("parse", value=7)
+
+    text = registry.render()
+
+    assert '# TYPE demo_seconds histogram' in text
+    assert 'demo_seconds_bucket{phase="parse",le="0.025"} 1' in text
+    assert 'demo_seconds_bucket{phase="parse",le="10"} 2' in text
+    assert 'demo_seconds_bucket{phase="parse",le="+Inf"} 2' in text
+    assert 'demo_seconds_count{phase="parse"} 2' in text
+
+
+class InstrumentedScraper(BaseScraper):
+    name = "instrumented"
+
+    def _fetch_soup(self, url):
+        return "<html></html>"
+
+    def _parse_results(self, soup):
+        return [
+            SearchResult("Whisky 10", 5000, "Shop", "https://example.com/1"),
+            SearchResult("Tumbler", 800, "Shop", "https://example.com/2"),
+        ]
+
+    def search(self, query):
+        return self._parse_results(self._fetch_soup("https://example.com/"))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(search_service, "_scrapers", [InstrumentedScraper()])
+    monkeypatch.setattr(search_service, "_cache", TTLCache(ttl_seconds=60))
+    return create_app().test_client()
+
+
+def test_metrics_endpoint_reports_phases_items_and_cache(client):
+    parse_before = metrics.phase_seconds.count("instrumented", "parse")
+    kept_before = metrics.items.value("instrumented", "kept")
+    hits_before = metrics.cache_events.value("hit")
+
+    client.get("/search?q=whisky")
+    client.get("/search?q=whisky")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert metrics.phase_seconds.count("instrumented", "parse") == parse_before + 1
+    assert metrics.phase_seconds.count("instrumented", "fetch") >= 1
+    assert metrics.items.value("instrumented", "kept") == kept_before + 1
+    assert metrics.cache_events.value("hit") >= hits_before + 1
+    text = response.get_data(as_text=True)
+    assert 'whiskyfinder_scraper_items_total{scraper="instrumented",stage="parsed"}' in text
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import requests
+
+from app.scrapers.musashiya import MusashiyaScraper
+from app.storage.state import JSONStore
+
+
+class DummyResponse:
+    def __init__(self, text="", status_code=200, encoding=None):
+        self.text = text
+        self.status_code = status_code
+        self.encoding = encoding
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"status {self.status_code}")
+
+
+class FakeSession:
+    def __init__(self, get_map=None):
+        self.get_map = get_map or {}
+        self.headers = {}
+        self.urls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=15):
+        with self._lock:
+            self.urls.append(url)
+        response = self.get_map.get(url, DummyResponse(text="<html></html>"))
+        time.sleep(getattr(response, "delay", 0))
+        return response
+
+
+RESULT_HTML = """
+<div class="yak-Item">
+  <div class="yak-Item__name"><a href="/products/detail/1">Ardbeg 10</a></div>
+  <div class="yak-Item__price">¥6,380</div>
+</div>
+"""
+
+BASE = "https://store.musashiya-net.co.jp/products/list?category_id=&name="
+
+
+def test_musashiya_races_variants_and_learns_winner(tmp_path):
+    compact_url = f"{BASE}ardbeg10"
+    session = FakeSession(get_map={compact_url: DummyResponse(text=RESULT_HTML)})
+    store = JSONStore(str(tmp_path / "variants.json"))
+    scraper = MusashiyaScraper(session=session, variant_store=store)
+
+    results = scraper.search("ardbeg 10")
+
+    assert [(r.title, r.price) for r in results] == [("Ardbeg 10", 6380)]
+    assert store.get("space:digit:ascii") == {"compact": 1}
+
+    session.urls.clear()
+    reloaded = MusashiyaScraper(session=session, variant_store=JSONStore(str(tmp_path / "variants.json")))
+    reloaded.search("glenlivet 12")
+
+    assert session.urls[0] == f"{BASE}glenlivet12"
+
+
+def test_musashiya_prefers_earliest_variant_with_results():
+    slow_fullwidth = DummyResponse(text=RESULT_HTML)
+    slow_fullwidth.delay = 0.2
+    session = FakeSession(
+        get_map={
+            f"{BASE}ardbeg%E3%80%8010": slow_fullwidth,
+            f"{BASE}ardbeg10": DummyResponse(text=RESULT_HTML),
+        }
+    )
+    store = JSONStore()
+    scraper = MusashiyaScraper(session=session, variant_store=store)
+
+    scraper.search("ardbeg 10")
+
+    assert store.get("space:digit:ascii") == {"fullwidth": 1}
+
+
+def test_musashiya_no_results_tries_every_variant():
+    session = FakeSession()
+    scraper = MusashiyaScraper(session=session)
+
+    assert scraper.search("ardbeg 10") == []
+    assert sorted(session.urls) == sorted(
+        f"{BASE}{v}" for v in ("ardbeg+10", "ardbeg%E3%80%8010", "ardbeg10")
+    )
+
+
+def test_musashiya_empty_query():
+    scraper = MusashiyaScraper(session=FakeSession())
+
+    assert scraper.search("") == []
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+import requests
+
+from app.scrapers.fetch import Fetcher
+from app.storage.page_archive import PageArchive
+
+
+def test_archive_round_trips_and_shares_identical_bodies(tmp_path):
+    archive = PageArchive(str(tmp_path))
+    body = "<html>ウイスキー</html>".encode("utf-8")
+
+    archive.put("https://a.example/1", "shop", body, encoding="utf-8", fetched_at=100)
+    archive.put("https://a.example/2", "shop", body, fetched_at=200)
+    archive.flush()
+
+    page = PageArchive(str(tmp_path)).get("https://a.example/1")
+    assert (page.body, page.encoding, page.fetched_at) == (body, "utf-8", 100)
+    objects = [name for _, _, names in os.walk(tmp_path / "objects") for name in names]
+    assert len(objects) == 1
+
+
+def test_archive_evicts_oldest_pages_over_the_cap(tmp_path):
+    archive = PageArchive(str(tmp_path), max_bytes=3000)
+    for n in range(10):
+        archive.put(f"https://a.example/{n}", "shop", os.urandom(1000), fetched_at=n)
+
+    assert archive.total_bytes() <= 3000
+    assert archive.get("https://a.example/0") is None
+    assert archive.get("https://a.example/9") is not None
+    objects = [name for _, _, names in os.walk(tmp_path / "objects") for name in names]
+    assert len(objects) == archive.index.size()
+
+
+def test_refetch_replaces_the_old_object(tmp_path):
+    archive = PageArchive(str(tmp_path))
+    archive.put("https://a.example/1", "shop", b"old")
+    archive.put("https://a.example/1", "shop", b"new")
+
+    assert archive.get("https://a.example/1").body == b"new"
+    objects = [name for _, _, names in os.walk(tmp_path / "objects") for name in names]
+    assert len(objects) == 1
+
+
+class Session:
+    def __init__(self):
+        self.down = False
+
+    def get(self, url, **kwargs):
+        if self.down:
+            raise requests.ConnectionError("shop unreachable")
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"<html>listing</html>"
+        response.encoding = "utf-8"
+        response.headers["Content-Type"] = "text/html"
+        return response
+
+
+def test_fetcher_archives_pages_and_serves_them_when_the_shop_is_down(tmp_path):
+    fetcher = Fetcher()
+    fetcher.archive = PageArchive(str(tmp_path))
+    session = Session()
+
+    fetcher.get(session, "https://shop.example/list", label="shop")
+    session.down = True
+    response = fetcher.get(session, "https://shop.example/list", label="shop")
+
+    assert response.text == "<html>listing</html>"
+    assert "X-Archived-At" in response.headers
+    with pytest.raises(requests.ConnectionError):
+        fetcher.get(session, "https://shop.example/other", label="shop")
@@ -0,0 +1,89 @@
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.scrapers.parse_pool import ParsePool
+from app.scrapers.pricecom import PriceComScraper
+from app.scrapers.storesjp import StoresJPScraper
+
+
+def _page_html(items, pages=3):
+    cells = "".join(
+        f"""
+        <div class="c-list1_cell p-resultItem">
+          <p class="p-item_name"><a href="https://shop.example/{n}">{title}</a></p>
+          <p class="p-item_category">ウイスキー</p>
+          <p class="p-item_price">¥{price:,}</p>
+          <div class="p-resultItem_quote"><img alt="Shop {n}"></div>
+        </div>
+        """
+        for n, title, price in items
+    )
+    pager = "".join(
+        f'<a href="https://search.kakaku.com/whisky/?page={p}">{p}</a>'
+        for p in range(2, pages + 1)
+    )
+    return f'<html><body>{cells}<div class="p-pager">{pager}</div></body></html>'
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ParsePool(2, warm=(f"{PriceComScraper.__module__}:PriceComScraper",))
+    yield pool
+    pool.shutdown()
+
+
+def test_pool_parses_like_the_scraper(pool):
+    html = _page_html([(1, "Whisky A", 3000), (2, "Whisky B", 4500)])
+    scraper = PriceComScraper()
+    local = scraper._parse_page(html)
+
+    scraper.parse_pool = pool
+    offloaded = scraper._parse_page(html)
+
+    assert offloaded == local
+    assert offloaded[1] == 3
+    assert [(r.source, r.price) for r in offloaded[0]] == [("Shop 1", 3000), ("Shop 2", 4500)]
+
+
+def test_pool_loads_scrapers_it_was_not_warmed_with(pool):
+    html = """
+    <article class="feed_list">
+      <div class="feed_list_name_main"><a href="/items/1">Whisky C</a></div>
+      <div class="feed_item_price">¥6,600</div>
+    </article>
+    """
+    scraper = StoresJPScraper()
+    scraper.parse_pool = pool
+
+    results, _ = scraper._parse_page(html)
+
+    assert [(r.title, r.price, r.url) for r in results] == [
+        ("Whisky C", 6600, "https://stores.jp/items/1")
+    ]
+
+
+class BrokenExecutor:
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        raise BrokenProcessPool("worker died")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def test_broken_pool_falls_back_to_in_process_parsing():
+    pool = ParsePool(1)
+    broken = BrokenExecutor()
+    pool._executor = broken
+    scraper = PriceComScraper()
+    scraper.parse_pool = pool
+
+    results, max_page = scraper._parse_page(_page_html([(1, "Whisky A", 3000)], pages=1))
+
+    assert [r.price for r in results] == [3000]
+    assert max_page == 1
+    assert broken.shut_down
+    assert pool._executor is None
@@ -0,0 +1,69 @@
+import time
+
+from app.models.result import SearchResult
+from app.services import search_service
+from app.storage.cache import TTLCache
+from app.storage.price_history import PriceHistory, product_key
+
+
+def _result(price, source="Shop A", title="Ardbeg 10 700ml"):
+    return SearchResult(title, price, source, f"https://{source}.example.com/ardbeg")
+
+
+def test_series_and_min_price_over_window(tmp_path):
+    history = PriceHistory(str(tmp_path / "history.sqlite3"))
+    history.record([_result(6000), _result(5800, "Shop B")], observed_at=1000)
+    history.record([_result(5500), _result(5900, "Shop B")], observed_at=2000)
+    history.record([_result(6200)], observed_at=3000)
+
+    series = history.series("ARDBEG  10 700ml")
+    assert [(p.observed_at, p.price, p.source) for p in series] == [
+        (1000, 5800, "Shop B"),
+        (1000, 6000, "Shop A"),
+        (2000, 5500, "Shop A"),
+        (2000, 5900, "Shop B"),
+        (3000, 6200, "Shop A"),
+    ]
+    assert history.min_price("Ardbeg 10 700ml").price == 5500
+    lowest = history.min_price("Ardbeg 10 700ml", since=2500)
+    assert (lowest.price, lowest.url) == (6200, "https://Shop A.example.com/ardbeg")
+    assert history.min_price("Lagavulin 16") is None
+    assert history.series("Ardbeg 10 700ml", since=1500, until=2500)[0].price == 5500
+
+
+def test_strings_are_stored_once(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    history = PriceHistory(str(path))
+    for day in range(50):
+        history.record([_result(5000 + day)], observed_at=day * 86400)
+
+    conn = history._conn
+    assert conn.execute("SELECT COUNT(*) FROM strings").fetchone() == (3,)
+    assert conn.execute("SELECT COUNT(*) FROM observations").fetchone() == (50,)
+    history.close()
+
+    reopened = PriceHistory(str(path))
+    assert len(reopened.series("ardbeg 10 700ml")) == 50
+    assert product_key("Ａｒｄｂｅｇ　10") == "ardbeg 10"
+
+
+class ShopScraper(search_service.BaseScraper):
+    name = "shop"
+
+    def search(self, query):
+        return [_result(5000)]
+
+
+def test_searches_record_price_history(monkeypatch):
+    history = PriceHistory()
+    monkeypatch.setattr(search_service, "_price_history", history)
+    monkeypatch.setattr(search_service, "_scrapers", [ShopScraper()])
+    monkeypatch.setattr(search_service, "_cache", TTLCache(ttl_seconds=60))
+
+    search_service.search("ardbeg")
+    search_service.search("ardbeg")
+
+    assert [p.price for p in history.series("Ardbeg 10 700ml")] == [5000]
+    recent = search_service.price_history("Ardbeg 10 700ml", days=1)
+    assert recent["min"]["price"] == 5000
+    assert recent["min"]["observed_at"] <= time.time()
@@ -0,0 +1,184 @@
+import requests
+
+from app.scrapers.listing_memo import ListingMemo
+from app.scrapers.pricecom import PriceComScraper
+
+
+class DummyResponse:
+    def __init__(self, text="", status_code=200, encoding=None):
+        self.text = text
+        self.status_code = status_code
+        self.encoding = encoding
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"status {self.status_code}")
+
+
+class FakeSession:
+    def __init__(self, get_map=None):
+        self.get_map = get_map or {}
+        self.headers = {}
+        self.urls = []
+
+    def get(self, url, timeout=15):
+        if url not in self.get_map:
+            raise AssertionError(f"Unexpected GET url: {url}")
+        self.urls.append(url)
+        return self.get_map[url]
+
+
+def _page_html(items, pages=3):
+    cells = "".join(
+        f"""
+        <div class="c-list1_cell p-resultItem">
+          <p class="p-item_name"><a href="https://shop.example/{n}">{title}</a></p>
+          <p class="p-item_category">ウイスキー</p>
+          <p class="p-item_price">¥{price:,}</p>
+        </div>
+        """
+        for n, title, price in items
+    )
+    pager = "".join(
+        f'<a href="https://search.kakaku.com/whisky/?page={p}">{p}</a>'
+        for p in range(2, pages + 1)
+    )
+    return f'<html><body>{cells}<div class="p-pager">{pager}</div></body></html>'
+
+
+BASE = "https://search.kakaku.com/whisky/?category=0016_0054"
+
+
+def _scraper(session, **kwargs):
+    scraper = PriceComScraper(session=session, max_pages=3, **kwargs)
+    scraper.request_delay_seconds = 0
+    return scraper
+
+
+def test_pricecom_price_sorted_mode_stops_once_cheapest_known():
+    session = FakeSession(
+        get_map={
+            f"{BASE}&sort=priceb": DummyResponse(
+                text=_page_html([(1, "Whisky A", 3000), (2, "Whisky B", 4000)])
+            ),
+        }
+    )
+    scraper = _scraper(session, sort_by_price=True)
+
+    results = scraper.search("whisky", cheapest_n=2)
+
+    assert [r.price for r in results] == [3000, 4000]
+    assert session.urls == [f"{BASE}&sort=priceb"]
+
+
+def test_pricecom_price_sorted_mode_counts_only_filtered_items():
+    session = FakeSession(
+        get_map={
+            f"{BASE}&sort=priceb": DummyResponse(
+                text=_page_html([(1, "Glass", 500), (2, "Whisky B", 4000)])
+            ),
+            f"{BASE}&sort=priceb&page=2": DummyResponse(
+                text=_page_html([(3, "Whisky C", 5000)])
+            ),
+        }
+    )
+    scraper = _scraper(
+        session,
+        sort_by_price=True,
+        result_filter=lambda results, query: [r for r in results if "Whisky" in r.title],
+    )
+
+    results = scraper.search("whisky", cheapest_n=2)
+
+    assert [r.price for r in results] == [500, 4000, 5000]
+    assert len(session.urls) == 2
+
+
+def test_pricecom_price_sorted_mode_stops_when_page_adds_nothing_new():
+    page_1 = _page_html([(1, "Whisky A", 3000)])
+    session = FakeSession(
+        get_map={
+            f"{BASE}&sort=priceb": DummyResponse(text=page_1),
+            f"{BASE}&sort=priceb&page=2": DummyResponse(text=page_1),
+        }
+    )
+    scraper = _scraper(session, sort_by_price=True)
+
+    results = scraper.search("whisky")
+
+    assert len(results) == 1
+    assert session.urls == [f"{BASE}&sort=priceb", f"{BASE}&sort=priceb&page=2"]
+
+
+def test_pricecom_default_mode_reads_every_page():
+    session = FakeSession(
+        get_map={
+            BASE: DummyResponse(text=_page_html([(1, "Whisky A", 3000)])),
+            f"{BASE}&page=2": DummyResponse(text=_page_html([(2, "Whisky B", 4000)])),
+            f"{BASE}&page=3": DummyResponse(text=_page_html([(3, "Whisky C", 5000)])),
+        }
+    )
+    scraper = _scraper(session)
+
+    results = scraper.search("whisky", cheapest_n=1)
+
+    assert [r.price for r in results] == [3000, 4000, 5000]
+
+
+def _memo_session():
+    return FakeSession(
+        get_map={
+            BASE: DummyResponse(text=_page_html([(1, "Whisky A", 3000)])),
+            f"{BASE}&page=2": DummyResponse(text=_page_html([(2, "Whisky B", 4000)])),
+            f"{BASE}&page=3": DummyResponse(text=_page_html([(3, "Whisky C", 5000)])),
+        }
+    )
+
+
+def test_pricecom_unchanged_first_page_reuses_deep_pages():
+    session = _memo_session()
+    scraper = _scraper(session)
+    scraper.listing_memo = ListingMemo()
+
+    first = scraper.search("whisky")
+    session.urls.clear()
+    again = scraper.search("whisky")
+
+    assert [(r.price, r.page) for r in again] == [(r.price, r.page) for r in first]
+    assert session.urls == [BASE]
+
+
+def test_pricecom_changed_first_page_refetches_deep_pages():
+    session = _memo_session()
+    scraper = _scraper(session)
+    scraper.listing_memo = ListingMemo()
+
+    scraper.search("whisky")
+    session.get_map[BASE] = DummyResponse(text=_page_html([(1, "Whisky A", 2800)]))
+    session.urls.clear()
+    results = scraper.search("whisky")
+
+    assert [r.price for r in results] == [2800, 4000, 5000]
+    assert len(session.urls) == 3
+
+
+def test_pricecom_identical_body_skips_parsing(monkeypatch):
+    session = _memo_session()
+    scraper = _scraper(session)
+    scraper.max_pages = 1
+    scraper.listing_memo = ListingMemo()
+    scraper.search("whisky")
+
+    def fail(soup):
+        raise AssertionError("unchanged body should not be parsed again")
+
+    monkeypatch.setattr(scraper, "_parse_results", fail)
+    assert [r.price for r in scraper.search("whisky")] == [3000]
+
+
+def test_pricecom_reparses_archived_page_text():
+    scraper = _scraper(FakeSession())
+
+    results = scraper.parse_archived(_page_html([(1, "Whisky A", 3000)]))
+
+    assert [(r.title, r.price) for r in results] == [("Whisky A", 3000)]
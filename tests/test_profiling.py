@@ -0,0 +1,40 @@
+import contextvars
+import os
+import pstats
+import threading
+
+from app.services import profiling
+
+
+def _parse_page():
+    return [str(n) * 10 for n in range(2000)]
+
+
+def test_profile_covers_worker_threads_and_writes_files(tmp_path):
+    profiler = profiling.Profiler(str(tmp_path), admin_token="secret")
+
+    with profiler.run("Ardbeg 10") as profile:
+        def work():
+            with profiling.thread_scope():
+                _parse_page()
+
+        worker = threading.Thread(target=contextvars.copy_context().run, args=(work,))
+        worker.start()
+        worker.join()
+
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert len(names) == 3
+    assert all(name.startswith("ardbeg_10-") for name in names)
+    assert sorted(os.path.basename(path) for path in profile.paths) == names
+    stats = pstats.Stats(profile.paths[0])
+    assert any(func[2] == "_parse_page" for func in stats.stats)
+
+
+def test_profile_requests_need_the_admin_token():
+    profiler = profiling.Profiler("unused", admin_token="secret")
+
+    assert profiler.should_profile(True, "secret")
+    assert not profiler.should_profile(True, "wrong")
+    assert not profiler.should_profile(True, None)
+    assert not profiling.Profiler("unused").should_profile(True, "")
+    assert not profiler.should_profile(False, "secret")
@@ -0,0 +1,73 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from app.scrapers.base import BaseScraper
+from app.scrapers.registry import ScraperConfig, ScraperRegistry, scraper_factories
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+class FakeScraper(BaseScraper):
+    name = "fake"
+
+    def search(self, query):
+        return []
+
+
+def test_registry_builds_scrapers_once_on_first_use():
+    built = []
+
+    def factory():
+        built.append(1)
+        return FakeScraper()
+
+    configured = []
+    registry = ScraperRegistry([factory, factory], configure=configured.append)
+
+    assert not registry.loaded
+    assert [s.name for s in registry] == ["fake", "fake"]
+    assert len(registry) == 2
+    assert registry[0] is configured[0]
+    assert len(built) == 2
+
+
+def test_biccamera_factory_only_when_enabled():
+    assert len(scraper_factories(ScraperConfig())) == 6
+    assert len(scraper_factories(ScraperConfig(biccamera_enabled=True))) == 7
+
+
+def test_index_and_cache_hits_do_not_import_parsers():
+    script = textwrap.dedent(
+        """
+        import sys
+
+        from app import create_app
+        from app.models.result import SearchResult
+        from app.services import search_service
+
+        entry = search_service.CacheEntry(
+            results=[SearchResult("Whisky 10", 5000, "Shop", "https://example.com/1")]
+        )
+        for key in search_service._cache_keys("whisky"):
+            search_service._cache.set(key, entry)
+
+        client = create_app().test_client()
+        assert client.get("/").status_code == 200
+        assert client.get("/search?q=whisky").status_code == 200
+        assert client.get("/download?q=whisky").status_code == 200
+        assert not search_service._scrapers.loaded
+        print(",".join(m for m in ("bs4", "lxml", "playwright") if m in sys.modules))
+        """
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
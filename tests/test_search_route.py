@@ -0,0 +1,211 @@
+import gzip
+import json
+import time
+
+import pytest
+
+from app import create_app
+from app.models.result import SearchResult
+from app.scrapers.base import BaseScraper
+from app.services import search_service
+from app.storage.cache import TTLCache
+
+
+class FakeScraper(BaseScraper):
+    name = "fake"
+
+    def search(self, query):
+        return [
+            SearchResult(
+                title=f"Whisky {i}",
+                price=1000 + i,
+                source="Shop",
+                url=f"https://example.com/{i}",
+            )
+            for i in range(50)
+        ]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(search_service, "_scrapers", [FakeScraper()])
+    monkeypatch.setattr(search_service, "_cache", TTLCache(ttl_seconds=60))
+    app = create_app()
+    return app.test_client()
+
+
+def test_search_route_sets_validators(client):
+    response = client.get("/search?q=whisky&limit=5")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+    assert "s-maxage=" in response.headers["Cache-Control"]
+    data = json.loads(response.data)
+    assert data["total"] == 50
+    assert [r["price"] for r in data["results"]] == [1000, 1001, 1002, 1003, 1004]
+
+
+def test_search_route_returns_304_for_matching_etag(client):
+    first = client.get("/search?q=whisky")
+    etag = first.headers["ETag"]
+
+    second = client.get("/search?q=whisky", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.data == b""
+
+
+def test_search_route_serves_gzip_variant(client):
+    response = client.get("/search?q=whisky", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    data = json.loads(gzip.decompress(response.data))
+    assert data["total"] == 50
+
+
+def test_search_route_etag_differs_per_content_coding(client):
+    plain = client.get("/search?q=whisky")
+    gzipped = client.get("/search?q=whisky", headers={"Accept-Encoding": "gzip"})
+
+    assert plain.headers["ETag"] != gzipped.headers["ETag"]
+
+    stale = client.get(
+        "/search?q=whisky",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["ETag"]},
+    )
+    fresh = client.get(
+        "/search?q=whisky",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["ETag"]},
+    )
+
+    assert stale.status_code == 200
+    assert fresh.status_code == 304
+
+
+def test_search_route_empty_query_keeps_page_shape(client):
+    data = json.loads(client.get("/search?q=&limit=5").data)
+
+    assert data == {
+        "query": "",
+        "results": [],
+        "total": 0,
+        "limit": 5,
+        "offset": 0,
+        "degraded": [],
+        "pending": [],
+        "truncated": False,
+    }
+
+
+def test_search_payloads_are_bounded_per_entry(client, monkeypatch):
+    monkeypatch.setattr(search_service, "_payload_cache_size", 2)
+    for offset in range(5):
+        client.get(f"/search?q=whisky&limit=1&offset={offset}")
+
+    entry = search_service._get_cached_entry("whisky")
+    assert [key[2] for key in entry.payloads] == [3, 4]
+
+
+class BrokenScraper(BaseScraper):
+    name = "broken"
+
+    def search(self, query):
+        raise RuntimeError("shop down")
+
+
+def test_search_route_partial_results_get_short_edge_ttl(client, monkeypatch):
+    monkeypatch.setattr(search_service, "_scrapers", [FakeScraper(), BrokenScraper()])
+    monkeypatch.setattr(search_service, "_breakers", {})
+
+    response = client.get("/search?q=whisky")
+
+    assert json.loads(response.data)["degraded"] == ["broken"]
+    assert response.headers["Cache-Control"] == (
+        f"public, max-age=0, s-maxage={search_service._degraded_ttl_seconds}"
+    )
+
+
+class SlowScraper(BaseScraper):
+    name = "slow"
+
+    def search(self, query):
+        time.sleep(0.3)
+        return []
+
+
+def test_search_route_pending_shops_are_not_cached(client, monkeypatch):
+    monkeypatch.setattr(search_service, "_scrapers", [FakeScraper(), SlowScraper()])
+
+    response = client.get("/search?q=whisky&budget_ms=50")
+
+    assert json.loads(response.data)["pending"] == ["slow"]
+    assert response.headers["Cache-Control"] == "no-store"
+
+
+def test_search_route_reports_server_timing(client):
+    response = client.get("/search?q=whisky&limit=5")
+
+    timing = response.headers["Server-Timing"]
+    names = [part.split(";")[0].strip() for part in timing.split(",")]
+    assert {"cache", "fake.search", "dedup", "sort", "serialize", "total"} <= set(names)
+
+    etag = response.headers["ETag"]
+    cached = client.get("/search?q=whisky&limit=5", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert "total;dur=" in cached.headers["Server-Timing"]
+
+
+def test_search_route_trace_appendix_is_not_cached(client):
+    response = client.get("/search?q=whisky&limit=5&trace=1")
+
+    data = json.loads(response.data)
+    assert data["total"] == 50
+    assert "fake.search" in data["trace"]["spans"]
+    assert data["trace"]["total_ms"] >= 0
+    assert response.headers["Cache-Control"] == "no-store"
+
+
+def test_download_route_reports_server_timing(client):
+    response = client.get("/download?q=whisky")
+
+    assert response.status_code == 200
+    assert "serialize;dur=" in response.headers["Server-Timing"]
+
+
+def test_search_route_profile_is_admin_gated(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(search_service.profiler, "directory", str(tmp_path))
+    monkeypatch.setattr(search_service.profiler, "admin_token", "secret")
+
+    assert client.get("/search?q=whisky&profile=1").status_code == 403
+
+    response = client.get("/search?q=whisky&profile=1", headers={"X-Admin-Token": "secret"})
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "no-store"
+    assert sorted(response.headers["X-Profile"].split(", ")) == sorted(
+        path.name for path in tmp_path.iterdir()
+    )
+
+
+def test_search_batch_route_returns_results_in_request_order(client):
+    response = client.post("/search/batch", json={"queries": ["whisky", "Whisky"], "limit": 2})
+
+    data = json.loads(response.data)
+    assert [r["query"] for r in data["results"]] == ["whisky", "Whisky"]
+    assert [r["price"] for r in data["results"][0]["results"]] == [1000, 1001]
+
+
+def test_search_batch_route_streams_ndjson(client):
+    response = client.post(
+        "/search/batch?format=ndjson",
+        json={"queries": ["whisky", "whisky"], "limit": 1},
+    )
+
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert [line["query"] for line in lines] == ["whisky", "whisky"]
+    assert lines[0]["total"] == 50
+
+
+def test_search_batch_route_validates_body(client):
+    assert client.post("/search/batch", json={"queries": "whisky"}).status_code == 400
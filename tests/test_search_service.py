@@ -0,0 +1,374 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from app.models.result import SearchResult
+from app.scrapers.base import BaseScraper
+from app.services import search_service
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.page_depth import PageDepthAdvisor
+from app.storage.cache import TTLCache
+
+
+class FakeScraper(BaseScraper):
+    name = "fake"
+
+    def __init__(self, results):
+        self.results = results
+        self.calls = 0
+
+    def search(self, query):
+        self.calls += 1
+        return list(self.results)
+
+
+def _result(title, price, source="Shop A"):
+    return SearchResult(title=title, price=price, source=source, url=f"https://example.com/{price}")
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    fake = FakeScraper(
+        [
+            _result("Whisky 12", 9000),
+            _result("Whisky 10", 5000, source="Shop B"),
+            _result("Whisky 18", 20000),
+            _result("Whisky NAS", 3000),
+            _result("Whisky 10", 5000, source="Shop A"),
+        ]
+    )
+    monkeypatch.setattr(search_service, "_scrapers", [fake])
+    monkeypatch.setattr(search_service, "_cache", TTLCache(ttl_seconds=60))
+    return fake
+
+
+def test_search_sorts_by_total_then_source(scraper):
+    results = search_service.search("whisky")
+
+    assert [(r.price, r.source) for r in results] == [
+        (3000, "Shop A"),
+        (5000, "Shop A"),
+        (5000, "Shop B"),
+        (9000, "Shop A"),
+        (20000, "Shop A"),
+    ]
+
+
+def test_search_page_limit_and_offset(scraper):
+    page = search_service.search_page("whisky", limit=2, offset=1)
+
+    assert page.total == 5
+    assert [(r.price, r.source) for r in page.results] == [
+        (5000, "Shop A"),
+        (5000, "Shop B"),
+    ]
+
+
+def test_search_page_filters_run_against_cache(scraper):
+    search_service.search("whisky")
+    page = search_service.search_page(
+        "whisky",
+        min_price=4000,
+        max_price=10000,
+        source="Shop A",
+    )
+
+    assert scraper.calls == 1
+    assert page.total == 2
+    assert [r.price for r in page.results] == [5000, 9000]
+
+
+def test_unfiltered_pages_slice_presorted_cache(scraper, monkeypatch):
+    search_service.search("whisky")
+    entry = search_service._get_cached_entry("whisky")
+    assert entry.results == sorted(entry.results, key=search_service._sort_key)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("unfiltered pages should not re-rank")
+
+    monkeypatch.setattr(search_service, "_rank", fail)
+    page = search_service.search_page("whisky", limit=2, offset=3)
+
+    assert [r.price for r in page.results] == [9000, 20000]
+
+
+def test_search_page_offset_past_end(scraper):
+    page = search_service.search_page("whisky", limit=10, offset=50)
+
+    assert page.total == 5
+    assert page.results == []
+
+
+class PagedScraper(BaseScraper):
+    name = "paged"
+    supports_page_depth = True
+    max_pages = 3
+
+    def __init__(self):
+        self.depths = []
+
+    def search(self, query, max_pages=None):
+        self.depths.append(max_pages)
+        results = []
+        for page in range(1, max_pages + 1):
+            # Only page 1 carries matching titles; deeper pages are accessories.
+            title = "Whisky 10" if page == 1 else "Tumbler"
+            results.append(
+                SearchResult(title, 1000 * page, "Shop", f"https://example.com/{page}", page=page)
+            )
+        return results
+
+
+def test_search_shrinks_page_depth_from_history(monkeypatch):
+    scraper = PagedScraper()
+    advisor = PageDepthAdvisor(min_samples=2, explore_rate=0)
+    monkeypatch.setattr(search_service, "_scrapers", [scraper])
+    monkeypatch.setattr(search_service, "_page_depth", advisor)
+
+    for _ in range(3):
+        monkeypatch.setattr(search_service, "_cache", TTLCache(ttl_seconds=60))
+        search_service.search("whisky")
+
+    assert scraper.depths == [3, 3, 1]
+
+
+class ShortListingScraper(PagedScraper):
+    def search(self, query, max_pages=None):
+        self.depths.append(max_pages)
+        return [SearchResult("Whisky 10", 1000, "Shop", "https://example.com/1", page=1)]
+
+
+def test_page_depth_counts_only_pages_fetched(monkeypatch):
+    scraper = ShortListingScraper()
+    advisor = PageDepthAdvisor(min_samples=2, explore_rate=0)
+    monkeypatch.setattr(search_service, "_scrapers", [scraper])
+    monkeypatch.setattr(search_service, "_page_depth", advisor)
+    monkeypatch.setattr(search_service, "_cache", TTLCache(ttl_seconds=60))
+
+    search_service.search("whisky")
+
+    stats = advisor.store.get("paged|w1:nodigit:ascii")
+    assert stats == {"searches": 1, "fetched": [1], "useful": [1]}
+
+
+class BrokenScraper(BaseScraper):
+    name = "broken"
+
+    def __init__(self):
+        self.calls = 0
+
+    def search(self, query):
+        self.calls += 1
+        raise requests.HTTPError("status 503")
+
+
+def test_search_reports_failing_shop_as_degraded(scraper, monkeypatch):
+    broken = BrokenScraper()
+    monkeypatch.setattr(search_service, "_scrapers", [scraper, broken])
+    monkeypatch.setattr(search_service, "_breakers", {})
+
+    page = search_service.search_page("whisky")
+
+    assert page.total == 5
+    assert page.degraded == ["broken"]
+
+
+def test_open_breaker_skips_shop(scraper, monkeypatch):
+    broken = BrokenScraper()
+    monkeypatch.setattr(search_service, "_scrapers", [scraper, broken])
+    monkeypatch.setattr(
+        search_service,
+        "_breakers",
+        {"broken": CircuitBreaker("broken", min_calls=2, open_seconds=60)},
+    )
+
+    for _ in range(3):
+        monkeypatch.setattr(search_service, "_cache", TTLCache(ttl_seconds=60))
+        page = search_service.search_page("whisky")
+
+    assert broken.calls == 2
+    assert page.degraded == ["broken"]
+    assert search_service._breakers["broken"].state == "open"
+
+
+class CheapestScraper(BaseScraper):
+    name = "cheapest"
+    supports_cheapest_n = True
+
+    def __init__(self):
+        self.requested = []
+
+    def search(self, query, cheapest_n=None):
+        self.requested.append(cheapest_n)
+        count = cheapest_n or 30
+        return [_result(f"Whisky {n}", 1000 + n) for n in range(count)]
+
+
+def test_cheapest_n_follows_request_and_refetches_deeper_slices(monkeypatch):
+    scraper = CheapestScraper()
+    monkeypatch.setattr(search_service, "_scrapers", [scraper])
+    monkeypatch.setattr(search_service, "_cache", TTLCache(ttl_seconds=60))
+
+    first = search_service.search_page("whisky", limit=5)
+    search_service.search_page("whisky", limit=2, offset=3)
+    deeper = search_service.search_page("whisky", limit=5, offset=10)
+
+    assert first.truncated is True
+    assert [r.price for r in deeper.results] == [1010, 1011, 1012, 1013, 1014]
+    assert scraper.requested == [5, 15]
+    assert search_service.get_cached_results("whisky") is None
+
+    assert len(search_service.search("whisky")) == 30
+    assert scraper.requested == [5, 15, None]
+
+
+class HangingScraper(BaseScraper):
+    name = "hanging"
+
+    def __init__(self, release):
+        self.release = release
+
+    def search(self, query):
+        self.release.wait(5)
+        return []
+
+
+def test_slow_running_shop_counts_against_breaker(scraper, monkeypatch):
+    release = threading.Event()
+    hanging = HangingScraper(release)
+    monkeypatch.setattr(search_service, "_scrapers", [scraper, hanging])
+    monkeypatch.setattr(search_service, "_breakers", {})
+    monkeypatch.setattr(search_service, "_bulkheads", {})
+    monkeypatch.setattr(search_service, "_scraper_timeout_seconds", 0.2)
+
+    try:
+        page = search_service.search_page("whisky")
+    finally:
+        release.set()
+
+    assert page.total == 5
+    assert page.degraded == ["hanging"]
+    assert list(search_service._breakers["hanging"]._outcomes) == [False]
+
+
+def test_queue_wait_timeout_does_not_count_against_breaker(scraper, monkeypatch):
+    release = threading.Event()
+    hanging = HangingScraper(release)
+    monkeypatch.setattr(search_service, "_scrapers", [scraper, hanging])
+    monkeypatch.setattr(search_service, "_breakers", {})
+    monkeypatch.setattr(search_service, "_bulkheads", {})
+    monkeypatch.setattr(search_service, "_bulkhead_size", 1)
+    monkeypatch.setattr(search_service, "_scraper_timeout_seconds", 0.2)
+    # Another search already holds the shop's only worker.
+    search_service._bulkhead(hanging).submit(release.wait, 5)
+
+    try:
+        page = search_service.search_page("whisky")
+    finally:
+        release.set()
+
+    assert page.degraded == ["hanging"]
+    assert list(search_service._breakers["hanging"]._outcomes) == []
+
+
+class SlowScraper(BaseScraper):
+    name = "slow"
+
+    def search(self, query):
+        time.sleep(0.3)
+        return [_result("Whisky Late", 1000, source="Shop C")]
+
+
+def _wait_for_entry(query, predicate, timeout=3):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        entry = search_service._get_cached_entry(query)
+        if entry is not None and predicate(entry):
+            return entry
+        time.sleep(0.02)
+    raise AssertionError("cache entry never settled")
+
+
+def test_budget_returns_partial_results_and_late_shop_fills_cache(scraper, monkeypatch):
+    monkeypatch.setattr(search_service, "_scrapers", [scraper, SlowScraper()])
+    monkeypatch.setattr(search_service, "_breakers", {})
+
+    page = search_service.search_page("whisky", budget_ms=100)
+
+    assert page.total == 5
+    assert page.pending == ["slow"]
+    assert page.degraded == []
+
+    entry = _wait_for_entry("whisky", lambda e: not e.pending)
+    assert entry.results[0].title == "Whisky Late"
+    assert entry.degraded == []
+    assert search_service.search_page("whisky").total == 6
+
+
+def test_late_shop_is_still_held_to_its_deadline(scraper, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(search_service, "_scrapers", [scraper, HangingScraper(release)])
+    monkeypatch.setattr(search_service, "_breakers", {})
+    monkeypatch.setattr(search_service, "_bulkheads", {})
+    monkeypatch.setattr(search_service, "_scraper_timeout_seconds", 0.3)
+
+    try:
+        page = search_service.search_page("whisky", budget_ms=50)
+        entry = _wait_for_entry("whisky", lambda e: not e.pending)
+    finally:
+        release.set()
+
+    assert page.pending == ["hanging"]
+    assert entry.degraded == ["hanging"]
+    assert list(search_service._breakers["hanging"]._outcomes) == [False]
+
+
+class QueryEchoScraper(BaseScraper):
+    name = "echo"
+
+    def __init__(self, barrier=None):
+        self.barrier = barrier
+        self.queries = []
+
+    def search(self, query):
+        self.queries.append(query)
+        if self.barrier is not None:
+            self.barrier.wait(2)
+        return [SearchResult(f"{query} bottle", 1000, "Shop", f"https://example.com/{query}")]
+
+
+def test_search_batch_collapses_queries_to_canonical_keys(monkeypatch):
+    scraper = QueryEchoScraper()
+    monkeypatch.setattr(search_service, "_scrapers", [scraper])
+    monkeypatch.setattr(search_service, "_cache", TTLCache(ttl_seconds=60))
+
+    pages = dict(
+        search_service.search_batch(["ardbeg 10", "ardbeg10", "ardbeg　10", "lagavulin 16", " "])
+    )
+
+    assert sorted(scraper.queries) == ["ardbeg 10", "lagavulin 16"]
+    assert set(pages) == {"ardbeg 10", "ardbeg10", "ardbeg　10", "lagavulin 16"}
+    assert pages["ardbeg10"].results[0].title == "ardbeg 10 bottle"
+
+
+def test_search_batch_keeps_each_shop_busy_in_parallel(monkeypatch):
+    # Both queries have to be inside the shop at once to pass the barrier.
+    scraper = QueryEchoScraper(threading.Barrier(2))
+    monkeypatch.setattr(search_service, "_scrapers", [scraper])
+    monkeypatch.setattr(search_service, "_cache", TTLCache(ttl_seconds=60))
+    monkeypatch.setattr(search_service, "_breakers", {})
+    monkeypatch.setattr(search_service, "_bulkheads", {})
+    monkeypatch.setattr(search_service, "_bulkhead_size", 2)
+
+    pages = dict(search_service.search_batch(["ardbeg", "lagavulin"]))
+
+    assert [page.total for page in pages.values()] == [1, 1]
+
+
+def test_search_batch_rejects_oversized_batches(monkeypatch):
+    monkeypatch.setattr(search_service, "_batch_max_queries", 2)
+
+    with pytest.raises(ValueError):
+        search_service.search_batch(["a", "b", "c"])
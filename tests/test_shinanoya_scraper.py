@@ -1,6 +1,9 @@
+import time
+
 import requests
 
 from app.scrapers.shinanoya import ShinanoyaScraper
+from app.storage.state import JSONStore
 
 
 class DummyResponse:
@@ -135,3 +138,72 @@ def test_shinanoya_parse_price():
     assert scraper._parse_price("JPY 9,999") == 9999
     assert scraper._parse_price("no price") is None
     assert scraper._parse_price("") is None
+
+
+def test_shinanoya_memoizes_resolved_url():
+    html = """
+    <ul class="category_itemArea_ul">
+      <li>
+        <div class="itemDetail">
+          <div class="name"><a href="/item/1">Whisky A</a></div>
+          <div class="price">JPY 11,000</div>
+        </div>
+      </li>
+    </ul>
+    """
+    search_endpoint = "https://www.shinanoya-tokyo.jp/shop/shopsearch_url.html"
+    search_url = "https://www.shinanoya-tokyo.jp/shop/goods/search?keyword=whisky"
+    session = FakeSession(
+        get_map={search_url: DummyResponse(text=html)},
+        post_map={
+            search_endpoint: DummyResponse(
+                json_data={"result": True, "url": "/shop/goods/search?keyword=whisky"}
+            )
+        },
+    )
+    scraper = ShinanoyaScraper(session=session, max_pages=1)
+
+    assert len(scraper.search("whisky")) == 1
+    session.post_map = {}
+    assert len(scraper.search(" whisky ")) == 1
+
+
+def test_shinanoya_memoizes_negative_result():
+    search_endpoint = "https://www.shinanoya-tokyo.jp/shop/shopsearch_url.html"
+    session = FakeSession(
+        post_map={search_endpoint: DummyResponse(json_data={"result": False})}
+    )
+    scraper = ShinanoyaScraper(session=session)
+
+    assert scraper.search("whisky") == []
+    session.post_map = {}
+    assert scraper.search("whisky") == []
+
+
+def test_shinanoya_negative_memo_uses_short_ttl_and_normalized_keyword():
+    search_endpoint = "https://www.shinanoya-tokyo.jp/shop/shopsearch_url.html"
+    session = FakeSession(
+        post_map={search_endpoint: DummyResponse(json_data={"result": False})}
+    )
+    store = JSONStore()
+    scraper = ShinanoyaScraper(session=session, url_store=store, negative_ttl_seconds=60)
+
+    assert scraper.search("  ardbeg   10 ") == []
+    assert session.last_post_json["keyword"] == "ardbeg 10"
+    expires, url = store.get("ct755:ardbeg 10")
+    assert url is None
+    assert expires <= time.time() + 60
+
+
+def test_shinanoya_memo_drops_expired_and_caps_size():
+    store = JSONStore()
+    now = time.time()
+    store.set("ct755:old", [now - 1, None])
+    for n in range(4):
+        store.set(f"ct755:q{n}", [now + 100 + n, f"https://example.com/{n}"])
+
+    ShinanoyaScraper(session=FakeSession(), url_store=store, max_memo_entries=2)
+
+    assert store.size() == 2
+    assert store.get("ct755:old") is None
+    assert store.get("ct755:q3") is not None
@@ -0,0 +1,20 @@
+import json
+
+from app.storage.state import JSONStore
+
+
+def test_json_store_debounces_flushes(tmp_path):
+    path = tmp_path / "state.json"
+    store = JSONStore(str(path), flush_interval=60)
+
+    store.set("a", 1)
+    store.update("b", lambda value: (value or 0) + 1)
+    store.update("b", lambda value: (value or 0) + 1)
+
+    # The first write goes out immediately; later ones wait for the interval.
+    assert json.loads(path.read_text()) == {"a": 1}
+
+    store.flush()
+
+    assert json.loads(path.read_text()) == {"a": 1, "b": 2}
+    assert JSONStore(str(path)).get("b") == 2
@@ -0,0 +1,135 @@
+import json
+
+import requests
+
+from app.scrapers.pricecom import PriceComScraper
+from app.scrapers.structured import structured_results
+
+
+def _script(data) -> str:
+    return f'<script type="application/ld+json">{json.dumps(data, ensure_ascii=False)}</script>'
+
+
+ITEM_LIST = {
+    "@context": "https://schema.org",
+    "@type": "ItemList",
+    "itemListElement": [
+        {
+            "@type": "ListItem",
+            "position": 1,
+            "item": {
+                "@type": "Product",
+                "name": "Whisky One",
+                "url": "/item/1",
+                "offers": {"@type": "Offer", "price": "5500", "priceCurrency": "JPY"},
+            },
+        },
+        {
+            "@type": "ListItem",
+            "position": 2,
+            "name": "Whisky Two",
+            "url": "https://shop.example/item/2",
+            "offers": [
+                {"@type": "Offer", "price": 7200, "seller": {"name": "Seller B"}},
+                {"@type": "Offer", "price": 6800, "seller": {"name": "Seller C"}},
+            ],
+        },
+        {"@type": "ListItem", "position": 3, "name": "No price", "url": "/item/3"},
+    ],
+}
+
+
+def test_structured_results_map_item_lists():
+    html = f"<html><head>{_script(ITEM_LIST)}</head><body></body></html>"
+
+    results = structured_results(html, "Shop", "https://shop.example/")
+
+    assert [(r.title, r.price, r.source, r.url) for r in results] == [
+        ("Whisky One", 5500, "Shop", "https://shop.example/item/1"),
+        ("Whisky Two", 6800, "Seller C", "https://shop.example/item/2"),
+    ]
+
+
+def test_structured_results_read_graphs_offers_and_bytes():
+    graph = {
+        "@graph": [
+            {"@type": "WebPage", "name": "Search"},
+            {
+                "@type": ["Product"],
+                "name": "Whisky Three",
+                "url": "https://shop.example/3",
+                "offers": {"@type": "AggregateOffer", "lowPrice": "￥9,980"},
+            },
+            {
+                "@type": "Offer",
+                "price": "12,000",
+                "itemOffered": {"name": "Whisky Four", "url": "https://shop.example/4"},
+            },
+        ]
+    }
+    html = (
+        '<script type="application/ld+json">{ not json</script>'
+        f"<SCRIPT TYPE='application/ld+json'>{json.dumps(graph)}</SCRIPT>"
+    )
+
+    results = structured_results(html.encode("utf-8"), "Shop")
+
+    assert [(r.title, r.price) for r in results] == [
+        ("Whisky Three", 9980),
+        ("Whisky Four", 12000),
+    ]
+    assert structured_results("<html><body>no data</body></html>", "Shop") == []
+
+
+class DummyResponse:
+    def __init__(self, text="", status_code=200):
+        self.text = text
+        self.status_code = status_code
+        self.encoding = "utf-8"
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"status {self.status_code}")
+
+
+class FakeSession:
+    def __init__(self, get_map):
+        self.get_map = get_map
+        self.headers = {}
+
+    def get(self, url, timeout=15):
+        return self.get_map[url]
+
+
+def test_scraper_uses_structured_data_before_selectors(monkeypatch):
+    base = "https://search.kakaku.com/whisky/?category=0016_0054"
+    page = (
+        f"<html><head>{_script(ITEM_LIST)}</head><body>"
+        '<div class="p-pager"><a href="/whisky/?category=0016_0054&amp;page=2">2</a></div>'
+        "</body></html>"
+    )
+    session = FakeSession(
+        {
+            base: DummyResponse(page),
+            f"{base}&page=2": DummyResponse("<html><body></body></html>"),
+        }
+    )
+    scraper = PriceComScraper(session=session, max_pages=2)
+    scraper.request_delay_seconds = 0
+    parsed = []
+    parse_results = scraper._parse_results
+
+    def track(soup):
+        parsed.append(soup)
+        return parse_results(soup)
+
+    monkeypatch.setattr(scraper, "_parse_results", track)
+
+    results = scraper.search("whisky")
+
+    assert [(r.title, r.price, r.page) for r in results] == [
+        ("Whisky One", 5500, 1),
+        ("Whisky Two", 6800, 1),
+    ]
+    # Only page 2, which has no structured data, went through the selectors.
+    assert len(parsed) == 1
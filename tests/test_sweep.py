@@ -0,0 +1,84 @@
+import io
+import json
+import sys
+
+import pytest
+
+import sweep
+from app.models.result import SearchResult
+from app.scrapers.base import BaseScraper
+from app.services import search_service
+from app.storage.cache import TTLCache
+
+
+class EchoScraper(BaseScraper):
+    name = "echo"
+
+    def __init__(self):
+        self.queries = []
+
+    def search(self, query):
+        self.queries.append(query)
+        return [SearchResult(f"{query} 700ml", 5000, "Shop", f"https://example.com/{query}")]
+
+
+class BrokenScraper(BaseScraper):
+    name = "broken"
+
+    def search(self, query):
+        raise RuntimeError("shop down")
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    fake = EchoScraper()
+    monkeypatch.setattr(search_service, "_scrapers", [fake, BrokenScraper()])
+    monkeypatch.setattr(search_service, "_cache", TTLCache(ttl_seconds=60))
+    monkeypatch.setattr(search_service, "_breakers", {})
+    return fake
+
+
+def _run(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["sweep.py", *argv])
+    monkeypatch.setattr(sys, "stderr", io.StringIO())
+    code = sweep.main()
+    return code, sys.stderr.getvalue()
+
+
+def test_sweep_resumes_from_checkpoint(scraper, monkeypatch, tmp_path):
+    names = tmp_path / "names.txt"
+    names.write_text("ardbeg 10\nlagavulin 16\n# comment\n\ntalisker 10\n", encoding="utf-8")
+    output = tmp_path / "out.ndjson"
+    (tmp_path / "out.ndjson.done").write_text("ardbeg 10\n", encoding="utf-8")
+
+    code, log = _run(monkeypatch, str(names), "-o", str(output))
+
+    assert code == 0
+    assert sorted(scraper.queries) == ["lagavulin 16", "talisker 10"]
+    lines = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert sorted(line["query"] for line in lines) == ["lagavulin 16", "talisker 10"]
+    assert "resuming: 1 of 3" in log
+    assert "3/3 queries" in log
+    assert "broken=100%" in log
+    assert sweep.read_checkpoint(tmp_path / "out.ndjson.done") == {
+        "ardbeg 10",
+        "lagavulin 16",
+        "talisker 10",
+    }
+
+
+def test_sweep_writes_csv_header_once(scraper, monkeypatch, tmp_path):
+    names = tmp_path / "names.txt"
+    names.write_text("ardbeg 10\n", encoding="utf-8")
+    output = tmp_path / "out.csv"
+
+    _run(monkeypatch, str(names), "-o", str(output), "--format", "csv")
+    names.write_text("ardbeg 10\nlagavulin 16\n", encoding="utf-8")
+    _run(monkeypatch, str(names), "-o", str(output), "--format", "csv")
+
+    rows = output.read_text(encoding="utf-8").splitlines()
+    assert rows == [
+        ",".join(sweep.CSV_COLUMNS),
+        "ardbeg 10,ardbeg 10 700ml,5000,Shop,https://example.com/ardbeg 10,5000",
+        "lagavulin 16,lagavulin 16 700ml,5000,Shop,https://example.com/lagavulin 16,5000",
+    ]